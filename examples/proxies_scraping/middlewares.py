@@ -5,10 +5,14 @@ from scrapyio.item_middlewares import BaseItemMiddleWare
 
 
 class ProxyCheckMiddleWare(BaseItemMiddleWare):
+    # Every check opens a connection through its own proxy,
+    # so only this many proxies are checked at the same time
+    concurrency = 50
+
     async def process_item(self, item) -> None:
         scheme = item.type.lower()
         uri = f"{scheme}://{item.ip}:{item.port}"
-        async with httpx.AsyncClient(proxies={"all:///": uri}) as cl:
+        async with httpx.AsyncClient(proxies={"all:///": uri}, timeout=5) as cl:
             try:
                 response = await cl.get("http://google.com")
                 if not response.is_success:
@@ -0,0 +1,99 @@
+import logging
+import time
+import typing
+from dataclasses import dataclass
+from enum import Enum, auto
+
+log = logging.getLogger("scrapyio")
+
+
+class CircuitState(Enum):
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
+
+
+@dataclass
+class HostCircuit:
+    state: CircuitState = CircuitState.CLOSED
+    failures: int = 0
+    opened_at: float = 0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: float,
+        latency_slo: typing.Optional[float] = None,
+        half_open_requests: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latency_slo = latency_slo
+        self.half_open_requests = half_open_requests
+        self.circuits: typing.Dict[str, HostCircuit] = {}
+
+    def _circuit(self, host: str) -> HostCircuit:
+        circuit = self.circuits.get(host)
+        if circuit is None:
+            circuit = self.circuits[host] = HostCircuit()
+        return circuit
+
+    def state(self, host: str) -> CircuitState:
+        circuit = self._circuit(host)
+        if (
+            circuit.state == CircuitState.OPEN
+            and time.monotonic() - circuit.opened_at >= self.recovery_timeout
+        ):
+            log.info(f"Letting probe requests through to the `{host}` host")
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probes = 0
+        return circuit.state
+
+    def allow(self, host: str) -> bool:
+        state = self.state(host)
+        if state == CircuitState.CLOSED:
+            return True
+        circuit = self.circuits[host]
+        if state == CircuitState.HALF_OPEN and circuit.probes < self.half_open_requests:
+            circuit.probes += 1
+            return True
+        return False
+
+    def release(self, host: str) -> None:
+        # Probes that ended without an outcome give their slot back
+        circuit = self._circuit(host)
+        if circuit.state == CircuitState.HALF_OPEN and circuit.probes > 0:
+            circuit.probes -= 1
+
+    def retry_after(self, host: str) -> float:
+        circuit = self._circuit(host)
+        remaining = circuit.opened_at + self.recovery_timeout - time.monotonic()
+        return max(remaining, min(self.recovery_timeout, 0.1))
+
+    def _open(self, host: str, circuit: HostCircuit) -> None:
+        log.warning(f"Opening the circuit for the `{host}` host")
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = time.monotonic()
+
+    def record_failure(self, host: str) -> None:
+        circuit = self._circuit(host)
+        circuit.failures += 1
+        if circuit.state == CircuitState.HALF_OPEN or (
+            circuit.state == CircuitState.CLOSED
+            and circuit.failures >= self.failure_threshold
+        ):
+            self._open(host, circuit)
+
+    def record_success(self, host: str, latency: float) -> None:
+        if self.latency_slo is not None and latency > self.latency_slo:
+            log.debug(f"The `{host}` host missed the latency SLO: {latency=}")
+            self.record_failure(host)
+            return
+        circuit = self._circuit(host)
+        if circuit.state != CircuitState.CLOSED:
+            log.info(f"Closing the circuit for the `{host}` host")
+        circuit.state = CircuitState.CLOSED
+        circuit.failures = 0
@@ -1,6 +1,14 @@
+import asyncio
+import itertools
 import logging
+import math
+import time
 import typing
 from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
 
 import httpx
 from httpx._client import USE_CLIENT_DEFAULT, Response
@@ -13,22 +21,275 @@ from httpx._types import (
     VerifyTypes,
 )
 
-from scrapyio.utils import first_not_none
+from scrapyio.utils import first_not_none, make_hashable
 
-from .exceptions import IgnoreRequestException
-from .http import Request, clean_up_response
+from .breakers import CircuitBreaker
+from .exceptions import (
+    CircuitOpenException,
+    HostFailureException,
+    IgnoreRequestException,
+    TooManyRedirectsException,
+    TooManyRetriesException,
+)
+from .http import (
+    Request,
+    clean_up_response,
+    request_fingerprint,
+    request_host,
+    request_url,
+)
 from .middlewares import BaseMiddleWare, build_middlewares_chain
 from .settings import CONFIGS
-from .types import CLEANUP_WITH_RESPONSE
+from .types import CLEANUP_WITH_RESPONSE, EVENT_HOOKS
+from .warc import WARCWriter
 
 log = logging.getLogger("scrapyio")
 
+PROXY_CLIENT_KEY = typing.Tuple[typing.Hashable, ...]
+PERMANENT_REDIRECT_CODES = {
+    httpx.codes.MOVED_PERMANENTLY,
+    httpx.codes.PERMANENT_REDIRECT,
+}
+PERMANENT_REDIRECT_METHODS = {"GET", "HEAD"}
+
+
+class _PooledAsyncClient(httpx.AsyncClient):
+    # Pooled clients are shared between unrelated requests, so cookies
+    # set by one response must not leak into the next request.
+    @property  # type: ignore[override]
+    def cookies(self) -> httpx.Cookies:
+        return httpx.Cookies()
+
+    @cookies.setter
+    def cookies(self, cookies: CookieTypes) -> None:
+        ...
+
+
+@dataclass
+class PooledClient:
+    client: httpx.AsyncClient
+    last_used: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+    evicted: bool = False
+
+
+class ProxyClientPool:
+    def __init__(
+        self,
+        max_size: typing.Optional[int] = None,
+        idle_timeout: typing.Optional[float] = None,
+    ):
+        self.max_size: int = first_not_none(max_size, CONFIGS.PROXY_CLIENTS_POOL_SIZE)
+        self.idle_timeout: float = first_not_none(
+            idle_timeout, CONFIGS.PROXY_CLIENT_IDLE_TIMEOUT
+        )
+        self.clients: "OrderedDict[PROXY_CLIENT_KEY, PooledClient]" = OrderedDict()
+        self.event_hooks: EVENT_HOOKS = {}
+
+    @staticmethod
+    def key_for(request: "Request") -> PROXY_CLIENT_KEY:
+        return (
+            make_hashable(request.proxies),
+            make_hashable(request.verify),
+            make_hashable(request.cert),
+            request.http1,
+            request.http2,
+            request.trust_env,
+            str(request.base_url),
+            id(request.app),
+        )
+
+    def create_client(self, request: "Request") -> httpx.AsyncClient:
+        log.debug(f"Creating the pooled AsyncClient for the request: {request.id=}")
+        return _PooledAsyncClient(
+            proxies=request.proxies,
+            cert=request.cert,
+            verify=request.verify,
+            timeout=request.timeout,
+            trust_env=request.trust_env,
+            http1=request.http1,
+            http2=request.http2,
+            base_url=request.base_url,
+            app=request.app,
+            max_redirects=CONFIGS.MAX_REDIRECTS,
+            event_hooks=self.event_hooks,
+        )
+
+    def _detach(self, key: PROXY_CLIENT_KEY) -> PooledClient:
+        pooled = self.clients.pop(key)
+        pooled.evicted = True
+        log.debug(f"Evicting the pooled client: {key=}")
+        return pooled
+
+    async def _evict(self, keys: typing.Iterable[PROXY_CLIENT_KEY]) -> None:
+        # All the clients leave the pool before the first one is closed,
+        # concurrent acquires never see a client that is being closed
+        detached = [self._detach(key) for key in keys]
+        for pooled in detached:
+            if pooled.in_use == 0:
+                await pooled.client.aclose()
+
+    async def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_timeout
+        await self._evict(
+            [
+                key
+                for key, pooled in self.clients.items()
+                if pooled.in_use == 0 and pooled.last_used < deadline
+            ]
+        )
+
+    async def _evict_overflow(self) -> None:
+        overflow = max(len(self.clients) - self.max_size, 0)
+        await self._evict(list(itertools.islice(self.clients, overflow)))
+
+    @asynccontextmanager
+    async def acquire(
+        self, request: "Request"
+    ) -> typing.AsyncIterator[httpx.AsyncClient]:
+        await self._evict_idle()
+        key = self.key_for(request)
+        pooled = self.clients.get(key)
+        if pooled is None:
+            pooled = PooledClient(client=self.create_client(request))
+            self.clients[key] = pooled
+        else:
+            self.clients.move_to_end(key)
+        # The client is counted as used before the overflow eviction
+        # yields, so a concurrent eviction does not close it under us
+        pooled.in_use += 1
+        try:
+            await self._evict_overflow()
+            yield pooled.client
+        finally:
+            pooled.in_use -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.evicted and pooled.in_use == 0:
+                await pooled.client.aclose()
+
+    async def aclose(self) -> None:
+        await self._evict(list(self.clients))
+
+
+class LatencyTracker:
+    def __init__(self, window: int, min_samples: int):
+        self.min_samples = min_samples
+        self.samples: typing.DefaultDict[str, typing.Deque[float]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+
+    def record(self, host: str, latency: float) -> None:
+        self.samples[host].append(latency)
+
+    def percentile(self, host: str, percentile: float) -> typing.Optional[float]:
+        samples = self.samples.get(host)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+        return ordered[index]
+
+
+class PermanentRedirectCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.targets: "OrderedDict[str, str]" = OrderedDict()
+
+    def _store(self, url: str, target: str) -> None:
+        log.debug(f"Remembering the permanent redirect from `{url}` to `{target}`")
+        self.targets[url] = target
+        self.targets.move_to_end(url)
+        while len(self.targets) > self.max_size:
+            self.targets.popitem(last=False)
+
+    def record(self, response: Response) -> None:
+        if self.max_size <= 0:
+            return
+        chain = [*response.history, response]
+        targets = [redirect.url for redirect in chain[1:]]
+        for redirect, target in zip(chain, targets):
+            if (
+                redirect.status_code in PERMANENT_REDIRECT_CODES
+                and redirect.request.method in PERMANENT_REDIRECT_METHODS
+            ):
+                self._store(str(redirect.url), str(target))
+
+    def resolve(self, url: str, max_hops: int) -> str:
+        seen = {url}
+        target = self.targets.get(url)
+        while target is not None and target not in seen and len(seen) <= max_hops:
+            self.targets.move_to_end(url)
+            url = target
+            seen.add(url)
+            target = self.targets.get(url)
+        return url
+
+
+@dataclass
+class InFlightRequest:
+    future: "asyncio.Future[typing.Optional[CLEANUP_WITH_RESPONSE]]"
+    waiters: int = 0
+
 
 class BaseDownloader(ABC):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        proxy_clients_pool: typing.Optional[ProxyClientPool] = None,
+        hedge_requests: typing.Optional[bool] = None,
+        concurrent_requests: typing.Optional[int] = None,
+        circuit_breaker: typing.Optional[CircuitBreaker] = None,
+        warc_writer: typing.Optional[WARCWriter] = None,
+    ):
         self.middleware_classes: typing.List[
             typing.Type[BaseMiddleWare]
         ] = build_middlewares_chain()
+        self.proxy_clients_pool: ProxyClientPool = (
+            proxy_clients_pool or ProxyClientPool()
+        )
+        self.hedge_requests: bool = first_not_none(
+            hedge_requests, CONFIGS.HEDGE_REQUESTS
+        )
+        self.hedge_percentile: float = CONFIGS.HEDGE_LATENCY_PERCENTILE
+        self.hedge_methods: typing.Set[str] = {
+            method.upper() for method in CONFIGS.HEDGE_METHODS
+        }
+        self.latencies = LatencyTracker(
+            window=CONFIGS.HEDGE_LATENCY_WINDOW, min_samples=CONFIGS.HEDGE_MIN_SAMPLES
+        )
+        self.concurrent_requests: typing.Optional[int] = first_not_none(
+            concurrent_requests, CONFIGS.CONCURRENT_REQUESTS
+        )
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+        self.coalesce_requests: bool = CONFIGS.COALESCE_REQUESTS
+        self.coalesce_methods: typing.Set[str] = {
+            method.upper() for method in CONFIGS.COALESCE_METHODS
+        }
+        self._in_flight: typing.Dict[str, InFlightRequest] = {}
+        self.circuit_breaker: typing.Optional[CircuitBreaker] = circuit_breaker
+        if circuit_breaker is None and CONFIGS.CIRCUIT_BREAKER_FAILURES is not None:
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=CONFIGS.CIRCUIT_BREAKER_FAILURES,
+                recovery_timeout=CONFIGS.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+                latency_slo=CONFIGS.CIRCUIT_BREAKER_LATENCY_SLO,
+                half_open_requests=CONFIGS.CIRCUIT_BREAKER_HALF_OPEN_REQUESTS,
+            )
+        self.circuit_breaker_policy: str = CONFIGS.CIRCUIT_BREAKER_POLICY
+        self.circuit_breaker_park_timeout: float = CONFIGS.CIRCUIT_BREAKER_PARK_TIMEOUT
+        self.max_redirects: int = CONFIGS.MAX_REDIRECTS
+        self.max_middleware_retries: int = CONFIGS.MAX_MIDDLEWARE_RETRIES
+        self.permanent_redirects = PermanentRedirectCache(
+            max_size=CONFIGS.PERMANENT_REDIRECTS_CACHE_SIZE
+        )
+        self.warc_writer: typing.Optional[WARCWriter] = warc_writer
+        if warc_writer is None and CONFIGS.WARC_DIRECTORY is not None:
+            self.warc_writer = WARCWriter(directory=CONFIGS.WARC_DIRECTORY)
+        # The clients of the downloader archive the responses with these hooks
+        self.event_hooks: EVENT_HOOKS = {}
+        if self.warc_writer is not None:
+            self.event_hooks["response"] = [self.warc_writer.archive_response]
+            self.proxy_clients_pool.event_hooks.setdefault("response", []).append(
+                self.warc_writer.archive_response
+            )
 
     async def _send_request_via_middlewares(
         self, request: "Request", middlewares: typing.List[BaseMiddleWare]
@@ -86,14 +347,190 @@ class BaseDownloader(ABC):
                         % request.__class__.__name__
                     )
 
+    async def _send_requests_via_middlewares(
+        self, requests: typing.List["Request"]
+    ) -> typing.List[typing.Optional["Request"]]:
+        batch: typing.List[typing.Optional[Request]] = list(requests)
+        for middleware in (middleware() for middleware in self.middleware_classes):
+            if type(middleware).process_requests is BaseMiddleWare.process_requests:
+                continue
+            indexes = [index for index, request in enumerate(batch) if request]
+            if not indexes:
+                break
+            log.debug(
+                f"Sending {len(indexes)} requests via middleware"
+                f" `{middleware.__class__.__name__}`"
+            )
+            processed = await middleware.process_requests(
+                requests=[typing.cast(Request, batch[index]) for index in indexes]
+            )
+            if not isinstance(processed, list) or len(processed) != len(indexes):
+                log.info(
+                    f"Invalid value was returned by requests"
+                    f" middleware: `{middleware.__class__.__name__}`"
+                )
+                raise TypeError(
+                    "Requests processing middleware must return a list "
+                    "of `Request` or `None` aligned with the given requests"
+                )
+            for index, request in zip(indexes, processed):
+                batch[index] = request
+        return batch
+
     def send_request(self, request: "Request") -> typing.AsyncGenerator[Response, None]:
+        if request.proxies and self.proxy_clients_pool.max_size > 0:
+            log.debug(f"Sending the request with the pooled client: {request.id=}")
+            return send_request_with_pool(pool=self.proxy_clients_pool, request=request)
         log.debug(f"Sending the standard request: {request.id=}")
-        return send_request(request=request)
+        return send_request(request=request, event_hooks=self.event_hooks)
+
+    async def close(self) -> None:
+        log.debug("Closing the pooled proxy clients")
+        await self.proxy_clients_pool.aclose()
+        if self.warc_writer is not None:
+            log.debug("Closing the WARC writer")
+            await self.warc_writer.close()
+
+    @asynccontextmanager
+    async def _concurrency_slot(self) -> typing.AsyncIterator[None]:
+        if self.concurrent_requests is None:
+            yield
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrent_requests)
+        async with self._semaphore:
+            yield
+
+    def _has_free_slot(self) -> bool:
+        return self._semaphore is None or not self._semaphore.locked()
+
+    async def _send(self, request: "Request") -> CLEANUP_WITH_RESPONSE:
+        async with self._concurrency_slot():
+            clean_up = self.send_request(request=request)
+            response = await clean_up.__anext__()
+        return clean_up, response
+
+    def _hedge_request_for(self, request: "Request") -> "Request":
+        hedge = request.copy()
+        if request.proxies:
+            for proxy in CONFIGS.PROXY_CHAIN:
+                if request.proxies != {"all": proxy}:
+                    hedge.proxies = {"all": proxy}
+                    break
+        return hedge
+
+    async def _send_hedged(
+        self, request: "Request", delay: float
+    ) -> CLEANUP_WITH_RESPONSE:
+        primary = asyncio.ensure_future(self._send(request))
+        try:
+            finished, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if finished or not self._has_free_slot():
+            return await primary
+
+        log.debug(f"Hedging the request after {delay=}: {request.id=}")
+        hedge = asyncio.ensure_future(self._send(self._hedge_request_for(request)))
+        pending: typing.Set[asyncio.Future] = {primary, hedge}
+        winner: typing.Optional[CLEANUP_WITH_RESPONSE] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    if winner is None:
+                        winner = task.result()
+                    else:
+                        await clean_up_response(task.result()[0])  # pragma: no cover
+        finally:
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, tuple):
+                    await clean_up_response(result[0])  # pragma: no cover
+        if winner is None:
+            raise typing.cast(BaseException, primary.exception())
+        return winner
+
+    async def _wait_for_circuit(
+        self, breaker: CircuitBreaker, host: str, request: "Request"
+    ) -> None:
+        parked_at = time.monotonic()
+        while not breaker.allow(host):
+            if (
+                self.circuit_breaker_policy != "park"
+                or time.monotonic() - parked_at >= self.circuit_breaker_park_timeout
+            ):
+                log.info(f"Dropping the request, `{host}` host is open: {request.id=}")
+                raise CircuitOpenException(f"The circuit for `{host}` is open")
+            log.debug(f"Parking the request, `{host}` host is open: {request.id=}")
+            await asyncio.sleep(breaker.retry_after(host))
+
+    async def _fetch(self, request: "Request") -> CLEANUP_WITH_RESPONSE:
+        breaker = self.circuit_breaker
+        if not self.hedge_requests and breaker is None:
+            return await self._send(request)
+        host = request_host(request)
+        if breaker is not None:
+            await self._wait_for_circuit(breaker, host, request)
+
+        delay = None
+        if self.hedge_requests and request.method.upper() in self.hedge_methods:
+            delay = self.latencies.percentile(host, self.hedge_percentile)
+        started = time.monotonic()
+        try:
+            if delay is None:
+                result = await self._send(request)
+            else:
+                result = await self._send_hedged(request, delay)
+        except httpx.HTTPError as e:
+            if breaker is None:
+                raise
+            # The failure is counted against the host and only this request
+            # is dropped, the rest of the crawl goes on
+            breaker.record_failure(host)
+            log.info(f"Dropping the request, `{host}` host failed: {e!r}")
+            raise HostFailureException(f"The `{host}` host failed: {e!r}") from e
+        except BaseException:
+            # Cancelled requests say nothing about the host
+            if breaker is not None:
+                breaker.release(host)
+            raise
+        latency = time.monotonic() - started
+
+        if self.hedge_requests:
+            self.latencies.record(host, latency)
+        if breaker is not None:
+            if result[1].is_server_error:
+                breaker.record_failure(host)
+            else:
+                breaker.record_success(host, latency)
+        return result
+
+    def _apply_permanent_redirect(self, request: "Request") -> "Request":
+        if (
+            not self.permanent_redirects.targets
+            or not request.follow_redirects
+            or request.method.upper() not in PERMANENT_REDIRECT_METHODS
+        ):
+            return request
+        url = str(request_url(request))
+        target = self.permanent_redirects.resolve(url, max_hops=self.max_redirects)
+        if target == url:
+            return request
+        log.debug(f"Sending the request to the `{target}` permanent redirect target")
+        return request.copy(url=target, params=None)
 
     async def _process_request_with_middlewares(
-        self, request: "Request"
+        self, request: "Request", redirects: int = 0, retries: int = 0
     ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
         log.debug(f"Processing the request: {request.id=}")
+        request = self._apply_permanent_redirect(request)
         log.debug(f"Building the middlewares: {request.id=}")
         middlewares = [middleware() for middleware in self.middleware_classes]
         log.debug(f"Middlewares: {middlewares}: {request.id=}")
@@ -103,8 +540,9 @@ class BaseDownloader(ABC):
             )
             log.debug(f"Request middlewares was processed for request: {request.id=}")
             if cleanup_and_response is None:
-                clean_up = self.send_request(request=request)
-                response = await clean_up.__anext__()
+                clean_up, response = await self._fetch(request=request)
+                if request.follow_redirects:
+                    self.permanent_redirects.record(response)
             else:
                 log.debug(
                     f"Request middlewares was explicit "
@@ -123,25 +561,113 @@ class BaseDownloader(ABC):
                 log.debug("Response middlewares was explicit returned the new request")
                 log.debug(f"Processing the new request explicit: {request.id=}")
                 await clean_up_response(clean_up)
+                # Only the requests that follow redirect responses are redirects,
+                # the other ones are retries, e.g. through the next proxy
+                if response.is_redirect:
+                    redirects += 1
+                    if redirects > self.max_redirects:
+                        log.info(
+                            f"Too many redirects, dropping the request: {request.id=}"
+                        )
+                        raise TooManyRedirectsException(
+                            f"Exceeded {self.max_redirects} redirects"
+                        )
+                else:
+                    retries += 1
+                    if retries > self.max_middleware_retries:
+                        log.info(
+                            f"Too many retries, dropping the request: {request.id=}"
+                        )
+                        raise TooManyRetriesException(
+                            f"Exceeded {self.max_middleware_retries} retries"
+                        )
                 return await self._process_request_with_middlewares(
-                    request=next_request
+                    request=next_request, redirects=redirects, retries=retries
                 )
             return clean_up, response
         except IgnoreRequestException:
             return None
 
+    def _coalescing_key(self, request: "Request") -> typing.Optional[str]:
+        if (
+            not self.coalesce_requests
+            or not request.coalesce
+            or request.stream
+            or request.method.upper() not in self.coalesce_methods
+        ):
+            return None
+        return request_fingerprint(request)
+
+    async def _process_request(
+        self, request: "Request"
+    ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
+        fingerprint = self._coalescing_key(request)
+        if fingerprint is None:
+            return await self._process_request_with_middlewares(request=request)
+
+        in_flight = self._in_flight.get(fingerprint)
+        if in_flight is None:
+            in_flight = InFlightRequest(
+                future=asyncio.ensure_future(
+                    self._process_request_with_middlewares(request=request)
+                )
+            )
+            self._in_flight[fingerprint] = in_flight
+            in_flight.future.add_done_callback(
+                partial(self._forget_in_flight, fingerprint, in_flight)
+            )
+        else:
+            log.debug(f"Coalescing the request with an in-flight one: {request.id=}")
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.future)
+        except asyncio.CancelledError:
+            if in_flight.waiters == 1:
+                in_flight.future.cancel()
+            raise
+        finally:
+            in_flight.waiters -= 1
+
+    def _forget_in_flight(
+        self, fingerprint: str, in_flight: InFlightRequest, _: asyncio.Future
+    ) -> None:
+        if self._in_flight.get(fingerprint) is in_flight:
+            del self._in_flight[fingerprint]
+
     @abstractmethod
     async def handle_request(
         self, request: "Request"
     ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
         ...
 
+    async def handle_requests(
+        self, requests: typing.List["Request"]
+    ) -> typing.List[typing.Optional[CLEANUP_WITH_RESPONSE]]:
+        log.debug(f"Handling the batch of {len(requests)} requests")
+        batch = await self._send_requests_via_middlewares(requests=requests)
+        tasks = [
+            asyncio.ensure_future(self.handle_request(request=request))
+            for request in batch
+            if request is not None
+        ]
+        try:
+            responses = iter(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, tuple):
+                    await clean_up_response(result[0])
+            raise
+        return [None if request is None else next(responses) for request in batch]
+
 
 class Downloader(BaseDownloader):
     async def handle_request(
         self, request: "Request"
     ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
-        response_gen = await self._process_request_with_middlewares(request=request)
+        response_gen = await self._process_request(request=request)
         return response_gen
 
 
@@ -158,8 +684,9 @@ class SessionDownloader(BaseDownloader):
         http2: typing.Optional[bool] = None,
         timeout: typing.Optional[TimeoutTypes] = None,
         trust_env: typing.Optional[bool] = None,
+        warc_writer: typing.Optional[WARCWriter] = None,
     ):
-        super().__init__()
+        super().__init__(warc_writer=warc_writer)
         self.session: httpx.AsyncClient = create_default_session(
             app=app,
             base_url=base_url,
@@ -172,16 +699,23 @@ class SessionDownloader(BaseDownloader):
             timeout=timeout,
             trust_env=trust_env,
         )
+        for name, hooks in self.event_hooks.items():
+            self.session.event_hooks[name].extend(hooks)
 
     async def handle_request(
         self, request: "Request"
     ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
-        return await self._process_request_with_middlewares(request=request)
+        return await self._process_request(request=request)
 
     def send_request(self, request: "Request") -> typing.AsyncGenerator[Response, None]:
         log.debug(f"Sending the request with the session: {request=} {self.session=}")
         return send_request_with_session(session=self.session, request=request)
 
+    async def close(self) -> None:
+        await super().close()
+        log.debug("Closing the downloader session")
+        await self.session.aclose()
+
 
 def create_default_session(
     app: typing.Optional[typing.Callable[..., typing.Any]],
@@ -206,6 +740,7 @@ def create_default_session(
         trust_env=first_not_none(trust_env, CONFIGS.DEFAULT_TRUST_ENV),
         http1=first_not_none(http1, CONFIGS.HTTP_1),
         http2=first_not_none(http2, CONFIGS.HTTP_2),
+        max_redirects=CONFIGS.MAX_REDIRECTS,
     )
 
 
@@ -242,7 +777,55 @@ async def send_request_with_session(
         yield response
 
 
-async def send_request(request: "Request") -> typing.AsyncGenerator[Response, None]:
+async def send_request_with_pool(
+    pool: ProxyClientPool, request: "Request"
+) -> typing.AsyncGenerator[Response, None]:
+    async with pool.acquire(request=request) as client:
+        # Pooled clients keep no cookies, so the redirects are followed
+        # here with the cookie jar of the request instead of the client one
+        cookies = httpx.Cookies(request.cookies)
+        httpx_request = client.build_request(
+            method=request.method,
+            url=request.url,
+            content=request.content,
+            data=request.data,
+            files=request.files,
+            json=request.json,
+            params=request.params,
+            headers=request.headers,
+            cookies=cookies,
+            timeout=request.timeout,
+        )
+        history: typing.List[Response] = []
+        while True:
+            response = await client.send(
+                httpx_request,
+                stream=request.stream,
+                auth=request.auth or USE_CLIENT_DEFAULT,
+                follow_redirects=False,
+            )
+            cookies.extract_cookies(response)
+            response.history = list(history)
+            next_request = response.next_request
+            if not request.follow_redirects or next_request is None:
+                break
+            await response.aclose()
+            if len(history) >= client.max_redirects:
+                raise httpx.TooManyRedirects(
+                    "Exceeded maximum allowed redirects.", request=next_request
+                )
+            history.append(response)
+            cookies.set_cookie_header(next_request)
+            httpx_request = next_request
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+
+async def send_request(
+    request: "Request", event_hooks: typing.Optional[EVENT_HOOKS] = None
+) -> typing.AsyncGenerator[Response, None]:
     log.debug(f"Creating the AsyncClient for the request: {request.id=}")
     async with httpx.AsyncClient(
         cookies=request.cookies,
@@ -255,6 +838,8 @@ async def send_request(request: "Request") -> typing.AsyncGenerator[Response, No
         http2=request.http2,
         base_url=request.base_url,
         app=request.app,
+        max_redirects=CONFIGS.MAX_REDIRECTS,
+        event_hooks=event_hooks,
     ) as session:
         log.debug(f"Async client was created: AsyncClient={session}")
         if request.stream:
@@ -54,33 +54,16 @@ class Engine:
                 RuntimeWarning,
             )
 
-    async def _send_single_request_to_downloader(
-        self, request: Request
-    ) -> typing.Optional[CLEANUP_WITH_RESPONSE]:
-        return await self.downloader.handle_request(request=request)
-
     async def _send_all_requests_to_downloader(
         self,
     ) -> typing.List[CLEANUP_WITH_RESPONSE]:
-        request_tasks: typing.List[typing.Awaitable] = []
-        for request in self.spider.requests:
-            request_tasks.append(
-                asyncio.create_task(
-                    self._send_single_request_to_downloader(request=request)
-                )
-            )
+        requests = self.spider.requests[:]
         self.spider.requests.clear()
-        coro = asyncio.gather(*request_tasks)  # type: ignore
         try:
-            responses = await coro
+            responses = await self.downloader.handle_requests(requests=requests)
         except BaseException as e:  # pragma: no cover
-            coro.cancel()
             raise DownloadFailedException from e
-        return [
-            response
-            for response in responses
-            if response and not isinstance(response, BaseException)
-        ]
+        return [response for response in responses if response is not None]
 
     async def _handle_single_response(
         self, response_and_generator: CLEANUP_WITH_RESPONSE
@@ -105,7 +88,10 @@ class Engine:
             if isinstance(yielded_value, Request):
                 self.spider.requests.append(yielded_value)
             elif isinstance(yielded_value, Item):
-                self.spider.items.append(yielded_value)  # pragma: no cover
+                if self.items_manager:
+                    await self.items_manager.put(yielded_value)
+                else:
+                    self.spider.items.append(yielded_value)
             elif yielded_value is None:  # pragma: no cover
                 ...  # pragma: no cover
             else:
@@ -134,8 +120,8 @@ class Engine:
         try:
             log.debug("Handling the responses")
             await self._handle_responses(responses=responses)
-            if self.items_manager:
-                log.debug("Processing the items")
+            if self.items_manager and self.spider.items:
+                log.debug("Processing the items added to the spider")
                 await self.items_manager.process_items(self.spider.items)
             log.debug("Clear spider items after processing")
             self.spider.items.clear()
@@ -144,14 +130,33 @@ class Engine:
                 log.debug("Cleaning up the responses")
                 await clean_up_response(gen)
 
+    async def _set_up(self) -> None:
+        log.debug("Set up was called")
+        if self.items_manager:
+            log.info("Opening the item middlewares")
+            await self.items_manager.set_up_middlewares()
+            log.info(f"Opening the loaders: {self.items_manager.loaders=}")
+            await self.items_manager.set_up_loaders()
+
     async def _tear_down(self) -> None:
         log.debug("Tear down was called")
-        if self.items_manager:
-            log.info(f"Closing the opened loaders: {self.items_manager.loaders=}")
-            await self.items_manager.tear_down_loaders()
+        try:
+            if self.items_manager:
+                try:
+                    log.info(
+                        f"Closing the opened loaders: {self.items_manager.loaders=}"
+                    )
+                    await self.items_manager.tear_down_loaders()
+                finally:
+                    log.info("Closing the item middlewares")
+                    await self.items_manager.tear_down_middlewares()
+        finally:
+            log.info("Closing the downloader")
+            await self.downloader.close()
 
     async def run(self) -> None:
         try:
+            await self._set_up()
             while self.spider.requests:
                 await self._run_once()
                 await asyncio.sleep(self.loop_delay)
@@ -1,7 +1,11 @@
 # * ScrapyioException
 # +   EngineException
 # +   DownloaderException
-# -       IgnoreRequestException
+# +       IgnoreRequestException
+# -           CircuitOpenException
+# -           HostFailureException
+# -           TooManyRedirectsException
+# -           TooManyRetriesException
 # -       DownloadFailedException
 # +   ItemManagerException
 # -       IgnoreItemException
@@ -32,6 +36,22 @@ class DownloadFailedException(DownloaderException):
     ...
 
 
+class CircuitOpenException(IgnoreRequestException):
+    ...
+
+
+class HostFailureException(IgnoreRequestException):
+    ...
+
+
+class TooManyRedirectsException(IgnoreRequestException):
+    ...
+
+
+class TooManyRetriesException(IgnoreRequestException):
+    ...
+
+
 class ItemManagerException(ScrapyioException):
     ...
 
@@ -1,9 +1,13 @@
+import hashlib
+import json as jsonlib
 import logging
 import typing
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields
+from http.cookiejar import CookieJar
 from itertools import count
+from operator import attrgetter
 
-from httpx import Response
+from httpx import URL, Cookies, Headers, Response
 from httpx._config import Timeout
 from httpx._types import (
     AuthTypes,
@@ -21,51 +25,302 @@ from httpx._types import (
 )
 
 from .settings import CONFIGS
+from .utils import make_hashable
 
 log = logging.getLogger("scrapyio")
 
 
-@dataclass
-class Request:
-    url: str
-    method: str
-    id: int = field(default_factory=count().__next__)
-    auth: typing.Optional[AuthTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_AUTH
-    )
-    params: typing.Optional[QueryParamTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_PARAMS
-    )
-    headers: typing.Optional[HeaderTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_HEADERS
-    )
-    cookies: typing.Optional[CookieTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_COOKIES
-    )
-    verify: VerifyTypes = field(default_factory=lambda: CONFIGS.DEFAULT_VERIFY_SSL)
-    cert: typing.Optional[CertTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_CERTS
-    )
-    http1: bool = CONFIGS.HTTP_1
-    http2: bool = CONFIGS.HTTP_2
-    proxies: typing.Optional[ProxiesTypes] = field(
-        default_factory=lambda: CONFIGS.DEFAULT_PROXIES
-    )
-    follow_redirects: bool = CONFIGS.FOLLOW_REDIRECTS
-    timeout: TimeoutTypes = field(
-        default_factory=lambda: Timeout(CONFIGS.REQUEST_TIMEOUT)
-    )
-    trust_env: bool = CONFIGS.DEFAULT_TRUST_ENV
+@dataclass(frozen=True)
+class RequestDefaults:
+    auth: typing.Optional[AuthTypes]
+    params: typing.Optional[QueryParamTypes]
+    headers: typing.Optional[HeaderTypes]
+    cookies: typing.Optional[CookieTypes]
+    verify: VerifyTypes
+    cert: typing.Optional[CertTypes]
+    http1: bool
+    http2: bool
+    proxies: typing.Optional[ProxiesTypes]
+    follow_redirects: bool
+    timeout: TimeoutTypes
+    trust_env: bool
+    stream: bool
     content: typing.Optional[RequestContent] = None
     data: typing.Optional[RequestData] = None
     files: typing.Optional[RequestFiles] = None
     json: typing.Optional[typing.Any] = None
-    stream: bool = CONFIGS.ENABLE_STREAM_BY_DEFAULT
     app: typing.Optional[typing.Callable[..., typing.Any]] = None
     base_url: URLTypes = ""
+    coalesce: bool = True
+    meta: typing.Optional[typing.Dict[str, typing.Any]] = None
+
 
-    def __post_init__(self):
-        log.debug(f"New `Request` instance was created: {self=} was created")
+_DEFAULT_SETTINGS = attrgetter(
+    "DEFAULT_AUTH",
+    "DEFAULT_PARAMS",
+    "DEFAULT_HEADERS",
+    "DEFAULT_COOKIES",
+    "DEFAULT_VERIFY_SSL",
+    "DEFAULT_CERTS",
+    "HTTP_1",
+    "HTTP_2",
+    "DEFAULT_PROXIES",
+    "FOLLOW_REDIRECTS",
+    "REQUEST_TIMEOUT",
+    "DEFAULT_TRUST_ENV",
+    "ENABLE_STREAM_BY_DEFAULT",
+)
+_defaults_cache: typing.Optional[typing.Tuple[typing.Tuple, RequestDefaults]] = None
+
+
+def request_defaults() -> RequestDefaults:
+    global _defaults_cache
+
+    settings = _DEFAULT_SETTINGS(CONFIGS)
+    if _defaults_cache is None or _defaults_cache[0] != settings:
+        log.debug("Building the default request settings")
+        (
+            auth,
+            params,
+            headers,
+            cookies,
+            verify,
+            cert,
+            http1,
+            http2,
+            proxies,
+            follow_redirects,
+            timeout,
+            trust_env,
+            stream,
+        ) = settings
+        defaults = RequestDefaults(
+            auth=auth,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            verify=verify,
+            cert=cert,
+            http1=http1,
+            http2=http2,
+            proxies=proxies,
+            follow_redirects=follow_redirects,
+            timeout=Timeout(timeout),
+            trust_env=trust_env,
+            stream=stream,
+        )
+        _defaults_cache = (settings, defaults)
+    return _defaults_cache[1]
+
+
+_UNSET: typing.Any = object()
+_request_ids = count()
+
+
+class Request:
+    # Only the fields passed explicitly are stored on the instance,
+    # everything else is read from the shared `RequestDefaults`.
+    optional_fields: typing.ClassVar[typing.Tuple[str, ...]] = tuple(
+        request_field.name for request_field in fields(RequestDefaults)
+    )
+    _optional_fields_set: typing.ClassVar[typing.FrozenSet[str]] = frozenset(
+        optional_fields
+    )
+    __slots__ = ("url", "method", "id", "_defaults", *optional_fields)
+
+    url: str
+    method: str
+    id: int
+    auth: typing.Optional[AuthTypes]
+    params: typing.Optional[QueryParamTypes]
+    headers: typing.Optional[HeaderTypes]
+    cookies: typing.Optional[CookieTypes]
+    verify: VerifyTypes
+    cert: typing.Optional[CertTypes]
+    http1: bool
+    http2: bool
+    proxies: typing.Optional[ProxiesTypes]
+    follow_redirects: bool
+    timeout: TimeoutTypes
+    trust_env: bool
+    content: typing.Optional[RequestContent]
+    data: typing.Optional[RequestData]
+    files: typing.Optional[RequestFiles]
+    json: typing.Optional[typing.Any]
+    stream: bool
+    app: typing.Optional[typing.Callable[..., typing.Any]]
+    base_url: URLTypes
+    coalesce: bool
+    meta: typing.Optional[typing.Dict[str, typing.Any]]
+
+    def __init__(
+        self,
+        url: str,
+        method: str,
+        id: int = _UNSET,
+        auth: typing.Optional[AuthTypes] = _UNSET,
+        params: typing.Optional[QueryParamTypes] = _UNSET,
+        headers: typing.Optional[HeaderTypes] = _UNSET,
+        cookies: typing.Optional[CookieTypes] = _UNSET,
+        verify: VerifyTypes = _UNSET,
+        cert: typing.Optional[CertTypes] = _UNSET,
+        http1: bool = _UNSET,
+        http2: bool = _UNSET,
+        proxies: typing.Optional[ProxiesTypes] = _UNSET,
+        follow_redirects: bool = _UNSET,
+        timeout: TimeoutTypes = _UNSET,
+        trust_env: bool = _UNSET,
+        content: typing.Optional[RequestContent] = _UNSET,
+        data: typing.Optional[RequestData] = _UNSET,
+        files: typing.Optional[RequestFiles] = _UNSET,
+        json: typing.Optional[typing.Any] = _UNSET,
+        stream: bool = _UNSET,
+        app: typing.Optional[typing.Callable[..., typing.Any]] = _UNSET,
+        base_url: URLTypes = _UNSET,
+        coalesce: bool = _UNSET,
+        meta: typing.Optional[typing.Dict[str, typing.Any]] = _UNSET,
+    ):
+        self.url = url
+        self.method = method
+        self.id = next(_request_ids) if id is _UNSET else id
+        self._defaults = request_defaults()
+        for name, value in zip(
+            self.optional_fields,
+            (
+                auth,
+                params,
+                headers,
+                cookies,
+                verify,
+                cert,
+                http1,
+                http2,
+                proxies,
+                follow_redirects,
+                timeout,
+                trust_env,
+                stream,
+                content,
+                data,
+                files,
+                json,
+                app,
+                base_url,
+                coalesce,
+                meta,
+            ),
+        ):
+            if value is not _UNSET:
+                setattr(self, name, value)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if name in self._optional_fields_set:
+            return getattr(self._defaults, name)
+        raise AttributeError(
+            f"'{self.__class__.__name__}' object has no attribute '{name}'"
+        )
+
+    def overrides(self) -> typing.Dict[str, typing.Any]:
+        overrides = {}
+        for name in self.optional_fields:
+            try:
+                overrides[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                ...
+        return overrides
+
+    def __getstate__(self) -> typing.Dict[str, typing.Any]:
+        state = self.overrides()
+        state.update(url=self.url, method=self.method, id=self.id)
+        return state
+
+    def copy(self, **changes: typing.Any) -> "Request":
+        kwargs = self.__getstate__()
+        kwargs.update(changes)
+        return self.__class__(**kwargs)
+
+    __copy__ = copy
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
+        self._defaults = request_defaults()
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in ("url", "method", "id", *self.optional_fields)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields_repr = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in ("url", "method", "id", *self.optional_fields)
+        )
+        return f"{self.__class__.__name__}({fields_repr})"
+
+
+def request_host(request: Request) -> str:
+    if request.base_url:
+        return URL(request.base_url).join(request.url).host
+    return URL(request.url).host
+
+
+def request_url(request: Request) -> URL:
+    url = (
+        URL(request.base_url).join(request.url)
+        if request.base_url
+        else URL(request.url)
+    )
+    if request.params:
+        url = url.copy_merge_params(request.params)
+    return url
+
+
+def request_fingerprint(request: Request) -> typing.Optional[str]:
+    content = request.content
+    if request.files is not None:
+        return None
+    if content is not None and not isinstance(content, (str, bytes)):
+        return None
+    # Cookie jars and custom auth flows carry state that
+    # cannot be compared, so such requests are never shared
+    if isinstance(request.cookies, (Cookies, CookieJar)):
+        return None
+    if request.auth is not None and not isinstance(request.auth, tuple):
+        return None
+    fingerprint = hashlib.sha1(request.method.upper().encode())
+    fingerprint.update(str(request_url(request)).encode())
+    session = (
+        request.cookies,
+        request.auth,
+        request.proxies,
+        request.verify,
+        request.cert,
+        request.app,
+        request.follow_redirects,
+        request.trust_env,
+        request.http1,
+        request.http2,
+        request.timeout,
+    )
+    fingerprint.update(repr(make_hashable(session)).encode())
+    if request.headers:
+        for key, value in sorted(Headers(request.headers).multi_items()):
+            fingerprint.update(f"{key}:{value}".encode())
+    if content is not None:
+        fingerprint.update(content.encode() if isinstance(content, str) else content)
+    if request.data is not None:
+        fingerprint.update(repr(sorted(request.data.items())).encode())
+    if request.json is not None:
+        fingerprint.update(
+            jsonlib.dumps(request.json, sort_keys=True, default=str).encode()
+        )
+    return fingerprint.hexdigest()
 
 
 async def clean_up_response(response_gen: typing.AsyncGenerator[Response, None]):
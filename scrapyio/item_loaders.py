@@ -1,12 +1,28 @@
+import asyncio
+import itertools
+import json
+import operator
+import os
+import tempfile
+import time
 import typing
 import warnings
 from abc import ABC, abstractmethod
 from asyncio import Lock
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from enum import Enum, auto
 from types import ModuleType
 
-from .utils import random_filename
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+from .serialization import dumps_item, iter_records, loads_item, write_record
+from .settings import CONFIGS
+from .utils import first_not_none, random_filename
+from .writers import ShardedFileWriter
 
 if typing.TYPE_CHECKING:
     from scrapyio.items import Item
@@ -14,6 +30,22 @@ if typing.TYPE_CHECKING:
 import csv
 import logging
 
+orjson: typing.Optional[ModuleType]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # pragma: no cover
+
+pyarrow: typing.Optional[ModuleType]
+
+try:
+    import pyarrow  # type: ignore[no-redef]
+    import pyarrow as pa
+    from pyarrow import parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None  # pragma: no cover
+
 sqlalchemy: typing.Optional[ModuleType]
 
 try:
@@ -22,19 +54,64 @@ try:
         Column,
         DateTime,
         Float,
+        Index,
         Integer,
         MetaData,
         String,
         Table,
+        event,
         insert,
     )
-    from sqlalchemy.engine import URL
+    from sqlalchemy.dialects import mysql, postgresql, sqlite
+    from sqlalchemy.engine import URL, make_url
     from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+    from sqlalchemy.sql.dml import Insert
 except ImportError:  # pragma: no cover
     sqlalchemy = None  # pragma: no cover
 
 log = logging.getLogger("scrapyio")
 
+T = typing.TypeVar("T")
+
+# What a loader writer does with new items while its queue is full
+OVERFLOW_POLICIES = ("block", "spill", "drop")
+
+
+def dumps_json(
+    values: typing.Dict[str, typing.Any],
+    default: typing.Callable[..., typing.Any] = pydantic_encoder,
+) -> bytes:
+    # Nested models are converted by `pydantic_encoder`
+    if orjson is not None:
+        return orjson.dumps(values, default=default)
+    return json.dumps(
+        values, default=default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def model_json(model: BaseModel) -> bytes:
+    # The same document as `model.json()`: values are encoded with the
+    # `json_encoders` of the model config and excluded fields are left out
+    values = model.__dict__
+    if model.__exclude_fields__ or model.__include_fields__:
+        values = model.dict()
+    return dumps_json(values, default=model.__json_encoder__)
+
+
+def item_json(item: BaseModel) -> bytes:
+    # Items serialize themselves once and share the result between loaders
+    json_bytes = getattr(item, "json_bytes", None)
+    if json_bytes is not None:
+        return json_bytes()
+    return model_json(item)
+
+
+def item_dict(item: BaseModel) -> typing.Dict[str, typing.Any]:
+    cached_dict = getattr(item, "cached_dict", None)
+    if cached_dict is not None:
+        return cached_dict()
+    return item.dict()
+
 
 class LoaderState(Enum):
     CREATED = auto()
@@ -52,6 +129,10 @@ class BaseLoader(ABC):
     async def dump(self, item: "Item") -> None:
         ...
 
+    async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+        for item in items:
+            await self.dump(item=item)
+
     @abstractmethod
     async def close(self) -> None:
         ...
@@ -79,8 +160,7 @@ class ProxyLoader:
             self.state = LoaderState.OPENED
             await self.loader.open()
 
-    async def dump(self, item: "Item") -> None:
-        log.debug(f"Dumping in {self.loader.__class__.__name__}")
+    def _start_dumping(self) -> None:
         if self.state == LoaderState.CLOSED:
             raise RuntimeError(
                 "It is not possible to dump a pydantic "
@@ -90,9 +170,17 @@ class ProxyLoader:
             raise RuntimeError(
                 "The newly created loader cannot dump an object; it must be opened."
             )
-        else:
-            self.state = LoaderState.DUMPING
-            await self.loader.dump(item=item)
+        self.state = LoaderState.DUMPING
+
+    async def dump(self, item: "Item") -> None:
+        log.debug(f"Dumping in {self.loader.__class__.__name__}")
+        self._start_dumping()
+        await self.loader.dump(item=item)
+
+    async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+        log.debug(f"Dumping {len(items)} items in {self.loader.__class__.__name__}")
+        self._start_dumping()
+        await self.loader.dump_many(items=items)
 
     async def close(self) -> None:
         log.debug(f"Closing {self.loader.__class__.__name__} loader")
@@ -114,72 +202,480 @@ class ProxyLoader:
         return f"<ProxyLoader {self.loader.__class__.__name__}>"
 
 
+@dataclass
+class LoaderStats:
+    # Items handed over to the loader and not loaded yet
+    lag: int = 0
+    written: int = 0
+    failed: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    batches: int = 0
+    writing_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        # Items written per second spent in the loader
+        if not self.writing_time:
+            return 0.0
+        return self.written / self.writing_time
+
+
+class LoaderWriter:
+    def __init__(
+        self,
+        loader: ProxyLoader,
+        queue_size: typing.Optional[int] = None,
+        overflow_policy: typing.Optional[str] = None,
+        batch_size: typing.Optional[int] = None,
+    ):
+        self.loader = loader
+        self.queue_size: int = first_not_none(queue_size, CONFIGS.LOADER_QUEUE_SIZE)
+        self.overflow_policy: str = first_not_none(
+            overflow_policy, CONFIGS.LOADER_OVERFLOW_POLICY
+        )
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy `{self.overflow_policy}`, "
+                f"expected one of {OVERFLOW_POLICIES}"
+            )
+        self.batch_size: int = first_not_none(
+            batch_size, CONFIGS.ITEMS_LOADING_BATCH_SIZE
+        )
+        self.queue: "asyncio.Queue[Item]" = asyncio.Queue(maxsize=self.queue_size)
+        self.stats = LoaderStats()
+        self.pending: int = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.spill_file: typing.Optional[typing.BinaryIO] = None
+        self.spill_offset: int = 0
+        self.spill_pending: int = 0
+        self.unspilled = asyncio.Event()
+        self.unspilled.set()
+        self.spill_executor: typing.Optional[ThreadPoolExecutor] = None
+        self.task: typing.Optional["asyncio.Task[None]"] = None
+        self.failure: typing.Optional[BaseException] = None
+
+    @property
+    def name(self) -> str:
+        return self.loader.loader.__class__.__name__
+
+    def start(self) -> None:
+        log.debug(f"Starting the {self.name} writer")
+        self.task = asyncio.create_task(self._run())
+
+    def _add_pending(self, count: int) -> None:
+        self.pending += count
+        self.stats.lag = self.pending
+        if self.pending:
+            self.idle.clear()
+        else:
+            self.idle.set()
+
+    async def put(self, item: "Item") -> None:
+        # Once something is spilled, newer items are spilled
+        # too, so they are loaded in the order they came
+        if self.overflow_policy == "block" or (
+            not self.queue.full() and not self.spill_pending
+        ):
+            self._add_pending(1)
+            await self.queue.put(item)
+        elif self.overflow_policy == "spill":
+            self._add_pending(1)
+            await self._spill(item)
+        else:
+            log.debug(f"The {self.name} queue is full, dropping the item")
+            self.stats.dropped += 1
+
+    async def _run_spill(self, func: typing.Callable[..., T], *args: typing.Any) -> T:
+        # The spill file is used from a single thread, so the
+        # records are read back only after they are written
+        if self.spill_executor is None:
+            self.spill_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scrapyio-spill"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.spill_executor, func, *args)
+
+    async def _spill(self, item: "Item") -> None:
+        try:
+            record = dumps_item(item)
+        except TypeError as e:
+            # Items that cannot be spilled wait for the loader instead,
+            # after the already spilled items to keep the order
+            log.warning(f"Blocking, the item cannot be spilled to {self.name}: {e}")
+            await self.unspilled.wait()
+            await self.queue.put(item)
+            return
+        self.spill_pending += 1
+        self.unspilled.clear()
+        self.stats.spilled += 1
+        await self._run_spill(self._write_spilled, record)
+
+    def _write_spilled(self, record: bytes) -> None:
+        if self.spill_file is None:
+            self.spill_file = typing.cast(typing.BinaryIO, tempfile.TemporaryFile())
+        self.spill_file.seek(0, os.SEEK_END)
+        write_record(self.spill_file, record)
+
+    def _read_spilled(self, count: int) -> typing.List[bytes]:
+        assert self.spill_file
+        self.spill_file.seek(self.spill_offset)
+        records = list(itertools.islice(iter_records(self.spill_file), count))
+        self.spill_offset = self.spill_file.tell()
+        return records
+
+    def _truncate_spilled(self) -> None:
+        assert self.spill_file
+        self.spill_file.truncate(0)
+        self.spill_offset = 0
+
+    async def _unspill(self) -> typing.List["Item"]:
+        count = min(self.batch_size, self.spill_pending)
+        self.spill_pending -= count
+        try:
+            records = await self._run_spill(self._read_spilled, count)
+            return [loads_item(record) for record in records]
+        except Exception as e:
+            log.error(f"Reading the items spilled to {self.name} failed: {e!r}")
+            self.failure = self.failure or e
+            self.stats.failed += count
+            self._add_pending(-count)
+            return []
+        finally:
+            if not self.spill_pending:
+                await self._run_spill(self._truncate_spilled)
+                if not self.spill_pending:
+                    self.unspilled.set()
+
+    async def _next_batch(self) -> typing.List["Item"]:
+        # Queued items are older than the spilled ones
+        if self.queue.empty() and self.spill_pending:
+            return await self._unspill()
+        items = [await self.queue.get()]
+        while len(items) < self.batch_size and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        return items
+
+    async def _run(self) -> None:
+        while True:
+            items = await self._next_batch()
+            if not items:
+                continue
+            started = time.monotonic()
+            try:
+                if self.loader.state == LoaderState.CREATED:
+                    # Loaders are set up when the engine starts,
+                    # managers used without an engine open them here
+                    await self.loader.open()
+                await self.loader.dump_many(items)
+            except Exception as e:
+                log.error(f"Item loading in {self.name} failed: {e!r}")
+                self.failure = self.failure or e
+                self.stats.failed += len(items)
+            else:
+                self.stats.written += len(items)
+                self.stats.batches += 1
+            finally:
+                self.stats.writing_time += time.monotonic() - started
+                self._add_pending(-len(items))
+
+    async def join(self) -> None:
+        await self.idle.wait()
+
+    async def stop(self) -> None:
+        log.debug(f"Stopping the {self.name} writer")
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.spill_executor is not None:
+            self.spill_executor.shutdown(wait=True)
+            self.spill_executor = None
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+
 class JSONLoader(BaseLoader):
-    def __init__(self, filename: typing.Optional[str] = None):
+    def __init__(
+        self,
+        filename: typing.Optional[str] = None,
+        buffer_size: typing.Optional[int] = None,
+        flush_interval: typing.Optional[float] = None,
+        fsync: typing.Optional[str] = None,
+        shard_bytes: typing.Optional[int] = None,
+        shard_items: typing.Optional[int] = None,
+        shard_seconds: typing.Optional[float] = None,
+    ):
         super().__init__()
         self.filename = filename or random_filename()
-        self.file: typing.Optional[typing.TextIO] = None
-        self.first_item: bool = True
+        # Every shard is a complete JSON array
+        self.file = ShardedFileWriter(
+            self.filename,
+            header=b"[\n",
+            separator=b",\n",
+            footer=b"\n]",
+            shard_bytes=shard_bytes,
+            shard_items=shard_items,
+            shard_seconds=shard_seconds,
+            buffer_size=buffer_size,
+            flush_interval=flush_interval,
+            fsync=fsync,
+        )
 
     async def open(self) -> None:
-        self.file = open(self.filename, mode="w", encoding="utf-8")
-        self.file.write("[\n")
+        await self.file.open()
 
     async def dump(self, item: "Item") -> None:
-        assert self.file
-        serialized_item = item.json()
-        if not self.first_item:
-            self.file.write(",\n" + serialized_item)
-        else:
-            self.file.write(serialized_item)
-            self.first_item = False
+        await self.dump_many(items=[item])
+
+    async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+        await self.file.write_records([item_json(item) for item in items])
 
     async def close(self) -> None:
-        assert self.file
-        self.file.write("\n]")
-        self.file.close()
+        await self.file.close()
+
+
+class JSONLinesLoader(BaseLoader):
+    compression_suffixes = {"gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(
+        self,
+        filename: typing.Optional[str] = None,
+        compression: typing.Optional[str] = None,
+        buffer_size: typing.Optional[int] = None,
+        flush_interval: typing.Optional[float] = None,
+        fsync: typing.Optional[str] = None,
+        shard_bytes: typing.Optional[int] = None,
+        shard_items: typing.Optional[int] = None,
+        shard_seconds: typing.Optional[float] = None,
+    ):
+        super().__init__()
+        if filename is None:
+            filename = random_filename() + ".jsonl"
+            filename += self.compression_suffixes.get(compression or "", "")
+        self.filename = filename
+        self.file = ShardedFileWriter(
+            self.filename,
+            shard_bytes=shard_bytes,
+            shard_items=shard_items,
+            shard_seconds=shard_seconds,
+            buffer_size=buffer_size,
+            flush_interval=flush_interval,
+            fsync=fsync,
+            compression=compression,
+        )
+
+    @staticmethod
+    def serialize(item: "Item") -> bytes:
+        return item_json(item) + b"\n"
+
+    async def open(self) -> None:
+        await self.file.open()
+
+    async def dump(self, item: "Item") -> None:
+        await self.dump_many(items=[item])
+
+    async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+        await self.file.write_records([self.serialize(item) for item in items])
+
+    async def close(self) -> None:
+        await self.file.close()
+
+
+@dataclass
+class CSVModelFile:
+    file: ShardedFileWriter
+    row: typing.Callable[[typing.Any], typing.Sequence[typing.Any]]
+
+
+class CSVRows(typing.List[str]):
+    # `csv.writer` writes every row with a single `write` call
+    write = list.append
+
+
+def csv_rows(rows: typing.Iterable[typing.Sequence[typing.Any]]) -> typing.List[bytes]:
+    # Every batch is formatted in its own buffer before anything is
+    # awaited, so concurrent dumps never write the rows of each other
+    buffer = CSVRows()
+    csv.writer(buffer).writerows(rows)
+    return [row.encode() for row in buffer]
 
 
 class CSVLoader(BaseLoader):
-    def __init__(self, filename: typing.Optional[str] = None):
+    def __init__(
+        self,
+        filename: typing.Optional[str] = None,
+        buffer_size: typing.Optional[int] = None,
+        flush_interval: typing.Optional[float] = None,
+        fsync: typing.Optional[str] = None,
+        shard_bytes: typing.Optional[int] = None,
+        shard_items: typing.Optional[int] = None,
+        shard_seconds: typing.Optional[float] = None,
+    ):
         super().__init__()
         self.filename = filename or random_filename()
-        self.file: typing.Optional[typing.TextIO] = None
-        self.first_item: bool = True
-        self.writer: typing.Optional[csv.DictWriter] = None
+        self.writer_options: typing.Dict[str, typing.Any] = dict(
+            shard_bytes=shard_bytes,
+            shard_items=shard_items,
+            shard_seconds=shard_seconds,
+            buffer_size=buffer_size,
+            flush_interval=flush_interval,
+            fsync=fsync,
+        )
+        self.file = ShardedFileWriter(self.filename, **self.writer_options)
+        self.files: typing.Dict[typing.Type[BaseModel], CSVModelFile] = {}
+        self.files_lock = Lock()
+
+    @staticmethod
+    def columns(model: typing.Type[BaseModel]) -> typing.List[str]:
+        # Fields excluded from `dict()` are left out of the files too
+        excluded = model.__exclude_fields__ or {}
+        return [name for name in model.__fields__ if excluded.get(name) is not True]
+
+    @classmethod
+    def row_getter(
+        cls, model: typing.Type[BaseModel]
+    ) -> typing.Callable[[typing.Any], typing.Sequence[typing.Any]]:
+        columns = cls.columns(model)
+        if any(
+            isinstance(model_field.type_, type)
+            and issubclass(model_field.type_, BaseModel)
+            for model_field in model.__fields__.values()
+        ):
+            # Nested models are written the way `dict()` converts them
+            return lambda item: [item_dict(item)[name] for name in columns]
+        if len(columns) == 1:
+            (name,) = columns
+            return lambda item: (getattr(item, name),)
+        return operator.attrgetter(*columns)
+
+    async def _model_file(self, model: typing.Type[BaseModel]) -> CSVModelFile:
+        model_file = self.files.get(model)
+        if model_file is not None:
+            return model_file
+        async with self.files_lock:
+            return await self._create_model_file(model)
+
+    async def _create_model_file(self, model: typing.Type[BaseModel]) -> CSVModelFile:
+        model_file = self.files.get(model)
+        if model_file is None:
+            # The first model uses the given filename,
+            # other models get their own suffixed files
+            if self.files:
+                stem, extension = os.path.splitext(self.filename)
+                file = ShardedFileWriter(
+                    f"{stem}-{model.__name__}{extension}", **self.writer_options
+                )
+                await file.open()
+            else:
+                file = self.file
+            # Every shard starts with the header
+            (header,) = csv_rows([self.columns(model)])
+            await file.set_header(header)
+            model_file = CSVModelFile(file=file, row=self.row_getter(model))
+            self.files[model] = model_file
+        return model_file
 
     async def open(self) -> None:
-        self.file = open(self.filename, "w", encoding="utf-8")
+        await self.file.open()
 
     async def dump(self, item: "Item") -> None:
-        assert self.file
-        if self.first_item:
-            self.first_item = False
-            fieldnames = list(item.__class__.schema()["properties"].keys())
-            writer = csv.DictWriter(self.file, fieldnames=fieldnames)
-            self.writer = writer
-            writer.writeheader()
-        assert self.writer, "Trying to use csv.DictWriter which is None"
-        self.writer.writerow(item.dict())
+        await self.dump_many(items=[item])
+
+    async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+        models: typing.Dict[typing.Type[BaseModel], typing.List["Item"]] = defaultdict(
+            list
+        )
+        for item in items:
+            models[item.__class__].append(item)
+        for model, model_items in models.items():
+            model_file = await self._model_file(model)
+            rows = csv_rows(map(model_file.row, model_items))
+            await model_file.file.write_records(rows)
 
     async def close(self) -> None:
-        assert self.file
-        self.file.close()
+        await self.file.close()
+        for model_file in self.files.values():
+            if model_file.file is not self.file:
+                await model_file.file.close()
 
 
 if sqlalchemy:
 
+    def upsert_statement(
+        table: Table, key: typing.Sequence[str], dialect: str
+    ) -> Insert:
+        # Rows with the key of a stored row update it instead of being added
+        updated = [
+            column.name
+            for column in table.columns
+            if column.name not in key and not column.primary_key
+        ]
+        if dialect in ("sqlite", "postgresql"):
+            module = sqlite if dialect == "sqlite" else postgresql
+            statement = module.insert(table)
+            if not updated:
+                return statement.on_conflict_do_nothing(index_elements=key)
+            return statement.on_conflict_do_update(
+                index_elements=key,
+                set_={name: statement.excluded[name] for name in updated},
+            )
+        if dialect == "mysql":
+            mysql_statement = mysql.insert(table)  # type: ignore[no-untyped-call]
+            # MySQL needs at least one column to update, the key is kept as is
+            return mysql_statement.on_duplicate_key_update(
+                {name: mysql_statement.inserted[name] for name in updated or key}
+            )
+        raise NotImplementedError(
+            f"Upserts are not supported for the `{dialect}` dialect, "
+            "remove `__key__` from the item to insert its rows"
+        )
+
     class SQLAlchemyLoader(BaseLoader):
         mapped_fields = {int: Integer, str: String, float: Float, datetime: DateTime}
 
-        def __init__(self, url: typing.Union[URL, str]):
+        def __init__(
+            self,
+            url: typing.Union[URL, str],
+            commit_every: typing.Optional[int] = None,
+            commit_interval: typing.Optional[float] = None,
+            batch_size: typing.Optional[int] = None,
+            connection_per_table: bool = False,
+            sqlite_pragmas: typing.Optional[typing.Dict[str, str]] = None,
+        ):
             super().__init__()
             self.url = url
             self.engine: typing.Optional[AsyncEngine] = None
             self.lock = Lock()
             self.meta = MetaData()
             self.existing_tables: typing.Dict[str, Table] = {}
+            self.insert_statements: typing.Dict[str, Insert] = {}
             self.conn: typing.Optional[AsyncConnection] = None
+            self.commit_every: typing.Optional[int] = first_not_none(
+                commit_every, CONFIGS.SQL_LOADER_COMMIT_EVERY
+            )
+            self.commit_interval: typing.Optional[float] = first_not_none(
+                commit_interval, CONFIGS.SQL_LOADER_COMMIT_INTERVAL
+            )
+            self.batch_size: int = first_not_none(
+                batch_size, CONFIGS.SQL_LOADER_BATCH_SIZE
+            )
+            if connection_per_table and make_url(url).get_backend_name() == "sqlite":
+                # SQLite allows a single writer, a second writer connection
+                # waits for the uncommitted transaction of the first one
+                msg = "`connection_per_table` is ignored for SQLite databases"
+                log.warning(msg)
+                warnings.warn(category=RuntimeWarning, message=msg)
+                connection_per_table = False
+            self.connection_per_table = connection_per_table
+            self.sqlite_pragmas: typing.Dict[str, str] = first_not_none(
+                sqlite_pragmas, CONFIGS.SQL_LOADER_SQLITE_PRAGMAS
+            )
+            self.table_connections: typing.Dict[str, AsyncConnection] = {}
+            self.uncommitted_rows: typing.Dict[AsyncConnection, int] = {}
+            self.last_commits: typing.Dict[AsyncConnection, float] = {}
             log.debug(f"`{self.__class__.__name__}` instance was created")
 
         async def _create_table_from_item(self, item: "Item") -> None:
@@ -191,13 +687,26 @@ if sqlalchemy:
             else:
                 tablename = item.__class__.__name__
             log.info(f"Creating the Table `{tablename}`")
+            key = self._get_key(item)
+            indexes = []
+            if key:
+                indexes.append(Index(f"ix_{tablename}_key", *key, unique=True))
             table = Table(
                 tablename,
                 self.meta,
                 Column("id", Integer, primary_key=True),
                 *(await self._get_mapped_fields(item=item)),
+                *indexes,
             )
             log.info("Table object was created")
+            if self.conn is not None:
+                # A second connection would wait for the open write
+                # transaction of `self.conn` on databases like SQLite
+                log.info("Creating the table with the loader connection")
+                await self.conn.run_sync(self.meta.create_all)
+                await self._commit(self.conn)
+                self.existing_tables[item.__class__.__name__] = table
+                return
             assert self.engine
             log.info("Creating new connection for table")
             async with self.engine.connect() as conn:
@@ -221,25 +730,126 @@ if sqlalchemy:
 
             return columns
 
+        @staticmethod
+        def _get_key(item: "Item") -> typing.Tuple[str, ...]:
+            key: typing.Tuple[str, ...] = tuple(getattr(item, "__key__", ()))
+            unknown_fields = set(key) - item.__class__.__fields__.keys()
+            if unknown_fields:
+                raise ValueError(
+                    f"The `{item.__class__.__name__}` key has unknown "
+                    f"fields: {sorted(unknown_fields)}"
+                )
+            return key
+
+        def _insert_statement(self, item: "Item", table: Table) -> Insert:
+            statement = self.insert_statements.get(table.name)
+            if statement is None:
+                key = self._get_key(item)
+                if key:
+                    assert self.engine
+                    dialect = self.engine.dialect.name
+                    statement = upsert_statement(table, key=key, dialect=dialect)
+                else:
+                    statement = insert(table=table)
+                self.insert_statements[table.name] = statement
+            return statement
+
+        def _set_sqlite_pragmas(
+            self, dbapi_connection: typing.Any, _: typing.Any
+        ) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in self.sqlite_pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
         async def open(self) -> None:
             log.debug("Creating sqlalchemy async engine")
             self.engine = create_async_engine(url=self.url)
+            if (
+                make_url(self.url).get_backend_name() == "sqlite"
+                and self.sqlite_pragmas
+            ):
+                log.debug(f"Setting the SQLite pragmas: {self.sqlite_pragmas}")
+                event.listen(
+                    self.engine.sync_engine, "connect", self._set_sqlite_pragmas
+                )
             self.conn = await self.engine.connect()
 
-        async def dump(self, item: "Item") -> None:
+        async def _commit(self, conn: AsyncConnection) -> None:
+            await conn.commit()
+            self.uncommitted_rows[conn] = 0
+            self.last_commits[conn] = time.monotonic()
+
+        async def _commit_if_needed(self, conn: AsyncConnection, rows: int) -> None:
+            self.uncommitted_rows[conn] = self.uncommitted_rows.get(conn, 0) + rows
+            last_commit = self.last_commits.setdefault(conn, time.monotonic())
+            if (
+                self.commit_every is not None
+                and self.uncommitted_rows[conn] >= self.commit_every
+            ) or (
+                self.commit_interval is not None
+                and time.monotonic() - last_commit >= self.commit_interval
+            ):
+                log.debug(f"Committing {self.uncommitted_rows[conn]} rows")
+                await self._commit(conn)
+
+        async def _get_connection(self, table: Table) -> AsyncConnection:
+            assert self.conn
+            if not self.connection_per_table:
+                return self.conn
+            conn = self.table_connections.get(table.name)
+            if conn is None:
+                assert self.engine
+                log.debug(f"Creating the writer connection for `{table.name}`")
+                conn = self.table_connections[table.name] = await self.engine.connect()
+            return conn
+
+        async def _get_table(self, item: "Item") -> Table:
             pydantic_model_name = item.__class__.__name__
             async with self.lock:
                 if pydantic_model_name not in self.existing_tables:
                     log.debug(f"`Creating the {pydantic_model_name} Table`")
                     await self._create_table_from_item(item=item)
                     log.debug(f"`{pydantic_model_name} Table was created`")
-            table = self.existing_tables[pydantic_model_name]
-            stmt = insert(table=table).values(item.dict())
-            assert self.conn
-            await self.conn.execute(stmt)
+            return self.existing_tables[pydantic_model_name]
+
+        async def dump(self, item: "Item") -> None:
+            await self.dump_many(items=[item])
+
+        async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+            grouped_items: typing.Dict[
+                typing.Type["Item"], typing.List["Item"]
+            ] = defaultdict(list)
+            for item in items:
+                grouped_items[item.__class__].append(item)
+            for model_items in grouped_items.values():
+                table = await self._get_table(item=model_items[0])
+                conn = await self._get_connection(table=table)
+                statement = self._insert_statement(model_items[0], table=table)
+                key = self._get_key(model_items[0])
+                for start in range(0, len(model_items), self.batch_size):
+                    rows = [
+                        item_dict(item)
+                        for item in model_items[start : start + self.batch_size]
+                    ]
+                    if key:
+                        # An upsert cannot touch the same row twice,
+                        # the last item with a key wins
+                        rows = list(
+                            {
+                                tuple(row[name] for name in key): row for row in rows
+                            }.values()
+                        )
+                    log.debug(f"Inserting {len(rows)} rows into `{table.name}`")
+                    # A list of parameters makes SQLAlchemy use `executemany`
+                    await conn.execute(statement, rows)
+                    await self._commit_if_needed(conn, rows=len(rows))
 
         async def close(self) -> None:
             assert self.conn
+            for conn in self.table_connections.values():
+                await conn.commit()
+                await conn.close()
             await self.conn.commit()
             log.debug("Closing the database connection")
             await self.conn.close()
@@ -248,4 +858,182 @@ if sqlalchemy:
             await self.engine.dispose()
 
 
+if pyarrow:
+    _ARROW_SCALARS = (bool, int, float, str, bytes, type(None), datetime, date)
+
+    def _arrow_type(annotation: typing.Any) -> "pa.DataType":
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin is typing.Union:
+            not_none_args = [arg for arg in args if arg is not type(None)]
+            if len(not_none_args) == 1:
+                return _arrow_type(not_none_args[0])
+        elif origin in (list, tuple, set, frozenset) and args:
+            return pa.list_(_arrow_type(args[0]))
+        elif origin is dict and args:
+            return pa.map_(_arrow_type(args[0]), _arrow_type(args[1]))
+        elif isinstance(annotation, type):
+            if issubclass(annotation, BaseModel):
+                return pa.struct(
+                    [
+                        pa.field(name, _arrow_type(model_field.outer_type_))
+                        for name, model_field in annotation.__fields__.items()
+                    ]
+                )
+            if issubclass(annotation, Enum):
+                return _arrow_type(type(next(iter(annotation)).value))
+            # `bool` and `datetime` go first, they subclass `int` and `date`
+            for python_type, arrow_type in (
+                (bool, pa.bool_()),
+                (int, pa.int64()),
+                (float, pa.float64()),
+                (str, pa.string()),
+                (bytes, pa.binary()),
+                (datetime, pa.timestamp("us")),
+                (date, pa.date32()),
+            ):
+                if issubclass(annotation, python_type):
+                    return arrow_type
+        raise TypeError(f"Cannot map `{annotation}` to an Arrow type")
+
+    def _arrow_value(value: typing.Any) -> typing.Any:
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, _ARROW_SCALARS):
+            return value
+        if isinstance(value, BaseModel):
+            return {name: _arrow_value(val) for name, val in value.__dict__.items()}
+        if isinstance(value, dict):
+            return {key: _arrow_value(val) for key, val in value.items()}
+        return [_arrow_value(val) for val in value]
+
+    @dataclass
+    class ParquetModelFile:
+        stem: str
+        extension: str
+        schema: "pa.Schema"
+        columns: typing.Dict[str, typing.List[typing.Any]]
+        rows: int = 0
+        writer: typing.Optional["parquet.ParquetWriter"] = None
+        paths: typing.List[str] = field(default_factory=list)
+
+        def next_path(self) -> str:
+            part = len(self.paths)
+            suffix = f"-{part}" if part else ""
+            return f"{self.stem}{suffix}{self.extension}"
+
+    class ParquetLoader(BaseLoader):
+        def __init__(
+            self,
+            filename: typing.Optional[str] = None,
+            row_group_size: typing.Optional[int] = None,
+            max_file_size: typing.Optional[int] = None,
+            compression: typing.Optional[str] = None,
+        ):
+            super().__init__()
+            self.filename = filename or random_filename() + ".parquet"
+            self.row_group_size: int = first_not_none(
+                row_group_size, CONFIGS.PARQUET_ROW_GROUP_SIZE
+            )
+            self.max_file_size: typing.Optional[int] = first_not_none(
+                max_file_size, CONFIGS.PARQUET_MAX_FILE_SIZE
+            )
+            self.compression: str = first_not_none(
+                compression, CONFIGS.PARQUET_COMPRESSION
+            )
+            self.files: typing.Dict[typing.Type["Item"], ParquetModelFile] = {}
+            self.executor: typing.Optional[ThreadPoolExecutor] = None
+
+        @staticmethod
+        def schema_for(model: typing.Type["Item"]) -> "pa.Schema":
+            return pa.schema(
+                [
+                    pa.field(
+                        name,
+                        _arrow_type(model_field.outer_type_),
+                        nullable=model_field.allow_none,
+                    )
+                    for name, model_field in model.__fields__.items()
+                ]
+            )
+
+        def _model_file(self, model: typing.Type["Item"]) -> ParquetModelFile:
+            model_file = self.files.get(model)
+            if model_file is None:
+                log.debug(f"Building the Arrow schema for `{model.__name__}`")
+                # The first model uses the given filename,
+                # other models get their own suffixed files
+                stem, extension = os.path.splitext(self.filename)
+                if self.files:
+                    stem += f"-{model.__name__}"
+                model_file = ParquetModelFile(
+                    stem=stem,
+                    extension=extension,
+                    schema=self.schema_for(model),
+                    columns={name: [] for name in model.__fields__},
+                )
+                self.files[model] = model_file
+            return model_file
+
+        def _write_row_group(
+            self,
+            model_file: ParquetModelFile,
+            columns: typing.Dict[str, typing.List[typing.Any]],
+        ) -> None:
+            table = pa.Table.from_pydict(columns, schema=model_file.schema)
+            if model_file.writer is None:
+                path = model_file.next_path()
+                log.debug(f"Opening the `{path}` parquet file")
+                model_file.writer = parquet.ParquetWriter(
+                    path, model_file.schema, compression=self.compression
+                )
+                model_file.paths.append(path)
+            model_file.writer.write_table(table, row_group_size=self.row_group_size)
+            if (
+                self.max_file_size is not None
+                and os.path.getsize(model_file.paths[-1]) >= self.max_file_size
+            ):
+                log.debug(f"Rolling over the `{model_file.paths[-1]}` parquet file")
+                model_file.writer.close()
+                model_file.writer = None
+
+        async def _flush(self, model: typing.Type["Item"]) -> None:
+            model_file = self.files[model]
+            columns = model_file.columns
+            model_file.columns = {name: [] for name in columns}
+            model_file.rows = 0
+            assert self.executor
+            await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._write_row_group, model_file, columns
+            )
+
+        async def open(self) -> None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scrapyio-parquet"
+            )
+
+        async def dump(self, item: "Item") -> None:
+            await self.dump_many(items=[item])
+
+        async def dump_many(self, items: typing.Sequence["Item"]) -> None:
+            for item in items:
+                model = item.__class__
+                model_file = self._model_file(model)
+                values = item.__dict__
+                for name, column in model_file.columns.items():
+                    column.append(_arrow_value(values[name]))
+                model_file.rows += 1
+                if model_file.rows >= self.row_group_size:
+                    await self._flush(model)
+
+        async def close(self) -> None:
+            for model, model_file in self.files.items():
+                if model_file.rows:
+                    await self._flush(model)
+                if model_file.writer is not None:
+                    model_file.writer.close()
+            assert self.executor
+            self.executor.shutdown(wait=True)
+
+
 # TODO: Implement MONGOLoader
@@ -1,9 +1,401 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+import typing
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
 
+from pydantic.json import pydantic_encoder
+
+from scrapyio.exceptions import IgnoreItemException
 from scrapyio.items import Item
+from scrapyio.settings import CONFIGS
+from scrapyio.utils import first_not_none
+
+orjson: typing.Optional[ModuleType]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # pragma: no cover
+
+log = logging.getLogger("scrapyio")
+
+DEDUPLICATION_MODES = ("exact", "bloom", "disk")
+
+M = typing.TypeVar("M", bound=typing.Type["BaseItemMiddleWare"])
+# Whether the item is kept and when the result expires
+MEMOIZED_CHECK = typing.Tuple[bool, typing.Optional[float]]
 
 
 class BaseItemMiddleWare(ABC):
+    # How many `process_item` calls of the middleware can run
+    # at once, `None` falls back to ITEM_MIDDLEWARES_CONCURRENCY
+    concurrency: typing.ClassVar[typing.Optional[int]] = None
+    resources: typing.Dict[str, typing.Any] = {}
+    _semaphore: typing.Optional[asyncio.Semaphore] = None
+
+    async def open(self, resources: typing.Dict[str, typing.Any]) -> None:
+        # Called once before the first item with the resources
+        # shared by all the middlewares (HTTP clients, DB pools, ...)
+        self.resources = resources
+
+    async def close(self) -> None:
+        ...
+
     @abstractmethod
     async def process_item(self, item: Item) -> None:
         ...
+
+    async def _keep_item(self, item: Item) -> bool:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(
+                first_not_none(self.concurrency, CONFIGS.ITEM_MIDDLEWARES_CONCURRENCY)
+            )
+        async with self._semaphore:
+            try:
+                await self.process_item(item=item)
+            except IgnoreItemException:
+                return False
+        return True
+
+    async def process_items(self, items: typing.List[Item]) -> typing.List[Item]:
+        # Called with a batch of items, returns the ones that should be kept.
+        # Overriding it allows checking the whole batch at once.
+        kept = await asyncio.gather(*(self._keep_item(item) for item in items))
+        return [item for item, keep in zip(items, kept) if keep]
+
+
+class MemoizedChecks:
+    def __init__(
+        self,
+        ttl: typing.Optional[float] = None,
+        max_size: typing.Optional[int] = None,
+        path: typing.Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.path = path
+        self.results: "OrderedDict[typing.Hashable, MEMOIZED_CHECK]" = OrderedDict()
+        self.pending: typing.Dict[typing.Hashable, "asyncio.Future[bool]"] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: typing.Hashable) -> typing.Optional[bool]:
+        result = self.results.get(key)
+        if result is None:
+            return None
+        kept, expires = result
+        if expires is not None and expires <= time.time():
+            del self.results[key]
+            return None
+        self.results.move_to_end(key)
+        return kept
+
+    def set(self, key: typing.Hashable, kept: bool) -> None:
+        expires = None if self.ttl is None else time.time() + self.ttl
+        self.results[key] = (kept, expires)
+        self.results.move_to_end(key)
+        if self.max_size is not None:
+            while len(self.results) > self.max_size:
+                self.results.popitem(last=False)
+
+    def load(self) -> None:
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            results = pickle.load(file)
+        now = time.time()
+        for key, (kept, expires) in results:
+            if expires is None or expires > now:
+                self.results[key] = (kept, expires)
+        log.debug(f"Loaded {len(self.results)} memoized checks from `{self.path}`")
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        # Written next to the target first, so a crash keeps the old file
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(list(self.results.items()), file)
+        os.replace(temporary_path, self.path)
+        log.debug(f"Saved {len(self.results)} memoized checks to `{self.path}`")
+
+
+class MemoizedMiddleWareMixin:
+    ...
+
+
+def memoize(
+    key: typing.Callable[[typing.Any], typing.Hashable],
+    ttl: typing.Optional[float] = None,
+    max_size: typing.Optional[int] = None,
+    path: typing.Optional[str] = None,
+) -> typing.Callable[[M], M]:
+    # Memoizes whether `process_item` keeps or ignores the items with the
+    # same key, changes it makes to the items are not replayed on cache hits
+    def decorator(middleware: M) -> M:
+        if issubclass(middleware, MemoizedMiddleWareMixin):
+            raise TypeError(f"`{middleware.__name__}` is already memoized")
+
+        class MemoizedMiddleWare(
+            middleware, MemoizedMiddleWareMixin  # type: ignore[valid-type, misc]
+        ):
+            checks: typing.Optional[MemoizedChecks] = None
+
+            def _checks(self) -> MemoizedChecks:
+                if self.checks is None:
+                    self.checks = MemoizedChecks(ttl=ttl, max_size=max_size, path=path)
+                    self.checks.load()
+                return self.checks
+
+            async def open(self, resources: typing.Dict[str, typing.Any]) -> None:
+                self._checks()
+                await super().open(resources=resources)
+
+            async def close(self) -> None:
+                try:
+                    await super().close()
+                finally:
+                    self._checks().save()
+
+            async def _check(self, item: Item) -> bool:
+                try:
+                    await super().process_item(item=item)
+                except IgnoreItemException:
+                    return False
+                return True
+
+            async def process_item(self, item: Item) -> None:
+                checks = self._checks()
+                item_key = key(item)
+                kept = checks.get(item_key)
+                if kept is not None:
+                    checks.hits += 1
+                elif item_key in checks.pending:
+                    # The same key is already being checked, wait for its result
+                    checks.hits += 1
+                    kept = await asyncio.shield(checks.pending[item_key])
+                else:
+                    checks.misses += 1
+                    future = asyncio.get_running_loop().create_future()
+                    checks.pending[item_key] = future
+                    try:
+                        kept = await self._check(item)
+                    except Exception as e:
+                        future.set_exception(e)
+                        # Nobody may be waiting for the failed check
+                        future.exception()
+                        raise
+                    except BaseException:
+                        future.cancel()
+                        raise
+                    else:
+                        checks.set(item_key, kept)
+                        future.set_result(kept)
+                    finally:
+                        del checks.pending[item_key]
+                if not kept:
+                    raise IgnoreItemException()
+
+        MemoizedMiddleWare.__name__ = middleware.__name__
+        MemoizedMiddleWare.__qualname__ = middleware.__qualname__
+        MemoizedMiddleWare.__module__ = middleware.__module__
+        MemoizedMiddleWare.__doc__ = middleware.__doc__
+        return typing.cast(M, MemoizedMiddleWare)
+
+    return decorator
+
+
+def item_fingerprint(
+    item: Item, fields: typing.Optional[typing.Sequence[str]] = None
+) -> bytes:
+    # Items of different models are never duplicates of each other
+    model = item.__class__
+    values = [getattr(item, name) for name in fields or model.__fields__]
+    if orjson is not None:
+        payload = orjson.dumps(values, default=pydantic_encoder)
+    else:  # pragma: no cover
+        payload = json.dumps(values, default=pydantic_encoder).encode()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{model.__module__}.{model.__qualname__}".encode())
+    digest.update(payload)
+    return digest.digest()
+
+
+class ExactFingerprints:
+    def __init__(self) -> None:
+        self.fingerprints: typing.Set[bytes] = set()
+
+    def add_many(self, fingerprints: typing.Sequence[bytes]) -> typing.List[bool]:
+        added = []
+        for fingerprint in fingerprints:
+            added.append(fingerprint not in self.fingerprints)
+            self.fingerprints.add(fingerprint)
+        return added
+
+    def close(self) -> None:
+        self.fingerprints.clear()
+
+
+class BloomFingerprints:
+    def __init__(self, capacity: int, error_rate: float):
+        # Never reports a new item as a duplicate, but reports about
+        # `error_rate` of the new items as duplicates once `capacity` is reached
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.size / 8))
+
+    def add(self, fingerprint: bytes) -> bool:
+        # Double hashing derives all the bit positions from the fingerprint
+        first = int.from_bytes(fingerprint[:8], "little")
+        second = int.from_bytes(fingerprint[8:], "little") | 1
+        added = False
+        for index in range(self.hashes):
+            position = (first + index * second) % self.size
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def add_many(self, fingerprints: typing.Sequence[bytes]) -> typing.List[bool]:
+        return [self.add(fingerprint) for fingerprint in fingerprints]
+
+    def close(self) -> None:
+        self.bits = bytearray()
+
+
+class DiskFingerprints:
+    def __init__(self, path: typing.Optional[str] = None):
+        self.temporary = path is None
+        if path is None:
+            file_descriptor, path = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(file_descriptor)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints "
+            "(fingerprint BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+
+    def add_many(self, fingerprints: typing.Sequence[bytes]) -> typing.List[bool]:
+        added = []
+        with self.connection:
+            for fingerprint in fingerprints:
+                cursor = self.connection.execute(
+                    "INSERT OR IGNORE INTO fingerprints VALUES (?)", (fingerprint,)
+                )
+                added.append(cursor.rowcount == 1)
+        return added
+
+    def close(self) -> None:
+        self.connection.close()
+        if self.temporary:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+
+
+FINGERPRINTS = typing.Union[ExactFingerprints, BloomFingerprints, DiskFingerprints]
+
+
+class DeduplicationMiddleWare(BaseItemMiddleWare):
+    def __init__(
+        self,
+        mode: typing.Optional[str] = None,
+        fields: typing.Optional[typing.Dict[str, typing.List[str]]] = None,
+        capacity: typing.Optional[int] = None,
+        error_rate: typing.Optional[float] = None,
+        path: typing.Optional[str] = None,
+    ):
+        self.mode: str = first_not_none(mode, CONFIGS.ITEM_DEDUPLICATION_MODE)
+        if self.mode not in DEDUPLICATION_MODES:
+            raise ValueError(
+                f"Unknown deduplication mode `{self.mode}`, "
+                f"expected one of {DEDUPLICATION_MODES}"
+            )
+        self.fields: typing.Dict[str, typing.List[str]] = first_not_none(
+            fields, CONFIGS.ITEM_DEDUPLICATION_FIELDS
+        )
+        self.capacity: int = first_not_none(
+            capacity, CONFIGS.ITEM_DEDUPLICATION_CAPACITY
+        )
+        self.error_rate: float = first_not_none(
+            error_rate, CONFIGS.ITEM_DEDUPLICATION_ERROR_RATE
+        )
+        self.path: typing.Optional[str] = first_not_none(
+            path, CONFIGS.ITEM_DEDUPLICATION_PATH
+        )
+        self.fingerprints: typing.Optional[FINGERPRINTS] = None
+        self.executor: typing.Optional[ThreadPoolExecutor] = None
+        self.duplicates: int = 0
+
+    async def open(self, resources: typing.Dict[str, typing.Any]) -> None:
+        await super().open(resources=resources)
+        self._fingerprints()
+
+    def _fingerprints(self) -> FINGERPRINTS:
+        if self.fingerprints is not None:
+            return self.fingerprints
+        log.debug(f"Deduplicating items in the `{self.mode}` mode")
+        fingerprints: FINGERPRINTS
+        if self.mode == "exact":
+            fingerprints = ExactFingerprints()
+        elif self.mode == "bloom":
+            fingerprints = BloomFingerprints(
+                capacity=self.capacity, error_rate=self.error_rate
+            )
+        else:
+            # SQLite runs in its own thread to keep the event loop free
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scrapyio-dedup"
+            )
+            fingerprints = DiskFingerprints(path=self.path)
+        self.fingerprints = fingerprints
+        return fingerprints
+
+    async def process_item(self, item: Item) -> None:
+        if not await self.process_items([item]):
+            raise IgnoreItemException()
+
+    async def process_items(self, items: typing.List[Item]) -> typing.List[Item]:
+        fingerprints = self._fingerprints()
+        keys = [
+            item_fingerprint(item, self.fields.get(item.__class__.__name__))
+            for item in items
+        ]
+        if self.executor is not None:
+            loop = asyncio.get_running_loop()
+            added = await loop.run_in_executor(
+                self.executor, fingerprints.add_many, keys
+            )
+        else:
+            added = fingerprints.add_many(keys)
+        self.duplicates += added.count(False)
+        return [item for item, is_new in zip(items, added) if is_new]
+
+    async def close(self) -> None:
+        log.debug(f"Dropped {self.duplicates} duplicated items")
+        if self.fingerprints is not None:
+            if self.executor is not None:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.executor, self.fingerprints.close)
+                self.executor.shutdown(wait=False)
+                self.executor = None
+            else:
+                self.fingerprints.close()
+            self.fingerprints = None
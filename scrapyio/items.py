@@ -7,15 +7,20 @@ from asyncio import Task
 from functools import partial
 from warnings import warn
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from scrapyio.item_loaders import ProxyLoader
 
-from .exceptions import IgnoreItemException
-from .item_loaders import BaseLoader
+from .item_loaders import (
+    BaseLoader,
+    LoaderState,
+    LoaderStats,
+    LoaderWriter,
+    model_json,
+)
 from .settings import CONFIGS
 from .types import ITEM_ADDED_CALLBACK_TYPE, ITEM_IGNORING_CALLBACK_TYPE
-from .utils import load_module
+from .utils import first_not_none, load_module
 
 if typing.TYPE_CHECKING:
     from .item_middlewares import BaseItemMiddleWare
@@ -43,6 +48,9 @@ def orjson_dumps_wrapper(*args, **kwargs) -> str:
 
 class BaseItem(BaseModel):
     tablename: typing.ClassVar[typing.Optional[str]] = None
+    # Fields identifying the item, SQLAlchemyLoader makes them a unique
+    # index and updates the stored row when the same item is loaded again
+    __key__: typing.ClassVar[typing.Tuple[str, ...]] = ()
 
     class Config:
         try:
@@ -56,7 +64,63 @@ class BaseItem(BaseModel):
 
 
 class Item(BaseItem):
-    ...
+    # Serialized values shared by all the loaders,
+    # they are reset once a field is assigned
+    _json: typing.Optional[bytes] = PrivateAttr(None)
+    _dict: typing.Optional[typing.Dict[str, typing.Any]] = PrivateAttr(None)
+
+    def __init__(__pydantic_self__, **data: typing.Any) -> None:
+        # Items of models with the `trusted` config option are built like
+        # `construct()` does, the values are stored without being validated
+        if not getattr(__pydantic_self__.__config__, "trusted", False):
+            super().__init__(**data)
+            return
+        values = {}
+        for name, field in __pydantic_self__.__fields__.items():
+            if name in data:
+                values[name] = data[name]
+            elif not field.required:
+                values[name] = field.get_default()
+        object.__setattr__(__pydantic_self__, "__dict__", values)
+        object.__setattr__(__pydantic_self__, "__fields_set__", values.keys() & data)
+        __pydantic_self__._init_private_attributes()
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        super().__setattr__(name, value)
+        if name in self.__fields__:
+            self._reset_serialized()
+
+    def _reset_serialized(self) -> None:
+        object.__setattr__(self, "_json", None)
+        object.__setattr__(self, "_dict", None)
+
+    def copy(self, *args: typing.Any, **kwargs: typing.Any) -> "Item":
+        item = super().copy(*args, **kwargs)
+        item._reset_serialized()
+        return item
+
+    def json_bytes(self) -> bytes:
+        if self._json is None:
+            object.__setattr__(self, "_json", model_json(self))
+        assert self._json is not None
+        return self._json
+
+    def cached_dict(self) -> typing.Dict[str, typing.Any]:
+        # Shared between the loaders, so it must not be modified
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self.dict())
+        assert self._dict is not None
+        return self._dict
+
+
+def build_items_middlewares_resources(
+    exclude: typing.Container[str] = (),
+) -> typing.Dict[str, typing.Any]:
+    return {
+        name: load_module(factory)()
+        for name, factory in CONFIGS.ITEM_MIDDLEWARE_RESOURCES.items()
+        if name not in exclude
+    }
 
 
 class BaseItemsManager(ABC):
@@ -65,10 +129,32 @@ class BaseItemsManager(ABC):
         ignoring_callback: typing.Optional[ITEM_IGNORING_CALLBACK_TYPE] = None,
         success_callback: typing.Optional[ITEM_ADDED_CALLBACK_TYPE] = None,
         loaders: typing.Optional[typing.List[BaseLoader]] = None,
+        queue_size: typing.Optional[int] = None,
+        workers: typing.Optional[int] = None,
+        loader_queue_size: typing.Optional[int] = None,
+        loader_overflow_policy: typing.Optional[str] = None,
+        resources: typing.Optional[typing.Dict[str, typing.Any]] = None,
     ):
         self.middlewares = build_items_middlewares_chain()
+        self.middlewares_opened = False
+        self.resources: typing.Dict[str, typing.Any] = dict(resources or {})
+        self.owned_resources: typing.List[typing.Any] = []
         self.ignoring_callback = ignoring_callback
         self.success_callback = success_callback
+        self.queue_size: int = first_not_none(queue_size, CONFIGS.ITEMS_QUEUE_SIZE)
+        self.workers: int = first_not_none(workers, CONFIGS.ITEM_WORKERS)
+        self.processing_batch_size: int = CONFIGS.ITEMS_PROCESSING_BATCH_SIZE
+        self.loading_batch_size: int = CONFIGS.ITEMS_LOADING_BATCH_SIZE
+        self.items_queue: typing.Optional["asyncio.Queue[Item]"] = None
+        self.loader_queue_size: int = first_not_none(
+            loader_queue_size, CONFIGS.LOADER_QUEUE_SIZE
+        )
+        self.loader_overflow_policy: str = first_not_none(
+            loader_overflow_policy, CONFIGS.LOADER_OVERFLOW_POLICY
+        )
+        self.writers: typing.List[LoaderWriter] = []
+        self.worker_tasks: typing.List[Task] = []
+        self.failure: typing.Optional[BaseException] = None
 
         if loaders:
             self.loaders = [ProxyLoader(loader=loader) for loader in loaders]
@@ -80,51 +166,169 @@ class BaseItemsManager(ABC):
                 "loaders were specified for the item manager."
             )
 
+    async def set_up_middlewares(self) -> None:
+        if self.middlewares_opened:
+            return
+        self.middlewares_opened = True
+        # Resources passed to the manager take precedence over the configured ones
+        created = build_items_middlewares_resources(exclude=self.resources)
+        self.owned_resources = list(created.values())
+        self.resources.update(created)
+        for middleware in self.middlewares:
+            await middleware.open(resources=self.resources)
+
+    async def tear_down_middlewares(self) -> None:
+        if not self.middlewares_opened:
+            return
+        self.middlewares_opened = False
+        try:
+            for middleware in self.middlewares:
+                await middleware.close()
+        finally:
+            # Only the resources created by the manager are closed here
+            for resource in self.owned_resources:
+                aclose = getattr(resource, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            self.owned_resources = []
+
+    async def set_up_loaders(self) -> None:
+        loaders = [
+            loader for loader in self.loaders if loader.state == LoaderState.CREATED
+        ]
+        await asyncio.gather(*(loader.open() for loader in loaders))
+
     async def tear_down_loaders(self) -> None:
-        for loader in self.loaders:
-            await loader.close()
+        try:
+            await self.stop()
+        finally:
+            for loader in self.loaders:
+                await loader.close()
 
-    async def _send_single_item_via_middlewares(
-        self, item: Item
-    ) -> typing.Optional[Item]:
-        for middleware in self.middlewares:
+    def _start(self) -> None:
+        log.debug(f"Starting {self.workers} item workers and the loader writers")
+        self.items_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._start_writers()
+        self.worker_tasks = [
+            asyncio.create_task(self._item_worker(self.items_queue))
+            for _ in range(self.workers)
+        ]
+
+    def _start_writers(self) -> None:
+        # Every loader gets its own queue and writer task,
+        # so a slow loader does not hold up the others
+        if self.writers:
+            return
+        self.writers = [
+            LoaderWriter(
+                loader=loader,
+                queue_size=self.loader_queue_size,
+                overflow_policy=self.loader_overflow_policy,
+                batch_size=self.loading_batch_size,
+            )
+            for loader in self.loaders
+        ]
+        for writer in self.writers:
+            writer.start()
+
+    def loaders_stats(self) -> typing.Dict[str, LoaderStats]:
+        return {
+            f"{index}:{writer.name}": writer.stats
+            for index, writer in enumerate(self.writers)
+        }
+
+    def _raise_failure(self) -> None:
+        for writer in self.writers:
+            if writer.failure is not None:
+                self.failure = self.failure or writer.failure
+                writer.failure = None
+        if self.failure is not None:
+            failure, self.failure = self.failure, None
+            raise failure
+
+    async def put(self, item: Item) -> None:
+        # Waits while the queue is full, so a slow
+        # pipeline slows down the spider's `parse` too
+        self._raise_failure()
+        if self.items_queue is None:
+            self._start()
+        assert self.items_queue
+        await self.items_queue.put(item)
+
+    async def join(self) -> None:
+        if self.items_queue is not None:
+            await self.items_queue.join()
+        for writer in self.writers:
+            await writer.join()
+        self._raise_failure()
+
+    async def stop(self) -> None:
+        try:
+            await self.join()
+        finally:
+            for task in self.worker_tasks:
+                task.cancel()
+            await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+            self.worker_tasks.clear()
+            for writer in self.writers:
+                await writer.stop()
+            self.writers = []
+            self.items_queue = None
+
+    async def _item_worker(self, items_queue: "asyncio.Queue[Item]") -> None:
+        while True:
+            items = [await items_queue.get()]
+            while len(items) < self.processing_batch_size and not items_queue.empty():
+                items.append(items_queue.get_nowait())
             try:
-                await middleware.process_item(item=item)
-            except IgnoreItemException:
-                if self.ignoring_callback:
-                    await self.ignoring_callback(item, middleware)
-                return None
+                await self._load_items(await self._filter_items(items))
+            except Exception as e:
+                log.error(f"Item processing failed: {e!r}")
+                self.failure = self.failure or e
+            finally:
+                for _ in items:
+                    items_queue.task_done()
+
+    async def _load_items(self, items: typing.Sequence[Item]) -> None:
+        # Hands the items over to the loader writers, `join`
+        # waits until all of them are actually loaded
+        self._start_writers()
+        for item in items:
+            for writer in self.writers:
+                await writer.put(item)
+
+    async def _filter_items(self, items: typing.List[Item]) -> typing.List[Item]:
+        # Middlewares are set up when the engine starts,
+        # managers used without an engine open them here
+        await self.set_up_middlewares()
+        for middleware in self.middlewares:
+            if not items:
+                break
+            kept = await middleware.process_items(items)
+            if self.ignoring_callback and len(kept) != len(items):
+                kept_ids = {id(item) for item in kept}
+                for item in items:
+                    if id(item) not in kept_ids:
+                        await self.ignoring_callback(item, middleware)
+            items = kept
         if self.success_callback:
-            await self.success_callback(item)
+            for item in items:
+                await self.success_callback(item)
+        return items
 
-        return item
+    async def _send_single_item_via_middlewares(
+        self, item: Item
+    ) -> typing.Optional[Item]:
+        items = await self._filter_items([item])
+        return items[0] if items else None
 
     async def _send_items_via_middlewares(
         self, items: typing.Sequence[Item]
     ) -> typing.Sequence[Item]:
-        tasks = [
-            asyncio.create_task(self._send_single_item_via_middlewares(item))
-            for item in items
-        ]
-
-        filtered_items = [
-            added_item for added_item in await asyncio.gather(*tasks) if added_item
-        ]
-        loading_tasks: typing.List[Task] = []
-        if self.loaders:
-            for loader in self.loaders:
-                await loader.open()
-                for item_to_load in filtered_items:
-                    loading_tasks.append(asyncio.create_task(loader.dump(item_to_load)))
-        future = asyncio.gather(*loading_tasks, return_exceptions=True)
-        results = await future
-
-        for result in results:
-            if isinstance(result, BaseException):
-                future.cancel()  # pragma: no cover
-                raise result from None  # pragma: no cover
-
-        return typing.cast(typing.List[Item], filtered_items)
+        self._raise_failure()
+        filtered_items = await self._filter_items(list(items))
+        await self._load_items(filtered_items)
+        return filtered_items
 
     @abstractmethod
     async def process_items(self, items: typing.Sequence[Item]) -> None:
@@ -27,6 +27,13 @@ class BaseMiddleWare(ABC):
     async def process_response(self, response: Response) -> typing.Union[None, Request]:
         ...
 
+    async def process_requests(
+        self, requests: typing.List[Request]
+    ) -> typing.List[typing.Optional[Request]]:
+        # Called once per dispatched batch before the per-request hooks,
+        # the returned list is aligned with `requests` and `None` drops one.
+        return list(requests)
+
 
 class ProxyMiddleWare(BaseMiddleWare):
     def __init__(self):
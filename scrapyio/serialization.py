@@ -0,0 +1,284 @@
+import struct
+import typing
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from types import ModuleType
+
+import httpx
+from httpx._config import Timeout
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+
+from .http import Request
+from .utils import load_module
+
+if typing.TYPE_CHECKING:
+    from .items import Item
+
+msgpack: typing.Optional[ModuleType]
+
+try:
+    import msgpack  # type: ignore[no-redef]
+except ImportError:  # pragma: no cover
+    msgpack = None  # pragma: no cover
+
+FORMAT_VERSION = 1
+
+# Every serialized object starts with the magic bytes,
+# the format version and the kind of the serialized object
+_MAGIC = b"SIO"
+_VERSION_OFFSET = len(_MAGIC)
+_KIND_OFFSET = _VERSION_OFFSET + 1
+_HEADER_SIZE = _KIND_OFFSET + 1
+_REQUEST_KIND = b"R"
+_ITEM_KIND = b"I"
+_RECORD_LENGTH = struct.Struct(">I")
+
+_EXT_TUPLE = 1
+_EXT_DATETIME = 2
+_EXT_DATE = 3
+_EXT_TIMEOUT = 4
+_EXT_HEADERS = 5
+_EXT_COOKIES = 6
+_EXT_QUERY_PARAMS = 7
+_EXT_URL = 8
+_EXT_SET = 9
+_EXT_FROZENSET = 10
+_EXT_DECIMAL = 11
+_EXT_UUID = 12
+
+_models_cache: typing.Dict[
+    str, typing.Tuple[typing.Type["Item"], typing.Tuple[ModelField, ...]]
+] = {}
+_request_fields_indexes = {
+    name: index for index, name in enumerate(Request.optional_fields)
+}
+
+
+def _msgpack() -> ModuleType:
+    if msgpack is None:  # pragma: no cover
+        raise ImportError(
+            "Binary serialization requires `msgpack`, "
+            "install it with `pip install scrapyio[msgpack]`"
+        )
+    return msgpack
+
+
+def _pack(value: typing.Any) -> bytes:
+    return _msgpack().packb(value, default=_encode_ext, strict_types=True)
+
+
+def _unpack(data: bytes) -> typing.Any:
+    return _msgpack().unpackb(data, ext_hook=_decode_ext, strict_map_key=False)
+
+
+def _encode_ext(value: typing.Any) -> typing.Any:
+    ext_type = _msgpack().ExtType
+    if isinstance(value, tuple):
+        return ext_type(_EXT_TUPLE, _pack(list(value)))
+    if isinstance(value, datetime):
+        return ext_type(_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return ext_type(_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Timeout):
+        timeouts = [value.connect, value.read, value.write, value.pool]
+        return ext_type(_EXT_TIMEOUT, _pack(timeouts))
+    if isinstance(value, httpx.Headers):
+        return ext_type(_EXT_HEADERS, _pack(value.raw))
+    if isinstance(value, httpx.Cookies):
+        cookies = [
+            [cookie.name, cookie.value, cookie.domain, cookie.path]
+            for cookie in value.jar
+        ]
+        return ext_type(_EXT_COOKIES, _pack(cookies))
+    if isinstance(value, httpx.QueryParams):
+        return ext_type(_EXT_QUERY_PARAMS, _pack(value.multi_items()))
+    if isinstance(value, httpx.URL):
+        return ext_type(_EXT_URL, str(value).encode())
+    if isinstance(value, frozenset):
+        return ext_type(_EXT_FROZENSET, _pack(list(value)))
+    if isinstance(value, set):
+        return ext_type(_EXT_SET, _pack(list(value)))
+    if isinstance(value, Decimal):
+        return ext_type(_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, uuid.UUID):
+        return ext_type(_EXT_UUID, value.bytes)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, Enum):
+        return value.value
+    # `strict_types` sends subclasses of the builtin types (enums etc.) here
+    for builtin_type in (bool, int, float, str, bytes, list, dict):
+        if isinstance(value, builtin_type):
+            return builtin_type(value)
+    raise TypeError(f"Cannot serialize `{value.__class__.__name__}` objects")
+
+
+def _decode_ext(code: int, data: bytes) -> typing.Any:
+    if code == _EXT_TUPLE:
+        return tuple(_unpack(data))
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_TIMEOUT:
+        connect, read, write, pool = _unpack(data)
+        return Timeout(connect=connect, read=read, write=write, pool=pool)
+    if code == _EXT_HEADERS:
+        return httpx.Headers(_unpack(data))
+    if code == _EXT_COOKIES:
+        cookies = httpx.Cookies()
+        for name, value, domain, path in _unpack(data):
+            cookies.set(name, value, domain=domain, path=path)
+        return cookies
+    if code == _EXT_QUERY_PARAMS:
+        return httpx.QueryParams(_unpack(data))
+    if code == _EXT_URL:
+        return httpx.URL(data.decode())
+    if code == _EXT_SET:
+        return set(_unpack(data))
+    if code == _EXT_FROZENSET:
+        return frozenset(_unpack(data))
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    raise ValueError(f"Unknown extension type `{code}`")
+
+
+def _header(kind: bytes) -> bytes:
+    return _MAGIC + bytes((FORMAT_VERSION,)) + kind
+
+
+def _read_header(data: bytes) -> bytes:
+    if len(data) < _HEADER_SIZE or not data.startswith(_MAGIC):
+        raise ValueError("The data was not serialized by scrapyio")
+    version = data[_VERSION_OFFSET]
+    if version > FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported serialization format version `{version}`, "
+            f"the latest supported version is `{FORMAT_VERSION}`"
+        )
+    return data[_KIND_OFFSET:_HEADER_SIZE]
+
+
+def dumps_request(request: Request) -> bytes:
+    overrides = {
+        _request_fields_indexes[name]: value
+        for name, value in request.overrides().items()
+    }
+    try:
+        payload = _pack([request.url, request.method, request.id, overrides])
+    except TypeError as e:
+        raise TypeError(f"Request {request.id=} cannot be serialized: {e}") from e
+    return _header(_REQUEST_KIND) + payload
+
+
+def loads_request(data: bytes) -> Request:
+    kind = _read_header(data)
+    if kind != _REQUEST_KIND:
+        raise ValueError("The data does not contain a serialized `Request`")
+    url, method, id, overrides = _unpack(data[_HEADER_SIZE:])
+    kwargs = {
+        Request.optional_fields[index]: value for index, value in overrides.items()
+    }
+    return Request(url=url, method=method, id=id, **kwargs)
+
+
+def _model_path(model: typing.Type["Item"]) -> str:
+    if "<locals>" in model.__qualname__ or "." in model.__qualname__:
+        raise TypeError(
+            f"Only module level items can be serialized, got `{model.__qualname__}`"
+        )
+    return f"{model.__module__}.{model.__qualname__}"
+
+
+def _needs_rebuild(field: ModelField) -> bool:
+    # Nested models and enums are serialized as plain values,
+    # they have to be converted back when the item is loaded
+    if field.sub_fields and any(_needs_rebuild(sub) for sub in field.sub_fields):
+        return True
+    return isinstance(field.type_, type) and issubclass(field.type_, (BaseModel, Enum))
+
+
+def _load_model(
+    path: str,
+) -> typing.Tuple[typing.Type["Item"], typing.Tuple[ModelField, ...]]:
+    from .items import Item
+
+    cached = _models_cache.get(path)
+    if cached is None:
+        model = load_module(path)
+        if not (isinstance(model, type) and issubclass(model, Item)):
+            raise ValueError(f"`{path}` is not an item model")
+        rebuilt = tuple(
+            field for field in model.__fields__.values() if _needs_rebuild(field)
+        )
+        cached = _models_cache[path] = (model, rebuilt)
+    return cached
+
+
+def dumps_item(item: "Item") -> bytes:
+    model = item.__class__
+    values = [getattr(item, name) for name in model.__fields__]
+    try:
+        payload = _pack([_model_path(model), values])
+    except TypeError as e:
+        raise TypeError(f"`{model.__name__}` item cannot be serialized: {e}") from e
+    return _header(_ITEM_KIND) + payload
+
+
+def loads_item(data: bytes, validate: bool = False) -> "Item":
+    kind = _read_header(data)
+    if kind != _ITEM_KIND:
+        raise ValueError("The data does not contain a serialized `Item`")
+    path, values = _unpack(data[_HEADER_SIZE:])
+    model, rebuilt = _load_model(path)
+    if len(values) != len(model.__fields__):
+        raise ValueError(f"The serialized `{path}` item does not match its model")
+    fields_values = dict(zip(model.__fields__, values))
+    if validate:
+        return model(**fields_values)
+    # Only the fields that cannot be stored as they are go through validation
+    for field in rebuilt:
+        value = fields_values[field.name]
+        fields_values[field.name], errors = field.validate(
+            value, fields_values, loc=field.name, cls=model
+        )
+        if errors:
+            raise ValueError(f"The serialized `{path}` item does not match its model")
+    return model.construct(**fields_values)
+
+
+def dumps(obj: typing.Union[Request, "Item"]) -> bytes:
+    if isinstance(obj, Request):
+        return dumps_request(obj)
+    return dumps_item(obj)
+
+
+def loads(data: bytes) -> typing.Union[Request, "Item"]:
+    kind = _read_header(data)
+    if kind == _REQUEST_KIND:
+        return loads_request(data)
+    return loads_item(data)
+
+
+def write_record(file: typing.BinaryIO, data: bytes) -> None:
+    file.write(_RECORD_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def iter_records(file: typing.BinaryIO) -> typing.Iterator[bytes]:
+    while True:
+        length = file.read(_RECORD_LENGTH.size)
+        if not length:
+            return
+        if len(length) < _RECORD_LENGTH.size:
+            raise ValueError("The records file is truncated")
+        (size,) = _RECORD_LENGTH.unpack(length)
+        data = file.read(size)
+        if len(data) < size:
+            raise ValueError("The records file is truncated")
+        yield data
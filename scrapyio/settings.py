@@ -1,5 +1,7 @@
 from types import ModuleType
 
+from scrapyio.templates import configuration_template
+
 SETTINGS_FILE_NAME = "settings.py"
 SETTINGS_FILE_NAME_FOR_IMPORT = "settings"
 
@@ -12,6 +14,10 @@ try:
     sys.path.append("")
     CONFIGS: ModuleType = __import__(SETTINGS_FILE_NAME_FOR_IMPORT)
 except ModuleNotFoundError:
-    from scrapyio.templates import configuration_template
-
     CONFIGS = configuration_template
+
+# Settings files created by older scrapyio versions
+# do not define the newer settings, so fall back to the defaults.
+for _name in dir(configuration_template):
+    if _name.isupper() and not hasattr(CONFIGS, _name):
+        setattr(CONFIGS, _name, getattr(configuration_template, _name))
@@ -50,12 +50,156 @@ DEFAULT_PROXIES: typing.Optional[ProxiesTypes] = None
 # Follow redirects for HTTP request
 FOLLOW_REDIRECTS: bool = False
 
+# Maximum length of a redirect chain, both for redirects followed
+# by httpx and for new requests returned by response middlewares
+# for redirect (3xx) responses
+MAX_REDIRECTS: int = 20
+
+# Maximum number of new requests returned by response middlewares
+# for other responses, such as retries through the next proxy
+MAX_MIDDLEWARE_RETRIES: int = 100
+
+# Number of permanent (301/308) redirect targets remembered, later GET
+# and HEAD requests that follow redirects are sent straight to the target,
+# 0 disables it
+PERMANENT_REDIRECTS_CACHE_SIZE: int = 1024
+
 # Trust env for httpx request
 DEFAULT_TRUST_ENV: bool = False
 
 # Enable stream by default
 ENABLE_STREAM_BY_DEFAULT: bool = False
 
+# Maximum number of keep-alive clients cached per proxy configuration,
+# set to 0 to create a new client for every proxied request
+PROXY_CLIENTS_POOL_SIZE: int = 32
+
+# Seconds after which an unused proxy client is closed
+PROXY_CLIENT_IDLE_TIMEOUT: float = 60
+
+# Maximum number of requests sent at the same time, None means unlimited
+CONCURRENT_REQUESTS: typing.Optional[int] = None
+
+# Send a duplicate request when a response takes longer than
+# the given percentile of the host's recent latencies
+HEDGE_REQUESTS: bool = False
+HEDGE_LATENCY_PERCENTILE: float = 95
+
+# Number of latencies remembered per host and
+# the number of latencies required before hedging
+HEDGE_LATENCY_WINDOW: int = 100
+HEDGE_MIN_SAMPLES: int = 20
+
+# Only the idempotent methods are hedged, the other ones are never sent twice
+HEDGE_METHODS: typing.List[str] = ["GET", "HEAD", "OPTIONS"]
+
+# Download identical requests that are in flight at the same time only once,
+# non-idempotent methods are left out of COALESCE_METHODS on purpose
+COALESCE_REQUESTS: bool = True
+COALESCE_METHODS: typing.List[str] = ["GET", "HEAD", "OPTIONS"]
+
+# Stop sending requests to a host after this many consecutive
+# failures, None disables the circuit breaker. With the breaker
+# a failed download drops only its own request
+CIRCUIT_BREAKER_FAILURES: typing.Optional[int] = None
+
+# Responses slower than this many seconds count as failures
+CIRCUIT_BREAKER_LATENCY_SLO: typing.Optional[float] = None
+
+# Seconds an open host waits before probe requests are let through
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = 30
+CIRCUIT_BREAKER_HALF_OPEN_REQUESTS: int = 1
+
+# Requests to an open host are either dropped ("drop")
+# or parked ("park") for at most CIRCUIT_BREAKER_PARK_TIMEOUT seconds
+CIRCUIT_BREAKER_POLICY: str = "drop"
+CIRCUIT_BREAKER_PARK_TIMEOUT: float = 60
+
+# Directory where every request and response is archived
+# to gzipped WARC files, None disables the archiving
+WARC_DIRECTORY: typing.Optional[str] = None
+WARC_PREFIX: str = "scrapyio"
+
+# WARC files are rotated once they reach this many bytes
+WARC_MAX_FILE_SIZE: int = 1024 * 1024 * 1024
+
+# Items yielded by spiders are streamed through a queue of this size to
+# ITEM_WORKERS middleware workers, then loaded in batches of at most
+# ITEMS_LOADING_BATCH_SIZE items, a full queue makes `parse` wait
+ITEMS_QUEUE_SIZE: int = 1000
+ITEM_WORKERS: int = 8
+ITEMS_LOADING_BATCH_SIZE: int = 1000
+# Every worker passes at most this many queued items at once to the
+# `process_items` hook of the item middlewares
+ITEMS_PROCESSING_BATCH_SIZE: int = 100
+
+# How many `process_item` calls of one item middleware run at
+# once, middlewares can override it with their `concurrency`
+ITEM_MIDDLEWARES_CONCURRENCY: int = 100
+
+# Objects shared by all the item middlewares, handed to their `open` hook.
+#   name -> path to a callable creating the resource
+#   example: {"http": "httpx.AsyncClient"}
+# Resources with an `aclose` coroutine are closed once the spider finishes
+ITEM_MIDDLEWARE_RESOURCES: typing.Dict[str, str] = {}
+
+# scrapyio.item_middlewares.DeduplicationMiddleWare drops repeated items.
+#   mode: "exact" (every seen item is kept in memory), "bloom" (a Bloom
+#   filter sized for CAPACITY items with ERROR_RATE false duplicates) or
+#   "disk" (a SQLite file at PATH, a temporary file when it is None)
+#   fields: item class name -> fields identifying its items,
+#   items of other classes are compared by all their fields
+ITEM_DEDUPLICATION_MODE: str = "exact"
+ITEM_DEDUPLICATION_FIELDS: typing.Dict[str, typing.List[str]] = {}
+ITEM_DEDUPLICATION_CAPACITY: int = 10_000_000
+ITEM_DEDUPLICATION_ERROR_RATE: float = 0.001
+ITEM_DEDUPLICATION_PATH: typing.Optional[str] = None
+
+# Every loader is fed from its own queue of LOADER_QUEUE_SIZE items, once
+# it is full LOADER_OVERFLOW_POLICY decides what happens to new items:
+# "block" (wait for the loader), "spill" (write them to a temporary file
+# and load them later) or "drop" (count them in the loader stats)
+LOADER_QUEUE_SIZE: int = 10_000
+LOADER_OVERFLOW_POLICY: str = "block"
+
+# File loaders buffer serialized items in memory and write them from a
+# dedicated thread once FILE_LOADER_BUFFER_SIZE bytes are collected or
+# FILE_LOADER_FLUSH_INTERVAL seconds passed since the previous write
+FILE_LOADER_BUFFER_SIZE: int = 1024 * 1024
+FILE_LOADER_FLUSH_INTERVAL: typing.Optional[float] = 1
+
+# When the written files are synced to the disk: "never",
+# "close" (once the loader is closed) or "flush" (after every write)
+FILE_LOADER_FSYNC: str = "close"
+
+# File loaders start a new numbered shard ("items-00001.jsonl") once the
+# current one holds FILE_LOADER_SHARD_BYTES bytes, FILE_LOADER_SHARD_ITEMS
+# items or is FILE_LOADER_SHARD_SECONDS old, None disables a limit. Shards
+# are written with the ".part" suffix and renamed once they are finished
+FILE_LOADER_SHARD_BYTES: typing.Optional[int] = None
+FILE_LOADER_SHARD_ITEMS: typing.Optional[int] = None
+FILE_LOADER_SHARD_SECONDS: typing.Optional[float] = None
+
+# ParquetLoader writes a row group for every PARQUET_ROW_GROUP_SIZE items
+# and starts a new file once PARQUET_MAX_FILE_SIZE bytes are written
+PARQUET_ROW_GROUP_SIZE: int = 100_000
+PARQUET_MAX_FILE_SIZE: typing.Optional[int] = 512 * 1024 * 1024
+PARQUET_COMPRESSION: str = "zstd"
+
+# SQLAlchemyLoader commits after this many rows or seconds,
+# None disables the limit and rows are committed on close
+SQL_LOADER_COMMIT_EVERY: typing.Optional[int] = 10_000
+SQL_LOADER_COMMIT_INTERVAL: typing.Optional[float] = 5
+
+# Maximum number of rows sent by SQLAlchemyLoader in a single executemany
+SQL_LOADER_BATCH_SIZE: int = 1000
+
+# PRAGMA statements run on every new SQLite connection of SQLAlchemyLoader
+SQL_LOADER_SQLITE_PRAGMAS: typing.Dict[str, str] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+}
+
 # Logging configuration
 
 DEFAULT_LOGGING_CONFIG: typing.Dict = {
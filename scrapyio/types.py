@@ -8,6 +8,8 @@ if typing.TYPE_CHECKING:
     from .item_middlewares import BaseItemMiddleWare
     from .items import Item
 
+EVENT_HOOKS = typing.Dict[str, typing.List[typing.Callable[..., typing.Any]]]
+
 RESPONSE_GENERATOR = typing.AsyncGenerator[Response, None]
 CLEANUP_WITH_RESPONSE = typing.Tuple[RESPONSE_GENERATOR, Response]
 
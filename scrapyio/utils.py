@@ -20,6 +20,20 @@ def first_not_none(o1: T, o2: Y) -> Y:
     return o2
 
 
+def make_hashable(value: typing.Any) -> typing.Hashable:
+    if isinstance(value, dict):
+        return tuple(
+            sorted((str(key), make_hashable(val)) for key, val in value.items())
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(make_hashable(val) for val in value)
+    try:
+        hash(value)
+    except TypeError:
+        return id(value)
+    return typing.cast(typing.Hashable, value)
+
+
 def random_filename(numbers_range: int = 10, random_suffix_length: int = 4) -> str:
     numers: str = "".join(str(i) for i in range(numbers_range))
     random_number: typing.List[str]
@@ -0,0 +1,281 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import typing
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+
+import httpx
+
+from .__about__ import __version__
+from .settings import CONFIGS
+from .utils import first_not_none
+
+log = logging.getLogger("scrapyio")
+
+WARC_VERSION = "WARC/1.1"
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Bodies are recorded as they were received, without the chunked framing
+_SKIPPED_HEADERS = {b"transfer-encoding"}
+
+T = typing.TypeVar("T")
+HEADER_FIELDS = typing.List[typing.Tuple[str, str]]
+
+
+def _record_id() -> str:
+    return f"<urn:uuid:{uuid.uuid4()}>"
+
+
+def _warc_date() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _sha1_digest(digest: "hashlib._Hash") -> str:
+    return "sha1:" + base64.b32encode(digest.digest()).decode()
+
+
+def _record_header(fields: HEADER_FIELDS) -> bytes:
+    lines = [WARC_VERSION, *(f"{name}: {value}" for name, value in fields)]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def _http_headers(headers: httpx.Headers) -> bytes:
+    lines = [
+        name + b": " + value + b"\r\n"
+        for name, value in headers.raw
+        if name.lower() not in _SKIPPED_HEADERS
+    ]
+    return b"".join(lines) + b"\r\n"
+
+
+def http_request_head(request: httpx.Request, http_version: str) -> bytes:
+    request_line = b" ".join(
+        (request.method.encode(), request.url.raw_path, http_version.encode())
+    )
+    return request_line + b"\r\n" + _http_headers(request.headers)
+
+
+def http_response_head(response: httpx.Response) -> bytes:
+    status_line = (
+        f"{response.http_version} {response.status_code} {response.reason_phrase}"
+    )
+    return status_line.encode() + b"\r\n" + _http_headers(response.headers)
+
+
+class WARCRecordingStream(httpx.AsyncByteStream):
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_close: typing.Callable[
+            ["WARCRecordingStream"], typing.Awaitable[typing.Any]
+        ],
+        run: typing.Callable[..., typing.Awaitable[typing.Any]],
+    ):
+        self.stream = stream
+        self.on_close = on_close
+        self.run = run
+        # Read responses already keep their body in memory, so the copy
+        # goes straight to the disk, written from the writer thread
+        self.body = tempfile.TemporaryFile()
+        self.digest = hashlib.sha1()
+        self.size: int = 0
+        self.complete = False
+        self.closed = False
+
+    async def __aiter__(self) -> typing.AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            await self.run(self.body.write, chunk)
+            self.digest.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+        self.complete = True
+
+    async def aclose(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.stream.aclose()
+        finally:
+            try:
+                await self.on_close(self)
+            finally:
+                self.body.close()
+
+
+class WARCWriter:
+    def __init__(
+        self,
+        directory: str,
+        prefix: typing.Optional[str] = None,
+        max_file_size: typing.Optional[int] = None,
+    ):
+        self.directory = directory
+        self.prefix: str = first_not_none(prefix, CONFIGS.WARC_PREFIX)
+        self.max_file_size: int = first_not_none(
+            max_file_size, CONFIGS.WARC_MAX_FILE_SIZE
+        )
+        self.serial: int = 0
+        self.path: typing.Optional[str] = None
+        self.file: typing.Optional[typing.BinaryIO] = None
+        self.executor: typing.Optional[ThreadPoolExecutor] = None
+        # Finished files, they are not written anymore
+        self.paths: typing.List[str] = []
+        self.records: int = 0
+
+    async def _run(self, func: typing.Callable[..., T], *args: typing.Any) -> T:
+        # The records go through the single writer thread, so the gzip
+        # members of concurrent responses are never interleaved
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scrapyio-warc"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _open_file(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        name = f"{self.prefix}-{timestamp}-{self.serial:05d}.warc.gz"
+        self.serial += 1
+        self.path = os.path.join(self.directory, name)
+        log.debug(f"Opening the `{self.path}` WARC file")
+        # Unfinished files get the ".part" suffix until they are rotated
+        self.file = open(self.path + ".part", "wb")
+        info = (
+            f"software: scrapyio/{__version__}\r\nformat: WARC File Format 1.1\r\n"
+        ).encode()
+        self._write_record(
+            [
+                ("WARC-Type", "warcinfo"),
+                ("WARC-Record-ID", _record_id()),
+                ("WARC-Date", _warc_date()),
+                ("WARC-Filename", name),
+                ("Content-Type", "application/warc-fields"),
+                ("Content-Length", str(len(info))),
+            ],
+            info,
+        )
+
+    def _write_record(
+        self,
+        fields: HEADER_FIELDS,
+        head: bytes,
+        body: typing.Optional[typing.BinaryIO] = None,
+    ) -> None:
+        # Every record is a separate gzip member, so the readers
+        # can seek to any record without decompressing the whole file
+        assert self.file
+        with gzip.GzipFile(filename="", fileobj=self.file, mode="wb") as member:
+            member.write(_record_header(fields))
+            member.write(head)
+            if body is not None:
+                body.seek(0)
+                shutil.copyfileobj(body, member, COPY_CHUNK_SIZE)
+            member.write(b"\r\n\r\n")
+        self.records += 1
+
+    def _close_file(self) -> None:
+        assert self.file and self.path
+        self.file.close()
+        os.replace(self.path + ".part", self.path)
+        log.debug(f"The `{self.path}` WARC file is finished")
+        self.paths.append(self.path)
+        self.file = None
+
+    def _write_exchange(
+        self,
+        request_fields: HEADER_FIELDS,
+        request_head: bytes,
+        response_fields: HEADER_FIELDS,
+        response_head: bytes,
+        body: typing.BinaryIO,
+    ) -> None:
+        if self.file is None:
+            self._open_file()
+        self._write_record(request_fields, request_head)
+        self._write_record(response_fields, response_head, body)
+        assert self.file
+        if self.file.tell() >= self.max_file_size:
+            self._close_file()
+
+    async def archive_response(self, response: httpx.Response) -> None:
+        # The httpx "response" event hook, the body is copied
+        # while it is read and archived once the response is closed
+        response.stream = WARCRecordingStream(
+            stream=typing.cast(httpx.AsyncByteStream, response.stream),
+            on_close=partial(self.write_exchange, response),
+            run=self._run,
+        )
+
+    async def write_exchange(
+        self, response: httpx.Response, recorded: WARCRecordingStream
+    ) -> None:
+        request = response.request
+        date = _warc_date()
+        target_uri = str(request.url)
+        response_id = _record_id()
+
+        response_head = http_response_head(response)
+        response_fields: HEADER_FIELDS = [
+            ("WARC-Type", "response"),
+            ("WARC-Record-ID", response_id),
+            ("WARC-Date", date),
+            ("WARC-Target-URI", target_uri),
+            ("WARC-Payload-Digest", _sha1_digest(recorded.digest)),
+            ("Content-Type", "application/http;msgtype=response"),
+            ("Content-Length", str(len(response_head) + recorded.size)),
+        ]
+        if not recorded.complete:
+            response_fields.append(("WARC-Truncated", "unspecified"))
+
+        request_truncated = False
+        try:
+            request_body = request.content
+        except httpx.RequestNotRead:
+            # Redirected requests reuse the in-memory body of the original one,
+            # while streamed request bodies are gone once they are sent
+            if isinstance(request.stream, httpx.ByteStream):
+                request_body = b"".join(request.stream)
+            else:
+                request_body = b""
+                request_truncated = True
+        request_head = http_request_head(request, response.http_version)
+        request_head += request_body
+        request_fields: HEADER_FIELDS = [
+            ("WARC-Type", "request"),
+            ("WARC-Record-ID", _record_id()),
+            ("WARC-Date", date),
+            ("WARC-Target-URI", target_uri),
+            ("WARC-Concurrent-To", response_id),
+            ("Content-Type", "application/http;msgtype=request"),
+            ("Content-Length", str(len(request_head))),
+        ]
+        if request_truncated:
+            request_fields.append(("WARC-Truncated", "unspecified"))
+
+        log.debug(f"Archiving the response of `{target_uri}`")
+        await self._run(
+            self._write_exchange,
+            request_fields,
+            request_head,
+            response_fields,
+            response_head,
+            recorded.body,
+        )
+
+    async def close(self) -> None:
+        if self.executor is None:
+            return
+        if self.file is not None:
+            await self._run(self._close_file)
+        self.executor.shutdown(wait=False)
+        self.executor = None
@@ -0,0 +1,335 @@
+import asyncio
+import gzip
+import logging
+import os
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from types import ModuleType
+
+from .settings import CONFIGS
+from .utils import first_not_none
+
+zstandard: typing.Optional[ModuleType]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # pragma: no cover
+
+log = logging.getLogger("scrapyio")
+
+T = typing.TypeVar("T")
+
+# "never" leaves syncing to the OS, "close" syncs the file once
+# it is closed and "flush" syncs it after every flushed chunk
+FSYNC_POLICIES = ("never", "close", "flush")
+COMPRESSIONS = ("gzip", "zstd")
+
+
+class BufferedFileWriter:
+    def __init__(
+        self,
+        filename: str,
+        buffer_size: typing.Optional[int] = None,
+        flush_interval: typing.Optional[float] = None,
+        fsync: typing.Optional[str] = None,
+        compression: typing.Optional[str] = None,
+    ):
+        self.filename = filename
+        self.buffer_size: int = first_not_none(
+            buffer_size, CONFIGS.FILE_LOADER_BUFFER_SIZE
+        )
+        self.flush_interval: typing.Optional[float] = first_not_none(
+            flush_interval, CONFIGS.FILE_LOADER_FLUSH_INTERVAL
+        )
+        self.fsync: str = first_not_none(fsync, CONFIGS.FILE_LOADER_FSYNC)
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy `{self.fsync}`, expected one of {FSYNC_POLICIES}"
+            )
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression `{compression}`, expected one of {COMPRESSIONS}"
+            )
+        if compression == "zstd" and zstandard is None:  # pragma: no cover
+            raise ImportError(
+                "The zstd compression requires `zstandard`, "
+                "install it with `pip install scrapyio[zstd]`"
+            )
+        self.compression = compression
+        self.buffer: typing.List[bytes] = []
+        self.buffered: int = 0
+        self.last_flush: float = time.monotonic()
+        self.file: typing.Optional[typing.BinaryIO] = None
+        self.raw_file: typing.Optional[typing.BinaryIO] = None
+        self.executor: typing.Optional[ThreadPoolExecutor] = None
+        self.timer: typing.Optional["asyncio.Task[None]"] = None
+
+    async def _run(self, func: typing.Callable[..., T], *args: typing.Any) -> T:
+        # All the file operations go through the single writer thread,
+        # so chunks are written in order without blocking the event loop
+        assert self.executor, "The writer must be opened first"
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _open_file(self) -> typing.BinaryIO:
+        # Compression runs in the writer thread together with the writes
+        raw_file = self.raw_file = open(self.filename, "wb")
+        if self.compression == "gzip":
+            return typing.cast(
+                typing.BinaryIO, gzip.GzipFile(fileobj=raw_file, mode="wb")
+            )
+        if self.compression == "zstd":
+            assert zstandard
+            compressor = zstandard.ZstdCompressor()
+            return compressor.stream_writer(raw_file, closefd=False)
+        return raw_file
+
+    def _sync(self) -> None:
+        assert self.raw_file
+        self.raw_file.flush()
+        os.fsync(self.raw_file.fileno())
+
+    def _write_chunk(self, chunk: bytes) -> None:
+        assert self.file
+        self.file.write(chunk)
+        # Flushing a compressor ends the current block and hurts the ratio,
+        # compressed output is flushed only when it has to reach the disk
+        if self.compression is None or self.fsync == "flush":
+            self.file.flush()
+        if self.fsync == "flush":
+            self._sync()
+
+    def _close_file(self) -> None:
+        assert self.file and self.raw_file
+        if self.file is not self.raw_file:
+            self.file.close()
+        if self.fsync != "never":
+            self._sync()
+        self.raw_file.close()
+
+    async def open(self) -> None:
+        log.debug(f"Opening the buffered writer for `{self.filename}`")
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="scrapyio-writer"
+        )
+        self.file = await self._run(self._open_file)
+        self.last_flush = time.monotonic()
+        if self.flush_interval:
+            self.timer = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        # Without new writes the interval is never checked,
+        # so the timer flushes the items buffered before a lull
+        assert self.flush_interval
+        while True:
+            delay = self.flush_interval
+            if self.buffer:
+                delay = self.last_flush + self.flush_interval - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+            if (
+                self.buffer
+                and time.monotonic() - self.last_flush >= self.flush_interval
+            ):
+                await self.flush()
+
+    async def write(self, data: bytes) -> None:
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.buffer_size or (
+            self.flush_interval is not None
+            and time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        chunk = b"".join(self.buffer)
+        self.buffer.clear()
+        self.buffered = 0
+        log.debug(f"Flushing {len(chunk)} bytes to `{self.filename}`")
+        await self._run(self._write_chunk, chunk)
+
+    async def close(self) -> None:
+        log.debug(f"Closing the buffered writer for `{self.filename}`")
+        if self.timer is not None:
+            self.timer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.timer
+            self.timer = None
+        await self.flush()
+        await self._run(self._close_file)
+        assert self.executor
+        self.executor.shutdown(wait=False)
+
+
+class ShardedFileWriter:
+    def __init__(
+        self,
+        filename: str,
+        header: bytes = b"",
+        separator: bytes = b"",
+        footer: bytes = b"",
+        shard_bytes: typing.Optional[int] = None,
+        shard_items: typing.Optional[int] = None,
+        shard_seconds: typing.Optional[float] = None,
+        **writer_options: typing.Any,
+    ):
+        self.filename = filename
+        self.header = header
+        self.separator = separator
+        self.footer = footer
+        self.shard_bytes: typing.Optional[int] = first_not_none(
+            shard_bytes, CONFIGS.FILE_LOADER_SHARD_BYTES
+        )
+        self.shard_items: typing.Optional[int] = first_not_none(
+            shard_items, CONFIGS.FILE_LOADER_SHARD_ITEMS
+        )
+        self.shard_seconds: typing.Optional[float] = first_not_none(
+            shard_seconds, CONFIGS.FILE_LOADER_SHARD_SECONDS
+        )
+        self.sharded = any(
+            limit is not None
+            for limit in (self.shard_bytes, self.shard_items, self.shard_seconds)
+        )
+        self.writer_options = writer_options
+        self.writer: typing.Optional[BufferedFileWriter] = None
+        self.shard: int = 0
+        self.shard_path: str = filename
+        self.shard_started: float = time.monotonic()
+        self.shard_size: int = 0
+        self.shard_records: int = 0
+        # Finished shards, they are not written anymore
+        self.paths: typing.List[str] = []
+        # Shards are finished by the writes and by the shard timer
+        self.lock = asyncio.Lock()
+        self.timer: typing.Optional["asyncio.Task[None]"] = None
+
+    def _shard_path(self, shard: int) -> str:
+        # "items.jsonl.gz" becomes "items-00000.jsonl.gz"
+        directory, name = os.path.split(self.filename)
+        stem, dot, extensions = name.partition(".")
+        return os.path.join(directory, f"{stem}-{shard:05d}{dot}{extensions}")
+
+    async def _open_shard(self) -> None:
+        self.shard_path = self.filename
+        path = self.filename
+        if self.sharded:
+            # Unfinished shards get the ".part" suffix,
+            # so they are never mistaken for finished ones
+            self.shard_path = self._shard_path(self.shard)
+            path = self.shard_path + ".part"
+        log.debug(f"Opening the `{self.shard_path}` shard")
+        self.writer = BufferedFileWriter(path, **self.writer_options)
+        await self.writer.open()
+        self.shard_started = time.monotonic()
+        self.shard_size = self.shard_records = 0
+        await self._write(self.header)
+
+    async def _write(self, data: bytes) -> None:
+        assert self.writer
+        if data:
+            await self.writer.write(data)
+            self.shard_size += len(data)
+
+    async def _close_shard(self) -> None:
+        assert self.writer
+        await self._write(self.footer)
+        await self.writer.close()
+        if self.sharded:
+            os.replace(self.writer.filename, self.shard_path)
+        log.debug(f"The `{self.shard_path}` shard is finished")
+        self.paths.append(self.shard_path)
+        self.writer = None
+        self.shard_size = self.shard_records = 0
+        self.shard += 1
+
+    def _is_aged(self) -> bool:
+        return (
+            self.shard_seconds is not None
+            and time.monotonic() - self.shard_started >= self.shard_seconds
+        )
+
+    def _is_full(self, size: int) -> bool:
+        if not self.sharded or not self.shard_records:
+            return False
+        return (
+            (self.shard_items is not None and self.shard_records >= self.shard_items)
+            or (
+                self.shard_bytes is not None
+                and self.shard_size + size > self.shard_bytes
+            )
+            or self._is_aged()
+        )
+
+    async def _finish_aged_shards(self) -> None:
+        # Without new records the writes never notice that the
+        # shard is old enough, so the timer finishes it instead
+        assert self.shard_seconds is not None
+        while True:
+            async with self.lock:
+                if self.writer is not None and self.shard_records and self._is_aged():
+                    log.debug(f"The `{self.shard_path}` shard is old enough")
+                    await self._close_shard()
+            delay = self.shard_seconds
+            if self.writer is not None and self.shard_records:
+                delay = self.shard_started + self.shard_seconds - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+
+    async def open(self) -> None:
+        await self._open_shard()
+        if self.shard_seconds is not None:
+            self.timer = asyncio.create_task(self._finish_aged_shards())
+
+    async def set_header(self, header: bytes) -> None:
+        # Shards that have nothing written yet get the new header right away
+        async with self.lock:
+            self.header = header
+            if self.writer is not None and not self.shard_size:
+                await self._write(header)
+
+    async def write_records(self, records: typing.Sequence[bytes]) -> None:
+        async with self.lock:
+            await self._write_records(records)
+
+    async def _write_records(self, records: typing.Sequence[bytes]) -> None:
+        chunk: typing.List[bytes] = []
+        for record in records:
+            if self._is_full(len(self.separator) + len(record)):
+                await self._write_chunk(chunk)
+                await self._close_shard()
+            if self.writer is None:
+                await self._open_shard()
+            if self.shard_records:
+                chunk.append(self.separator)
+                self.shard_size += len(self.separator)
+            chunk.append(record)
+            self.shard_size += len(record)
+            self.shard_records += 1
+        await self._write_chunk(chunk)
+
+    async def _write_chunk(self, chunk: typing.List[bytes]) -> None:
+        # The sizes of the chunk parts are already counted
+        if chunk:
+            assert self.writer
+            await self.writer.write(b"".join(chunk))
+            chunk.clear()
+
+    async def flush(self) -> None:
+        async with self.lock:
+            if self.writer is not None:
+                await self.writer.flush()
+
+    async def close(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.timer
+            self.timer = None
+        async with self.lock:
+            if self.writer is not None:
+                await self._close_shard()
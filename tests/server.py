@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import RedirectResponse, Response
 
 app = FastAPI()
 
@@ -6,3 +7,35 @@ app = FastAPI()
 @app.get("/")
 async def root():
     return "Hello World"
+
+
+@app.get("/moved")
+async def moved():
+    return RedirectResponse("/", status_code=301)
+
+
+@app.get("/found")
+async def found():
+    return RedirectResponse("/", status_code=302)
+
+
+@app.get("/cookies")
+async def cookies(request: Request):
+    return Response(request.headers.get("cookie", "").encode())
+
+
+@app.get("/login")
+async def login():
+    response = RedirectResponse("/cookies", status_code=302)
+    response.set_cookie("user", "1")
+    return response
+
+
+@app.get("/loop")
+async def loop():
+    return RedirectResponse("/loop", status_code=302)
+
+
+@app.post("/echo")
+async def echo(request: Request):
+    return Response(await request.body())
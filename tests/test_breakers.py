@@ -0,0 +1,67 @@
+"""
+This module contains the scrapyio circuit breaker tests.
+These tests ensure that failing hosts are opened, probed
+and closed again as expected.
+"""
+
+from scrapyio.breakers import CircuitBreaker, CircuitState
+
+
+def open_breaker(**kwargs):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60, **kwargs)
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+    return breaker
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure("example.com")
+    breaker.record_success("example.com", latency=0.1)
+    breaker.record_failure("example.com")
+    assert breaker.state("example.com") == CircuitState.CLOSED
+    assert breaker.allow("example.com")
+
+    breaker.record_failure("example.com")
+    assert breaker.state("example.com") == CircuitState.OPEN
+    assert not breaker.allow("example.com")
+    assert breaker.state("other.com") == CircuitState.CLOSED
+    assert 59 < breaker.retry_after("example.com") <= 60
+
+
+def test_circuit_breaker_latency_slo():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60, latency_slo=1)
+    breaker.record_success("example.com", latency=0.5)
+    assert breaker.state("example.com") == CircuitState.CLOSED
+    breaker.record_success("example.com", latency=2)
+    assert breaker.state("example.com") == CircuitState.OPEN
+
+
+def test_circuit_breaker_half_open_probes():
+    breaker = open_breaker(half_open_requests=1)
+    breaker.circuits["example.com"].opened_at -= 60
+    assert breaker.state("example.com") == CircuitState.HALF_OPEN
+    assert breaker.allow("example.com")
+    assert not breaker.allow("example.com")
+    assert breaker.retry_after("example.com") == 0.1
+
+    breaker.record_failure("example.com")
+    assert breaker.state("example.com") == CircuitState.OPEN
+
+    breaker.circuits["example.com"].opened_at -= 60
+    assert breaker.allow("example.com")
+    breaker.record_success("example.com", latency=0.1)
+    assert breaker.state("example.com") == CircuitState.CLOSED
+    assert breaker.circuits["example.com"].failures == 0
+
+
+def test_circuit_breaker_probe_release():
+    breaker = open_breaker(half_open_requests=1)
+    breaker.release("example.com")
+    breaker.circuits["example.com"].opened_at -= 60
+    assert breaker.allow("example.com")
+    assert not breaker.allow("example.com")
+    breaker.release("example.com")
+    breaker.release("example.com")
+    assert breaker.circuits["example.com"].probes == 0
+    assert breaker.allow("example.com")
@@ -3,7 +3,11 @@ This module contains unit tests for the Scrapyio
 "downloader". These checks ensure that request
 downloading and HTTP requests work properly.
 """
+import asyncio
 import inspect
+import ssl
+import time
+import typing
 from contextlib import suppress
 from functools import partial
 
@@ -13,15 +17,22 @@ from httpx import Response
 from httpx._exceptions import ResponseNotRead
 
 from scrapyio import Request
+from scrapyio.breakers import CircuitBreaker, CircuitState
 from scrapyio.downloader import (
     Downloader,
+    LatencyTracker,
+    PermanentRedirectCache,
+    ProxyClientPool,
     SessionDownloader,
+    _PooledAsyncClient,
     create_default_session,
     send_request,
+    send_request_with_pool,
     send_request_with_session,
 )
 from scrapyio.exceptions import IgnoreRequestException
-from scrapyio.middlewares import BaseMiddleWare
+from scrapyio.http import clean_up_response
+from scrapyio.middlewares import BaseMiddleWare, ProxyMiddleWare
 from scrapyio.settings import CONFIGS
 
 
@@ -356,3 +367,698 @@ async def test_downloader_request_processing_ignore_request(mocked_request):
     downloader.middleware_classes.append(IgnoreMiddleWare)
     resp = await downloader._process_request_with_middlewares(request=req)
     assert resp is None
+
+
+class AppClientPool(ProxyClientPool):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.created = 0
+
+    def create_client(self, request):
+        self.created += 1
+        return _PooledAsyncClient(app=self.app, base_url=request.base_url)
+
+
+def test_proxy_client_pool_keys():
+    req1 = Request(url="/", method="GET", proxies={"all://": "http://proxy1"})
+    req2 = Request(url="/", method="GET", proxies={"all://": "http://proxy1"})
+    req3 = Request(url="/", method="GET", proxies={"all://": "http://proxy2"})
+    req4 = Request(
+        url="/", method="GET", proxies={"all://": "http://proxy1"}, verify=False
+    )
+    req5 = Request(
+        url="/",
+        method="GET",
+        proxies=["http://proxy1"],
+        verify=ssl.create_default_context(),
+    )
+    key = ProxyClientPool.key_for
+    assert key(req1) == key(req2)
+    assert key(req1) != key(req3)
+    assert key(req1) != key(req4)
+    assert key(req5) == key(req5)
+
+
+def test_pooled_client_does_not_store_cookies():
+    client = _PooledAsyncClient(cookies={"key": "value"})
+    client.cookies = {"key": "value"}
+    assert not client.cookies
+
+
+@pytest.mark.anyio
+async def test_proxy_client_pool_reuses_clients():
+    pool = ProxyClientPool(max_size=2, idle_timeout=60)
+    req1 = Request(url="/", method="GET", proxies="http://proxy1")
+    req2 = Request(url="/", method="GET", proxies="http://proxy2")
+    async with pool.acquire(req1) as client1:
+        ...
+    async with pool.acquire(req1) as client2:
+        ...
+    async with pool.acquire(req2) as client3:
+        ...
+    assert client1 is client2
+    assert client1 is not client3
+    assert len(pool.clients) == 2
+    await pool.aclose()
+    assert client1.is_closed and client3.is_closed
+    assert not pool.clients
+
+
+@pytest.mark.anyio
+async def test_proxy_client_pool_size_eviction():
+    pool = ProxyClientPool(max_size=1, idle_timeout=60)
+    req1 = Request(url="/", method="GET", proxies="http://proxy1")
+    req2 = Request(url="/", method="GET", proxies="http://proxy2")
+    async with pool.acquire(req1) as client1:
+        async with pool.acquire(req2) as client2:
+            assert not client1.is_closed
+        assert len(pool.clients) == 1
+    assert client1.is_closed
+    assert not client2.is_closed
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+async def test_proxy_client_pool_idle_eviction():
+    pool = ProxyClientPool(max_size=2, idle_timeout=0)
+    req1 = Request(url="/", method="GET", proxies="http://proxy1")
+    req2 = Request(url="/", method="GET", proxies="http://proxy2")
+    async with pool.acquire(req1) as client1:
+        ...
+    async with pool.acquire(req2):
+        ...
+    assert client1.is_closed
+    assert len(pool.clients) == 1
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+async def test_proxy_client_pool_concurrent_idle_eviction(monkeypatch):
+    aclose = _PooledAsyncClient.aclose
+
+    async def slow_aclose(client: _PooledAsyncClient) -> None:
+        # Clients with open connections give up control while closing
+        await asyncio.sleep(0)
+        await aclose(client)
+
+    monkeypatch.setattr(_PooledAsyncClient, "aclose", slow_aclose)
+    pool = ProxyClientPool(max_size=10, idle_timeout=60)
+    idle = [
+        Request(url="/", method="GET", proxies=f"http://idle{number}")
+        for number in range(3)
+    ]
+    for request in idle:
+        async with pool.acquire(request):
+            ...
+    idle_clients = [pooled.client for pooled in pool.clients.values()]
+    for pooled in pool.clients.values():
+        pooled.last_used -= 120
+
+    async def acquire(number: int) -> None:
+        request = Request(url="/", method="GET", proxies=f"http://new{number}")
+        async with pool.acquire(request):
+            ...
+
+    await asyncio.gather(acquire(0), acquire(1))
+    assert all(client.is_closed for client in idle_clients)
+    assert all(key[0].startswith("http://new") for key in pool.clients)
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_pooled_redirects_keep_request_cookies(app, stream):
+    pool = AppClientPool(app=app, max_size=1)
+    req = Request(
+        url="/login",
+        method="GET",
+        base_url="https://scrapyio-example.com",
+        cookies={"s": "1"},
+        follow_redirects=True,
+        stream=stream,
+    )
+    response_gen = send_request_with_pool(pool=pool, request=req)
+    response = await response_gen.__anext__()
+    await response.aread()
+    assert response.content == b"s=1; user=1"
+    assert [redirect.status_code for redirect in response.history] == [302]
+    await clean_up_response(response_gen)
+
+    # The cookies of the redirect hop do not leak into the next request
+    response_gen = send_request_with_pool(pool=pool, request=req.copy(url="/cookies"))
+    response = await response_gen.__anext__()
+    await response.aread()
+    assert response.content == b"s=1"
+    await clean_up_response(response_gen)
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+async def test_pooled_redirects_limit(app):
+    pool = AppClientPool(app=app, max_size=1)
+    req = Request(
+        url="/loop",
+        method="GET",
+        base_url="https://scrapyio-example.com",
+        follow_redirects=True,
+    )
+    with pytest.raises(httpx.TooManyRedirects):
+        await send_request_with_pool(pool=pool, request=req).__anext__()
+
+    response_gen = send_request_with_pool(
+        pool=pool, request=req.copy(follow_redirects=False)
+    )
+    response = await response_gen.__anext__()
+    assert response.status_code == 302
+    assert response.next_request is not None
+    await clean_up_response(response_gen)
+    await pool.aclose()
+
+
+@pytest.mark.anyio
+async def test_downloader_reuses_proxy_clients(app):
+    pool = AppClientPool(app=app, max_size=2)
+    downloader = Downloader(proxy_clients_pool=pool)
+    for stream in (False, True):
+        req = Request(
+            url="/",
+            method="GET",
+            base_url="https://scrapyio-example.com",
+            proxies="http://proxy1",
+            stream=stream,
+        )
+        clean_up, response = await downloader.handle_request(request=req)
+        try:
+            await response.aread()
+            assert response.text
+        finally:
+            with suppress(StopAsyncIteration):
+                await clean_up.__anext__()
+    assert pool.created == 1
+    await downloader.close()
+    assert not pool.clients
+
+
+@pytest.mark.anyio
+async def test_session_downloader_close(app):
+    downloader = SessionDownloader(app=app, base_url="https://scrapyio-example.com")
+    await downloader.close()
+    assert downloader.session.is_closed
+
+
+class DelayedDownloader(Downloader):
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = list(delays)
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+
+    def send_request(self, request):
+        return self._delayed_response(request, *self.delays.pop(0))
+
+    async def _delayed_response(self, request, delay, fail=False, status=200):
+        self.sent.append(request)
+        self.active += 1
+        self.max_active = max(self.active, self.max_active)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.active -= 1
+        if fail:
+            raise httpx.ConnectError("Failed") if fail is True else fail
+        headers = {"location": "/"} if 300 <= status < 400 else None
+        yield Response(
+            status, headers=headers, request=httpx.Request("GET", request.url)
+        )
+
+
+def hedging_downloader(delays, **kwargs):
+    downloader = DelayedDownloader(delays=delays, hedge_requests=True, **kwargs)
+    for _ in range(downloader.latencies.min_samples):
+        downloader.latencies.record("example.com", 0.01)
+    return downloader
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=10, min_samples=2)
+    tracker.record("example.com", 1)
+    assert tracker.percentile("example.com", 50) is None
+    assert tracker.percentile("unknown.com", 50) is None
+    for latency in range(2, 11):
+        tracker.record("example.com", latency)
+    assert tracker.percentile("example.com", 50) == 5
+    assert tracker.percentile("example.com", 100) == 10
+    assert tracker.percentile("example.com", 0) == 1
+
+
+@pytest.mark.anyio
+async def test_hedging_requires_latency_samples():
+    downloader = DelayedDownloader(delays=[(0,)], hedge_requests=True)
+    req = Request(url="https://example.com", method="GET")
+    await downloader.handle_request(request=req)
+    assert len(downloader.sent) == 1
+    assert len(downloader.latencies.samples["example.com"]) == 1
+
+
+@pytest.mark.anyio
+async def test_hedged_request_wins():
+    downloader = hedging_downloader(delays=[(1,), (0,)])
+    req = Request(url="https://example.com", method="GET")
+    started = time.monotonic()
+    clean_up, response = await downloader.handle_request(request=req)
+    assert time.monotonic() - started < 0.5
+    assert response.status_code == 200
+    assert len(downloader.sent) == 2
+    assert downloader.sent[1] is not req
+    assert downloader.sent[1].id == req.id
+    assert downloader.active == 0
+
+
+@pytest.mark.anyio
+async def test_hedged_request_cancellation():
+    downloader = hedging_downloader(delays=[(1,)])
+    req = Request(url="https://example.com", method="GET")
+    task = asyncio.ensure_future(downloader.handle_request(request=req))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+    assert downloader.active == 0
+
+
+@pytest.mark.anyio
+async def test_hedged_request_not_needed():
+    downloader = hedging_downloader(delays=[(0,)])
+    req = Request(url="https://example.com", method="GET")
+    await downloader.handle_request(request=req)
+    assert len(downloader.sent) == 1
+
+
+@pytest.mark.anyio
+async def test_hedged_request_respects_concurrency_budget():
+    downloader = hedging_downloader(delays=[(0.05,)], concurrent_requests=1)
+    req = Request(url="https://example.com", method="GET")
+    await downloader.handle_request(request=req)
+    assert len(downloader.sent) == 1
+
+
+@pytest.mark.anyio
+async def test_hedged_request_failures():
+    downloader = hedging_downloader(delays=[(0.05, True), (0.1,)])
+    req = Request(url="https://example.com", method="GET")
+    clean_up, response = await downloader.handle_request(request=req)
+    assert response.status_code == 200
+
+    downloader = hedging_downloader(delays=[(0.05, True), (0.1, True)])
+    with pytest.raises(httpx.ConnectError):
+        await downloader.handle_request(request=req)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("method", ["POST", "PUT", "PATCH", "DELETE"])
+async def test_non_idempotent_requests_are_not_hedged(method):
+    downloader = hedging_downloader(delays=[(0.05,), (0,)])
+    req = Request(url="https://example.com", method=method)
+    clean_up, response = await downloader.handle_request(request=req)
+    assert response.status_code == 200
+    assert len(downloader.sent) == 1
+
+
+def test_hedge_request_uses_another_proxy(monkeypatch):
+    monkeypatch.setattr(CONFIGS, "PROXY_CHAIN", ["http://proxy1", "http://proxy2"])
+    downloader = Downloader()
+    req = Request(url="/", method="GET", proxies={"all": "http://proxy1"})
+    assert downloader._hedge_request_for(req).proxies == {"all": "http://proxy2"}
+    req = Request(url="/", method="GET")
+    assert downloader._hedge_request_for(req).proxies is None
+
+
+@pytest.mark.anyio
+async def test_downloader_concurrency_budget():
+    downloader = DelayedDownloader(delays=[(0.01,)] * 4, concurrent_requests=2)
+    requests = [
+        Request(url=f"https://example.com/{page}", method="GET") for page in range(4)
+    ]
+    await asyncio.gather(*(downloader.handle_request(request=r) for r in requests))
+    assert len(downloader.sent) == 4
+    assert downloader.max_active == 2
+
+
+@pytest.mark.anyio
+async def test_identical_in_flight_requests_are_coalesced():
+    downloader = DelayedDownloader(delays=[(0.01,)])
+    requests = [Request(url="https://example.com", method="GET") for _ in range(3)]
+    results = await asyncio.gather(
+        *(downloader.handle_request(request=r) for r in requests)
+    )
+    assert len(downloader.sent) == 1
+    assert results[0] is results[1] is results[2]
+    assert not downloader._in_flight
+    for clean_up, _ in results:
+        await clean_up_response(clean_up)
+
+
+@pytest.mark.anyio
+async def test_coalesced_request_cancellation():
+    downloader = DelayedDownloader(delays=[(1,)])
+    requests = [Request(url="https://example.com", method="GET") for _ in range(2)]
+    tasks = [
+        asyncio.ensure_future(downloader.handle_request(request=r)) for r in requests
+    ]
+    await asyncio.sleep(0.01)
+    tasks[0].cancel()
+    await asyncio.sleep(0)
+    assert downloader.active == 1
+    tasks[1].cancel()
+    for task in tasks:
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    await asyncio.sleep(0)
+    assert downloader.active == 0
+    assert not downloader._in_flight
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"method": "POST"}, {"coalesce": False}, {"stream": True}],
+)
+async def test_requests_excluded_from_coalescing(kwargs):
+    downloader = DelayedDownloader(delays=[(0.01,), (0.01,)])
+    kwargs.setdefault("method", "GET")
+    requests = [Request(url="https://example.com", **kwargs) for _ in range(2)]
+    await asyncio.gather(*(downloader.handle_request(request=r) for r in requests))
+    assert len(downloader.sent) == 2
+
+
+@pytest.mark.anyio
+async def test_requests_of_other_sessions_are_not_coalesced(mocked_request):
+    downloader = Downloader()
+
+    async def download(**kwargs):
+        req = mocked_request(url="/cookies", **kwargs)
+        clean_up, response = await downloader.handle_request(request=req)
+        await clean_up_response(clean_up)
+        return response.content
+
+    assert await asyncio.gather(
+        download(cookies={"session": "alice"}), download(cookies={"session": "bob"})
+    ) == [b"session=alice", b"session=bob"]
+
+    delayed = DelayedDownloader(delays=[(0.01,), (0.01,)])
+    requests = [
+        Request(url="https://example.com", method="GET", auth=("user", password))
+        for password in ("alice", "bob")
+    ]
+    await asyncio.gather(*(delayed.handle_request(request=r) for r in requests))
+    assert len(delayed.sent) == 2
+
+
+@pytest.mark.anyio
+async def test_requests_following_redirects_are_not_coalesced(mocked_request):
+    downloader = Downloader()
+    requests = [
+        mocked_request(url="/moved", follow_redirects=follow_redirects)
+        for follow_redirects in (False, True)
+    ]
+    results = await downloader.handle_requests(requests)
+    for clean_up, _ in results:
+        await clean_up_response(clean_up)
+    assert [response.status_code for _, response in results] == [301, 200]
+
+
+@pytest.mark.anyio
+async def test_coalescing_disabled(monkeypatch):
+    monkeypatch.setattr(CONFIGS, "COALESCE_REQUESTS", False)
+    downloader = DelayedDownloader(delays=[(0.01,), (0.01,)])
+    requests = [Request(url="https://example.com", method="GET") for _ in range(2)]
+    await asyncio.gather(*(downloader.handle_request(request=r) for r in requests))
+    assert len(downloader.sent) == 2
+
+
+def breaker_downloader(delays, **kwargs):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05, **kwargs)
+    return DelayedDownloader(delays=delays, circuit_breaker=breaker)
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_drops_requests_to_open_hosts():
+    downloader = breaker_downloader(delays=[(0, True), (0, False, 503)])
+    req = Request(url="https://example.com", method="GET", coalesce=False)
+    assert await downloader.handle_request(request=req) is None
+    await downloader.handle_request(request=req)
+    assert downloader.circuit_breaker.state("example.com") == CircuitState.OPEN
+
+    assert await downloader.handle_request(request=req) is None
+    assert len(downloader.sent) == 2
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_parks_requests_to_open_hosts():
+    downloader = breaker_downloader(delays=[(0, True), (0, True), (0,)])
+    downloader.circuit_breaker_policy = "park"
+    req = Request(url="https://example.com", method="GET", coalesce=False)
+    for _ in range(2):
+        assert await downloader.handle_request(request=req) is None
+
+    clean_up, response = await downloader.handle_request(request=req)
+    assert response.status_code == 200
+    assert downloader.circuit_breaker.state("example.com") == CircuitState.CLOSED
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_park_timeout():
+    downloader = breaker_downloader(delays=[(0, True), (0, True)])
+    downloader.circuit_breaker_policy = "park"
+    downloader.circuit_breaker_park_timeout = 0
+    req = Request(url="https://example.com", method="GET", coalesce=False)
+    for _ in range(2):
+        assert await downloader.handle_request(request=req) is None
+    assert await downloader.handle_request(request=req) is None
+
+
+@pytest.mark.anyio
+async def test_circuit_breaker_counts_http_errors():
+    downloader = breaker_downloader(
+        delays=[(0, httpx.DecodingError("Failed")), (0, httpx.TooManyRedirects(""))]
+    )
+    req = Request(url="https://example.com", method="GET", coalesce=False)
+    for _ in range(2):
+        assert await downloader.handle_request(request=req) is None
+    assert downloader.circuit_breaker.state("example.com") == CircuitState.OPEN
+
+
+@pytest.mark.anyio
+async def test_cancelled_probe_releases_its_slot():
+    downloader = breaker_downloader(delays=[(0, True), (0, True), (1,), (0,)])
+    breaker = downloader.circuit_breaker
+    req = Request(url="https://example.com", method="GET", coalesce=False)
+    for _ in range(2):
+        assert await downloader.handle_request(request=req) is None
+    await asyncio.sleep(breaker.retry_after("example.com"))
+
+    probe = asyncio.ensure_future(downloader.handle_request(request=req))
+    await asyncio.sleep(0.01)
+    assert breaker.circuits["example.com"].probes == 1
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state("example.com") == CircuitState.HALF_OPEN
+    assert breaker.circuits["example.com"].probes == 0
+
+    clean_up, response = await downloader.handle_request(request=req)
+    assert response.status_code == 200
+    assert breaker.state("example.com") == CircuitState.CLOSED
+
+
+def test_circuit_breaker_from_settings(monkeypatch):
+    assert Downloader().circuit_breaker is None
+    monkeypatch.setattr(CONFIGS, "CIRCUIT_BREAKER_FAILURES", 3)
+    breaker = Downloader().circuit_breaker
+    assert breaker.failure_threshold == 3
+    assert breaker.recovery_timeout == CONFIGS.CIRCUIT_BREAKER_RECOVERY_TIMEOUT
+
+
+async def fetch_url(downloader, request):
+    clean_up, response = await downloader.handle_request(request=request)
+    await clean_up_response(clean_up)
+    return response
+
+
+@pytest.mark.anyio
+async def test_permanent_redirects_are_cached(mocked_request):
+    downloader = Downloader()
+    for path in ("/moved", "/found"):
+        response = await fetch_url(
+            downloader, mocked_request(url=path, follow_redirects=True)
+        )
+        assert response.url == "https://scrapyio-example.com/"
+        assert len(response.history) == 1
+    assert downloader.permanent_redirects.targets == {
+        "https://scrapyio-example.com/moved": "https://scrapyio-example.com/"
+    }
+
+    response = await fetch_url(
+        downloader, mocked_request(url="/moved", follow_redirects=True)
+    )
+    assert response.url == "https://scrapyio-example.com/"
+    assert not response.history
+    response = await fetch_url(downloader, mocked_request(url="/found"))
+    assert response.status_code == 302
+
+
+@pytest.mark.anyio
+async def test_permanent_redirects_require_following(mocked_request):
+    downloader = Downloader()
+    response = await fetch_url(downloader, mocked_request(url="/moved"))
+    assert response.status_code == 301
+    assert not downloader.permanent_redirects.targets
+
+    await fetch_url(downloader, mocked_request(url="/moved", follow_redirects=True))
+    assert downloader.permanent_redirects.targets
+    response = await fetch_url(downloader, mocked_request(url="/moved"))
+    assert response.status_code == 301
+
+    response = await fetch_url(
+        downloader, mocked_request(url="/moved", method="POST", follow_redirects=True)
+    )
+    assert response.status_code == 405
+
+
+def test_permanent_redirect_cache():
+    def redirect(status, url, method="GET"):
+        return Response(status, request=httpx.Request(method, url))
+
+    cache = PermanentRedirectCache(max_size=2)
+    response = redirect(200, "https://d.com")
+    response.history = [
+        redirect(301, "https://a.com"),
+        redirect(302, "https://b.com"),
+        redirect(308, "https://c.com", method="POST"),
+    ]
+    cache.record(response)
+    assert cache.targets == {"https://a.com": "https://b.com"}
+
+    for url, target in (("b", "c"), ("c", "a"), ("x", "y")):
+        cache._store(f"https://{url}.com", f"https://{target}.com")
+    assert list(cache.targets) == ["https://c.com", "https://x.com"]
+    cache._store("https://y.com", "https://z.com")
+    assert cache.resolve("https://x.com", max_hops=5) == "https://z.com"
+    assert cache.resolve("https://x.com", max_hops=1) == "https://y.com"
+
+    cache = PermanentRedirectCache(max_size=5)
+    cache._store("https://a.com", "https://b.com")
+    cache._store("https://b.com", "https://a.com")
+    assert cache.resolve("https://a.com", max_hops=5) == "https://b.com"
+
+    cache = PermanentRedirectCache(max_size=0)
+    cache.record(response)
+    assert not cache.targets
+
+
+class EndlessRedirectMiddleWare(BaseMiddleWare):
+    async def process_request(self, request):
+        ...
+
+    async def process_response(self, response):
+        return Request(url="https://example.com", method="GET")
+
+
+@pytest.mark.anyio
+async def test_middleware_redirects_limit(monkeypatch):
+    monkeypatch.setattr(CONFIGS, "MAX_REDIRECTS", 2)
+    downloader = DelayedDownloader(delays=[(0, False, 302)] * 3)
+    downloader.middleware_classes.append(EndlessRedirectMiddleWare)
+    req = Request(url="https://example.com", method="GET")
+    assert await downloader.handle_request(request=req) is None
+    assert len(downloader.sent) == 3
+    assert not downloader.delays
+
+
+@pytest.mark.anyio
+async def test_middleware_retries_limit(monkeypatch):
+    monkeypatch.setattr(CONFIGS, "MAX_REDIRECTS", 0)
+    monkeypatch.setattr(CONFIGS, "MAX_MIDDLEWARE_RETRIES", 2)
+    downloader = DelayedDownloader(delays=[(0,)] * 3)
+    downloader.middleware_classes.append(EndlessRedirectMiddleWare)
+    req = Request(url="https://example.com", method="GET")
+    assert await downloader.handle_request(request=req) is None
+    assert len(downloader.sent) == 3
+    assert not downloader.delays
+
+
+@pytest.mark.anyio
+async def test_proxy_retries_are_not_redirects(monkeypatch):
+    proxies = [f"http://proxy{index}" for index in range(3)]
+    monkeypatch.setattr(CONFIGS, "PROXY_CHAIN", proxies)
+    monkeypatch.setattr(CONFIGS, "MAX_REDIRECTS", 0)
+    downloader = DelayedDownloader(delays=[(0, False, 503), (0, False, 503), (0,)])
+    downloader.middleware_classes = [ProxyMiddleWare]
+    req = Request(url="https://example.com", method="GET")
+    clean_up, response = await downloader.handle_request(request=req)
+    assert response.status_code == 200
+    assert len(downloader.sent) == 3
+
+
+class BatchMiddleWare(BaseMiddleWare):
+    batches: typing.List[typing.List[str]] = []
+
+    async def process_request(self, request):
+        ...
+
+    async def process_response(self, response):
+        ...
+
+    async def process_requests(self, requests):
+        self.batches.append([request.url for request in requests])
+        return [
+            None if request.url.endswith("/drop") else request for request in requests
+        ]
+
+
+class InvalidBatchMiddleWare(BatchMiddleWare):
+    async def process_requests(self, requests):
+        return requests[1:]
+
+
+@pytest.mark.anyio
+async def test_downloader_batch_handling():
+    downloader = DelayedDownloader(delays=[(0,), (0,)])
+    downloader.middleware_classes.extend([BatchMiddleWare, BatchMiddleWare])
+    requests = [
+        Request(url="https://example.com/drop", method="GET"),
+        Request(url="https://example.com/a", method="GET"),
+        Request(url="https://example.com/b", method="GET"),
+    ]
+    dropped, first, second = await downloader.handle_requests(requests=requests)
+    assert dropped is None
+    assert first[1].url == "https://example.com/a"
+    assert second[1].url == "https://example.com/b"
+    assert BatchMiddleWare.batches == [
+        [request.url for request in requests],
+        ["https://example.com/a", "https://example.com/b"],
+    ]
+
+    BatchMiddleWare.batches.clear()
+    assert await downloader.handle_requests(requests=requests[:1]) == [None]
+    assert len(BatchMiddleWare.batches) == 1
+
+
+@pytest.mark.anyio
+async def test_downloader_batch_handling_failures():
+    downloader = DelayedDownloader(delays=[(0.01, True), (0,), (1,)])
+    requests = [
+        Request(url="https://example.com/a", method="GET"),
+        Request(url="https://example.com/b", method="GET"),
+        Request(url="https://example.com/c", method="GET"),
+    ]
+    with pytest.raises(httpx.ConnectError):
+        await downloader.handle_requests(requests=requests)
+    assert downloader.active == 0
+
+    downloader.middleware_classes.extend([ProxyMiddleWare, InvalidBatchMiddleWare])
+    with pytest.raises(TypeError, match="aligned with the given requests"):
+        await downloader.handle_requests(requests=requests)
@@ -91,3 +91,11 @@ async def test_proxy_middleware_success_response_processing_with_proxy(
     await proxy.process_request(request=req)
     next_request = await proxy.process_response(response=response)
     assert next_request
+
+
+@pytest.mark.anyio
+async def test_default_batch_processing(mocked_request):
+    requests = [mocked_request(url="/"), mocked_request(url="/other")]
+    processed = await ProxyMiddleWare().process_requests(requests=requests)
+    assert processed == requests
+    assert processed is not requests
@@ -4,14 +4,16 @@ These tests ensure that the `engine` object, which
 is in charge of the entire scrapyio lifecycle, performs as expected.
 """
 
-from contextlib import suppress
 
 import pytest
 
-from scrapyio.downloader import SessionDownloader
+from scrapyio import Request
+from scrapyio.breakers import CircuitBreaker, CircuitState
+from scrapyio.downloader import Downloader, SessionDownloader
 from scrapyio.engines import Engine
 from scrapyio.exceptions import InvalidParseMethodException, InvalidYieldValueException
 from scrapyio.http import clean_up_response
+from scrapyio.item_loaders import BaseLoader
 from scrapyio.items import Item, ItemManager
 from scrapyio.spider import BaseSpider
 
@@ -31,20 +33,6 @@ def test_engine_downloader_explicit_setting(monkeypatch):
     assert isinstance(engine.downloader, SessionDownloader)
 
 
-@pytest.mark.anyio
-async def test_engine_single_request_handling(mocked_request):
-    req = mocked_request(url="/")
-    engine = Engine(spider=TestSpider())
-    try:
-        clean_up, response = await engine._send_single_request_to_downloader(
-            request=req
-        )
-        assert response.is_success
-    finally:
-        with suppress(StopAsyncIteration):
-            await clean_up.__anext__()
-
-
 @pytest.mark.anyio
 async def test_invalid_response_parsing_exception(mocked_response, monkeypatch):
     monkeypatch.setattr(TestSpider, "parse", lambda: ...)
@@ -99,6 +87,29 @@ async def test_engine_response_parse_item_yielding(mocked_response, monkeypatch)
     assert len(engine.spider.items) == 1
 
 
+@pytest.mark.anyio
+async def test_engine_streams_items_to_manager(
+    mocked_response, mocked_request, monkeypatch
+):
+    async def parse(self, response):
+        yield Item()
+        yield Item()
+
+    monkeypatch.setattr(TestSpider, "parse", parse)
+    items_manager = ItemManager()
+    engine = Engine(spider=TestSpider(), items_manager=items_manager)
+    await engine._handle_single_response(response_and_generator=mocked_response)
+    assert not engine.spider.items
+    assert items_manager.worker_tasks
+
+    engine.spider.items.append(Item())
+    engine.spider.requests.append(mocked_request(url="/"))
+    await engine._run_once()
+    assert not engine.spider.items
+    await engine._tear_down()
+    assert not items_manager.worker_tasks
+
+
 @pytest.mark.anyio
 async def test_engine_responses_handling(mocked_response, mocked_response1):
     engine = Engine(spider=TestSpider())
@@ -145,8 +156,69 @@ async def test_engine_run(mocked_request, monkeypatch):
     await engine.run()
 
 
+class CountingLoader(BaseLoader):
+    def __init__(self):
+        self.opened = 0
+        self.items = []
+
+    async def open(self):
+        self.opened += 1
+
+    async def dump(self, item):
+        ...  # pragma: no cover
+
+    async def dump_many(self, items):
+        self.items.extend(items)
+
+    async def close(self):
+        ...
+
+
+@pytest.mark.integtest
+@pytest.mark.anyio
+async def test_engine_opens_loaders_once(mocked_request, monkeypatch):
+    async def parse(self, response):
+        yield Item()
+        if len(self.seen) < 3:
+            self.seen.append(response)
+            yield mocked_request(url="/")
+
+    monkeypatch.setattr(TestSpider, "start_requests", [mocked_request(url="/")])
+    monkeypatch.setattr(TestSpider, "parse", parse)
+    monkeypatch.setattr(TestSpider, "seen", [], raising=False)
+    loader = CountingLoader()
+    engine = Engine(spider=TestSpider(), items_manager=ItemManager(loaders=[loader]))
+    await engine.run()
+    assert loader.opened == 1
+    assert len(loader.items) == 4
+
+
 @pytest.mark.integtest
 @pytest.mark.anyio
 async def test_engine_tear_down(mocked_request, monkeypatch):
     engine = Engine(spider=TestSpider(), items_manager=ItemManager())
     await engine._tear_down()
+
+
+@pytest.mark.integtest
+@pytest.mark.anyio
+async def test_engine_run_with_dead_host(mocked_request, monkeypatch):
+    # Nothing listens on the port, connecting to it is refused
+    dead = [
+        Request(url="http://127.0.0.1:1/", method="GET", coalesce=False)
+        for _ in range(3)
+    ]
+
+    async def parse(self, response):
+        self.parsed.append(str(response.url))
+        yield dead[0]
+
+    monkeypatch.setattr(TestSpider, "start_requests", [*dead, mocked_request(url="/")])
+    monkeypatch.setattr(TestSpider, "parse", parse)
+    monkeypatch.setattr(TestSpider, "parsed", [], raising=False)
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+    engine = Engine(spider=TestSpider(), downloader=Downloader(circuit_breaker=breaker))
+    await engine.run()
+    assert engine.spider.parsed == ["https://scrapyio-example.com/"]
+    assert breaker.state("127.0.0.1") == CircuitState.OPEN
+    assert not engine.spider.requests
@@ -3,10 +3,19 @@ This module contains the scrapyio 'Request' creation
 tests, which ensure that the 'Request' creation and
 configuration overriding functions as expected.
 """
+import copy
+import pickle
 
+import httpx
 import pytest
 
-from scrapyio.http import Request, clean_up_response
+from scrapyio.http import (
+    Request,
+    clean_up_response,
+    request_defaults,
+    request_fingerprint,
+    request_host,
+)
 from scrapyio.settings import CONFIGS
 
 
@@ -25,6 +34,115 @@ def test_request_default_configs(monkeypatch):
     assert req1.proxies == {"http": "..."}
 
 
+def test_request_stores_only_overrides():
+    req = Request(url="...", method="GET", proxies=None, stream=True)
+    assert not hasattr(req, "__dict__")
+    assert req.overrides() == {"proxies": None, "stream": True}
+    assert req.timeout is request_defaults().timeout
+    assert req.verify == CONFIGS.DEFAULT_VERIFY_SSL
+
+    req.verify = False
+    assert req.overrides()["verify"] is False
+    del req.verify
+    assert req.verify == CONFIGS.DEFAULT_VERIFY_SSL
+
+    with pytest.raises(AttributeError, match="no attribute 'unknown'"):
+        req.unknown
+
+
+def test_request_optional_fields_order():
+    values = {name: object() for name in Request.optional_fields}
+    req = Request(url="...", method="GET", **values)
+    for name, value in values.items():
+        assert getattr(req, name) is value
+
+
+def test_request_defaults_are_shared(monkeypatch):
+    defaults = request_defaults()
+    assert request_defaults() is defaults
+    monkeypatch.setattr(CONFIGS, "REQUEST_TIMEOUT", 10)
+    assert request_defaults() is not defaults
+    assert Request(url="...", method="GET").timeout.read == 10
+
+
+def test_request_ids():
+    req1 = Request(url="...", method="GET")
+    req2 = Request(url="...", method="GET")
+    assert req2.id > req1.id
+    assert Request(url="...", method="GET", id=1).id == 1
+
+
+def test_request_copying():
+    req = Request(url="...", method="GET", headers={"a": "b"})
+    copied = req.copy(url="changed")
+    assert copied.url == "changed"
+    assert copied.id == req.id
+    assert copied.headers == {"a": "b"}
+    assert copy.copy(req) == req
+    assert copy.copy(req) is not req
+
+
+def test_request_pickling():
+    req = Request(url="...", method="GET", params={"a": "b"})
+    loaded = pickle.loads(pickle.dumps(req))
+    assert loaded == req
+    assert loaded.overrides() == {"params": {"a": "b"}}
+
+
+def test_request_equality_and_repr():
+    req = Request(url="...", method="GET", id=1)
+    assert req == Request(url="...", method="GET", id=1)
+    assert req != Request(url="...", method="POST", id=1)
+    assert req != object()
+    assert repr(req).startswith("Request(url='...', method='GET', id=1, auth=None")
+
+
+def test_request_host():
+    assert request_host(Request(url="https://example.com/a", method="GET")) == (
+        "example.com"
+    )
+    req = Request(url="/a", method="GET", base_url="https://example.com")
+    assert request_host(req) == "example.com"
+
+
+def test_request_fingerprint():
+    def fingerprint(**kwargs):
+        kwargs.setdefault("url", "https://example.com/a")
+        kwargs.setdefault("method", "GET")
+        return request_fingerprint(Request(**kwargs))
+
+    assert fingerprint() == fingerprint(method="get")
+    assert fingerprint() == fingerprint(url="/a", base_url="https://example.com")
+    assert fingerprint() != fingerprint(method="POST")
+    assert fingerprint(params={"a": "1"}) == fingerprint(
+        url="https://example.com/a?a=1"
+    )
+    assert fingerprint(headers={"a": "1", "b": "2"}) == fingerprint(
+        headers={"B": "2", "a": "1"}
+    )
+    assert fingerprint(content="body") == fingerprint(content=b"body")
+    assert fingerprint(data={"a": 1, "b": 2}) == fingerprint(data={"b": 2, "a": 1})
+    assert fingerprint(json={"a": 1}) != fingerprint(json={"a": 2})
+    assert fingerprint(files={"file": b"..."}) is None
+    assert fingerprint(content=iter([b"..."])) is None
+
+    assert fingerprint(cookies={"s": "a"}) != fingerprint(cookies={"s": "b"})
+    assert fingerprint(cookies={"s": "a", "t": "b"}) == fingerprint(
+        cookies={"t": "b", "s": "a"}
+    )
+    assert fingerprint(auth=("user", "a")) != fingerprint(auth=("user", "b"))
+    assert fingerprint(proxies="http://proxy1") != fingerprint(proxies="http://proxy2")
+    assert fingerprint(verify=False) != fingerprint(verify=True)
+    assert fingerprint(cert="a.pem") != fingerprint(cert="b.pem")
+    assert fingerprint(app=lambda: ...) != fingerprint(app=lambda: ...)
+    assert fingerprint(follow_redirects=True) != fingerprint(follow_redirects=False)
+    assert fingerprint(trust_env=True) != fingerprint(trust_env=False)
+    assert fingerprint(http2=True) != fingerprint(http2=False)
+    assert fingerprint(timeout=1) != fingerprint(timeout=httpx.Timeout(5))
+    assert fingerprint(cookies=httpx.Cookies({"s": "a"})) is None
+    assert fingerprint(auth=httpx.BasicAuth("user", "a")) is None
+
+
 @pytest.mark.anyio
 async def test_request_clean_up():
     success = False
@@ -4,9 +4,13 @@ These tests ensure that item management and
 item middlewares function as expected.
 """
 
+import asyncio
 import builtins
+import enum
 import importlib
+import os
 import tempfile
+import time
 
 import orjson
 import pytest
@@ -14,8 +18,21 @@ from pydantic import BaseModel
 
 from scrapyio import items
 from scrapyio.exceptions import IgnoreItemException
-from scrapyio.item_loaders import JSONLoader, ProxyLoader
-from scrapyio.item_middlewares import BaseItemMiddleWare
+from scrapyio.item_loaders import (
+    BaseLoader,
+    JSONLoader,
+    LoaderState,
+    LoaderWriter,
+    ProxyLoader,
+)
+from scrapyio.item_middlewares import (
+    BaseItemMiddleWare,
+    BloomFingerprints,
+    DeduplicationMiddleWare,
+    MemoizedChecks,
+    item_fingerprint,
+    memoize,
+)
 from scrapyio.items import (
     Item,
     ItemManager,
@@ -29,6 +46,19 @@ class TestItem(BaseModel):
     num: int
 
 
+class Kind(str, enum.Enum):
+    PAGE = "page"
+
+
+class SerializedItem(Item):
+    num: int
+
+
+class SpilledItem(Item):
+    num: int
+    kind: Kind = Kind.PAGE
+
+
 class TestMiddleWare:
     ...
 
@@ -43,6 +73,17 @@ class TestIgnoreItemMiddleWare(BaseItemMiddleWare):
         raise IgnoreItemException()
 
 
+class EvenItemsMiddleWare(BaseItemMiddleWare):
+    batches: list = []
+
+    async def process_item(self, item: Item):
+        ...  # pragma: no cover
+
+    async def process_items(self, items):
+        self.batches.append(len(items))
+        return [item for item in items if item.num % 2 == 0]
+
+
 def test_build_items_middleware(monkeypatch):
     monkeypatch.setattr(
         CONFIGS,
@@ -79,8 +120,14 @@ def test_item_without_orjson(monkeypatch):
             raise ImportError
         return original_import(name, *args, **kwargs)
 
+    # The reloaded module gets new classes, the other tests keep using
+    # the original ones, so they are put back once the reload is checked
+    namespace = vars(items).copy()
     monkeypatch.setattr(builtins, "__import__", mocked_import)
-    importlib.reload(items)
+    try:
+        importlib.reload(items)
+    finally:
+        vars(items).update(namespace)
 
 
 @pytest.mark.anyio
@@ -172,3 +219,550 @@ async def test_item_manager_handling():
     items = [TestItem(num=2), TestItem(num=2)]
     manager = ItemManager(loaders=[JSONLoader(filename=f1), JSONLoader(filename=f2)])
     await manager.process_items(items)
+
+
+class RecordingLoader(BaseLoader):
+    def __init__(self):
+        self.batches = []
+
+    async def open(self):
+        ...
+
+    async def dump(self, item):
+        ...  # pragma: no cover
+
+    async def dump_many(self, items):
+        self.batches.append(list(items))
+
+    async def close(self):
+        ...
+
+
+class FailingLoader(RecordingLoader):
+    async def dump_many(self, items):
+        raise ValueError("Loading failed")
+
+
+class SlowLoader(RecordingLoader):
+    def __init__(self):
+        super().__init__()
+        self.released = asyncio.Event()
+
+    async def dump_many(self, items):
+        await self.released.wait()
+        await super().dump_many(items)
+
+
+class BlockingItemMiddleWare(BaseItemMiddleWare):
+    released = asyncio.Event()
+
+    async def process_item(self, item):
+        await self.released.wait()
+        if item.num < 0:
+            raise ValueError("Processing failed")
+        if item.num == 0:
+            raise IgnoreItemException()
+
+
+@pytest.mark.anyio
+async def test_item_manager_streaming():
+    loader = RecordingLoader()
+    manager = ItemManager(loaders=[loader])
+    for num in range(10):
+        await manager.put(TestItem(num=num))
+    await manager.join()
+    assert [item.num for batch in loader.batches for item in batch] == list(range(10))
+    assert manager.loaders[0].state == LoaderState.DUMPING
+    await manager.tear_down_loaders()
+    assert not manager.worker_tasks
+
+
+@pytest.mark.anyio
+async def test_item_manager_streaming_backpressure(monkeypatch):
+    monkeypatch.setattr(
+        CONFIGS, "ITEM_MIDDLEWARES", ["tests.test_items.BlockingItemMiddleWare"]
+    )
+    BlockingItemMiddleWare.released = asyncio.Event()
+    loader = RecordingLoader()
+    manager = ItemManager(loaders=[loader], queue_size=1, workers=1)
+    await manager.put(TestItem(num=1))
+    await manager.put(TestItem(num=2))
+    blocked_put = asyncio.create_task(manager.put(TestItem(num=0)))
+    await asyncio.sleep(0.01)
+    assert not blocked_put.done()
+
+    BlockingItemMiddleWare.released.set()
+    await blocked_put
+    await manager.stop()
+    assert [item.num for batch in loader.batches for item in batch] == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_item_manager_streaming_failures(monkeypatch):
+    monkeypatch.setattr(
+        CONFIGS, "ITEM_MIDDLEWARES", ["tests.test_items.BlockingItemMiddleWare"]
+    )
+    BlockingItemMiddleWare.released = asyncio.Event()
+    BlockingItemMiddleWare.released.set()
+    manager = ItemManager(loaders=[RecordingLoader()])
+    await manager.put(TestItem(num=-1))
+    with pytest.raises(ValueError, match="Processing failed"):
+        await manager.join()
+
+    await manager.stop()
+    manager.loaders = [ProxyLoader(FailingLoader())]
+    await manager.put(TestItem(num=1))
+    await asyncio.sleep(0.01)
+    with pytest.raises(ValueError, match="Loading failed"):
+        await manager.put(TestItem(num=1))
+    await manager.stop()
+
+
+@pytest.mark.anyio
+async def test_item_manager_independent_loaders():
+    fast, slow = RecordingLoader(), SlowLoader()
+    manager = ItemManager(loaders=[fast, slow], loader_queue_size=100)
+    for num in range(5):
+        await manager.put(TestItem(num=num))
+    await manager.items_queue.join()
+    await manager.writers[0].join()
+    assert [item.num for batch in fast.batches for item in batch] == list(range(5))
+    assert not slow.batches
+
+    stats = manager.loaders_stats()
+    assert list(stats) == ["0:RecordingLoader", "1:SlowLoader"]
+    assert stats["0:RecordingLoader"].written == 5
+    assert stats["0:RecordingLoader"].throughput > 0
+    assert stats["1:SlowLoader"].lag == 5
+    assert stats["1:SlowLoader"].throughput == 0
+
+    slow.released.set()
+    await manager.stop()
+    assert [item.num for batch in slow.batches for item in batch] == list(range(5))
+    assert stats["1:SlowLoader"].written == 5
+    assert stats["1:SlowLoader"].lag == 0
+
+
+@pytest.mark.anyio
+async def test_loader_writer_overflow_policies():
+    slow = SlowLoader()
+    writer = LoaderWriter(ProxyLoader(slow), queue_size=1, overflow_policy="drop")
+    writer.start()
+    await writer.put(SerializedItem(num=0))
+    await asyncio.sleep(0.01)
+    for num in range(1, 4):
+        await writer.put(SerializedItem(num=num))
+    slow.released.set()
+    await writer.join()
+    await writer.put(SerializedItem(num=4))
+    await writer.join()
+    assert [item.num for batch in slow.batches for item in batch] == [0, 1, 4]
+    assert writer.stats.dropped == 2
+    await writer.stop()
+
+    slow = SlowLoader()
+    writer = LoaderWriter(
+        ProxyLoader(slow), queue_size=1, overflow_policy="spill", batch_size=2
+    )
+    writer.start()
+    await writer.put(SpilledItem(num=0))
+    await asyncio.sleep(0.01)
+    for num in range(1, 6):
+        await writer.put(SpilledItem(num=num))
+    assert writer.stats.spilled == 4
+    assert writer.stats.lag == 6
+    slow.released.set()
+    await writer.join()
+    assert [[item.num for item in batch] for batch in slow.batches] == [
+        [0],
+        [1],
+        [2, 3],
+        [4, 5],
+    ]
+    # The spilled items come back as they were put
+    assert all(item.kind is Kind.PAGE for batch in slow.batches for item in batch)
+    assert writer.stats.dropped == 0
+    assert writer.stats.batches == 4
+
+    await writer.put(SerializedItem(num=6))
+    await writer.join()
+    await writer.stop()
+    assert slow.batches[-1][0].num == 6
+
+
+@pytest.mark.anyio
+async def test_loader_writer_blocks_for_unspillable_items(caplog):
+    class LocalItem(Item):
+        num: int
+
+    slow = SlowLoader()
+    writer = LoaderWriter(ProxyLoader(slow), queue_size=1, overflow_policy="spill")
+    writer.start()
+    await writer.put(SpilledItem(num=0))
+    await asyncio.sleep(0.01)
+    await writer.put(SpilledItem(num=1))
+    await writer.put(SpilledItem(num=2))
+    blocked = asyncio.ensure_future(writer.put(LocalItem(num=3)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert "cannot be spilled" in caplog.text
+    slow.released.set()
+    await blocked
+    await writer.join()
+    assert [item.num for batch in slow.batches for item in batch] == [0, 1, 2, 3]
+    assert writer.stats.spilled == 1
+    await writer.stop()
+
+
+@pytest.mark.anyio
+async def test_loader_writer_spill_read_failures(monkeypatch):
+    def broken_loads_item(data):
+        raise ValueError("Broken record")
+
+    monkeypatch.setattr("scrapyio.item_loaders.loads_item", broken_loads_item)
+    slow = SlowLoader()
+    writer = LoaderWriter(ProxyLoader(slow), queue_size=1, overflow_policy="spill")
+    writer.start()
+    await writer.put(SpilledItem(num=0))
+    await asyncio.sleep(0.01)
+    for num in range(1, 4):
+        await writer.put(SpilledItem(num=num))
+    slow.released.set()
+    await writer.join()
+    assert [item.num for batch in slow.batches for item in batch] == [0, 1]
+    assert writer.stats.failed == 2
+    assert isinstance(writer.failure, ValueError)
+
+    await writer.put(SpilledItem(num=4))
+    await writer.join()
+    assert slow.batches[-1][0].num == 4
+    await writer.stop()
+
+
+def test_loader_writer_unknown_policy():
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        LoaderWriter(ProxyLoader(RecordingLoader()), overflow_policy="...")
+
+
+@pytest.mark.anyio
+async def test_item_manager_batch_middlewares(monkeypatch):
+    monkeypatch.setattr(
+        CONFIGS,
+        "ITEM_MIDDLEWARES",
+        [
+            "tests.test_items.EvenItemsMiddleWare",
+            "tests.test_items.TestItemMiddleWare",
+        ],
+    )
+    ignored = []
+
+    async def ignoring_callback(item, middleware):
+        ignored.append((item.num, middleware.__class__.__name__))
+
+    EvenItemsMiddleWare.batches = []
+    loader = RecordingLoader()
+    manager = ItemManager(loaders=[loader], ignoring_callback=ignoring_callback)
+    filtered = await manager._send_items_via_middlewares(
+        [TestItem(num=num) for num in range(5)]
+    )
+    assert [item.num for item in filtered] == [0, 2, 4]
+    assert ignored == [(1, "EvenItemsMiddleWare"), (3, "EvenItemsMiddleWare")]
+    assert await manager._send_single_item_via_middlewares(TestItem(num=1)) is None
+
+    for num in range(6, 10):
+        await manager.put(TestItem(num=num))
+    await manager.stop()
+    assert EvenItemsMiddleWare.batches == [5, 1, 4]
+    assert [item.num for batch in loader.batches for item in batch] == [0, 2, 4, 6, 8]
+
+
+class ConcurrencyItemMiddleWare(BaseItemMiddleWare):
+    concurrency = 2
+
+    def __init__(self):
+        self.running = self.max_running = 0
+
+    async def process_item(self, item):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+
+
+@pytest.mark.anyio
+async def test_item_middlewares_concurrency(monkeypatch):
+    monkeypatch.setattr(
+        CONFIGS,
+        "ITEM_MIDDLEWARES",
+        [
+            "tests.test_items.ConcurrencyItemMiddleWare",
+            "tests.test_items.TestItemMiddleWare",
+        ],
+    )
+    monkeypatch.setattr(CONFIGS, "ITEM_MIDDLEWARES_CONCURRENCY", 3)
+    manager = ItemManager()
+    await manager._send_items_via_middlewares([TestItem(num=n) for n in range(10)])
+    limited, default = manager.middlewares
+    assert limited.max_running == 2
+    assert default._semaphore._value == 3
+
+
+class SharedResource:
+    created: list = []
+
+    def __init__(self):
+        self.closed = False
+        self.created.append(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class ResourceItemMiddleWare(BaseItemMiddleWare):
+    async def process_item(self, item):
+        assert isinstance(self.resources["shared"], SharedResource)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.anyio
+async def test_item_middlewares_resources(monkeypatch):
+    monkeypatch.setattr(
+        CONFIGS,
+        "ITEM_MIDDLEWARES",
+        [
+            "tests.test_items.ResourceItemMiddleWare",
+            "tests.test_items.TestItemMiddleWare",
+        ],
+    )
+    monkeypatch.setattr(
+        CONFIGS,
+        "ITEM_MIDDLEWARE_RESOURCES",
+        {
+            "shared": "tests.test_items.SharedResource",
+            "plain": "builtins.object",
+            "passed": "tests.test_items.SharedResource",
+        },
+    )
+    SharedResource.created = []
+    passed = SharedResource()
+    manager = ItemManager(resources={"passed": passed})
+    await manager.tear_down_middlewares()
+    await manager.set_up_middlewares()
+    await manager.set_up_middlewares()
+    assert await manager._send_single_item_via_middlewares(TestItem(num=1))
+
+    shared = manager.resources["shared"]
+    assert SharedResource.created == [passed, shared]
+    assert manager.middlewares[1].resources is manager.resources
+    await manager.tear_down_middlewares()
+    assert manager.middlewares[0].closed
+    assert shared.closed
+    assert not passed.closed
+
+
+class EvenItemMiddleWare(BaseItemMiddleWare):
+    """Keeps the items with even keys"""
+
+    def __init__(self):
+        self.checked = []
+
+    async def process_item(self, item):
+        self.checked.append(item.num)
+        await asyncio.sleep(0.001)
+        if item.num < 0:
+            raise ValueError("Check failed")
+        if item.num % 2:
+            raise IgnoreItemException()
+
+
+MemoizedItemMiddleWare = memoize(key=lambda item: item.num % 3, max_size=2)(
+    EvenItemMiddleWare
+)
+
+
+@pytest.mark.anyio
+async def test_memoized_item_middleware():
+    middleware = MemoizedItemMiddleWare()
+    assert MemoizedItemMiddleWare.__name__ == "EvenItemMiddleWare"
+    assert MemoizedItemMiddleWare.__doc__ == "Keeps the items with even keys"
+
+    kept = await middleware.process_items([TestItem(num=num) for num in range(6)])
+    # Items with the same key are checked once, even when checked concurrently
+    assert middleware.checked == [0, 1, 2]
+    assert [item.num for item in kept] == [0, 2, 3, 5]
+    checks = middleware.checks
+    assert (checks.hits, checks.misses) == (3, 3)
+    # Only the two most recently used keys are kept
+    assert list(checks.results) == [1, 2]
+    assert not checks.pending
+
+    await middleware.process_items([TestItem(num=6)])
+    assert middleware.checked == [0, 1, 2, 6]
+    await middleware.close()
+
+    with pytest.raises(ValueError, match="Check failed"):
+        await middleware.process_items([TestItem(num=-2), TestItem(num=7)])
+    assert not checks.pending
+
+    check = asyncio.create_task(middleware.process_item(TestItem(num=4)))
+    await asyncio.sleep(0)
+    check.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await check
+    assert not checks.pending
+
+
+@pytest.mark.anyio
+async def test_memoized_checks_ttl_and_persistence(monkeypatch):
+    path = tempfile.mktemp()
+    now = 1000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+
+    checks = MemoizedChecks(ttl=10, path=path)
+    checks.load()
+    checks.set("kept", True)
+    checks.set("ignored", False)
+    assert checks.get("kept") is True
+    assert checks.get("missing") is None
+    checks.save()
+
+    loaded = MemoizedChecks(ttl=10, path=path)
+    loaded.load()
+    assert loaded.get("ignored") is False
+
+    now = 1005.0
+    loaded.set("kept", True)
+    now = 1010.0
+    loaded.save()
+    loaded = MemoizedChecks(path=path)
+    loaded.load()
+    assert list(loaded.results) == ["kept"]
+    now = 1015.0
+    assert loaded.get("kept") is None
+    assert not loaded.results
+
+
+@pytest.mark.anyio
+async def test_memoized_item_middleware_persistence():
+    path = tempfile.mktemp()
+
+    @memoize(key=lambda item: item.num, path=path)
+    class PersistedItemMiddleWare(EvenItemMiddleWare):
+        ...
+
+    with pytest.raises(TypeError, match="already memoized"):
+        memoize(key=lambda item: item.num)(PersistedItemMiddleWare)
+
+    middleware = PersistedItemMiddleWare()
+    await middleware.open(resources={})
+    await middleware.process_items([TestItem(num=1), TestItem(num=2)])
+    await middleware.close()
+
+    middleware = PersistedItemMiddleWare()
+    await middleware.open(resources={})
+    kept = await middleware.process_items([TestItem(num=1), TestItem(num=2)])
+    assert [item.num for item in kept] == [2]
+    assert middleware.checked == []
+
+
+class ProxyItem(Item):
+    ip: str
+    port: int
+    checked: bool = False
+
+
+@pytest.mark.parametrize("mode", ["exact", "bloom", "disk"])
+@pytest.mark.anyio
+async def test_deduplication_middleware(mode):
+    middleware = DeduplicationMiddleWare(
+        mode=mode, fields={"ProxyItem": ["ip", "port"]}, capacity=1000
+    )
+    await middleware.open(resources={})
+    items = [
+        ProxyItem(ip="1.1.1.1", port=80),
+        ProxyItem(ip="1.1.1.1", port=80, checked=True),
+        ProxyItem(ip="1.1.1.1", port=8080),
+        SerializedItem(num=1),
+        SerializedItem(num=1),
+        TestItem(num=1),
+    ]
+    kept = await middleware.process_items(items)
+    assert kept == [items[0], items[2], items[3], items[5]]
+
+    await middleware.process_item(SerializedItem(num=2))
+    with pytest.raises(IgnoreItemException):
+        await middleware.process_item(ProxyItem(ip="1.1.1.1", port=8080))
+    assert middleware.duplicates == 3
+    await middleware.close()
+    assert middleware.fingerprints is None
+
+
+@pytest.mark.anyio
+async def test_deduplication_middleware_on_disk(monkeypatch):
+    path = tempfile.mktemp()
+    monkeypatch.setattr(CONFIGS, "ITEM_DEDUPLICATION_MODE", "disk")
+    monkeypatch.setattr(CONFIGS, "ITEM_DEDUPLICATION_PATH", path)
+    middleware = DeduplicationMiddleWare()
+    assert await middleware.process_items([SerializedItem(num=1)])
+    await middleware.close()
+
+    # The seen items are kept between runs
+    middleware = DeduplicationMiddleWare()
+    assert not await middleware.process_items([SerializedItem(num=1)])
+    await middleware.close()
+    assert os.path.exists(path)
+
+    monkeypatch.setattr(CONFIGS, "ITEM_DEDUPLICATION_PATH", None)
+    middleware = DeduplicationMiddleWare()
+    await middleware.process_items([SerializedItem(num=1)])
+    fingerprints = middleware.fingerprints
+    await middleware.close()
+    assert not os.path.exists(fingerprints.path)
+
+
+def test_bloom_fingerprints():
+    bloom = BloomFingerprints(capacity=1000, error_rate=0.01)
+    assert bloom.hashes == 7
+    fingerprints = [item_fingerprint(SerializedItem(num=num)) for num in range(1000)]
+    # Up to the capacity new items are rarely taken for duplicates
+    assert bloom.add_many(fingerprints).count(False) < 20
+    assert not any(bloom.add_many(fingerprints))
+
+
+def test_deduplication_unknown_mode():
+    with pytest.raises(ValueError, match="Unknown deduplication mode"):
+        DeduplicationMiddleWare(mode="...")
+
+
+class TrustedItem(Item):
+    num: int
+    tags: list = []
+
+    class Config:
+        trusted = True
+
+
+def test_trusted_items_skip_validation():
+    item = TrustedItem(num="1")
+    assert item.num == "1"
+    assert item.tags == []
+    assert item.__fields_set__ == {"num"}
+    assert SerializedItem(num="1").num == 1
+
+
+def test_items_serialize_once():
+    item = SerializedItem(num=1)
+    serialized = item.json_bytes()
+    assert serialized == b'{"num":1}'
+    assert item.json_bytes() is serialized
+    assert item.cached_dict() is item.cached_dict()
+
+    copied = item.copy(update={"num": 2})
+    assert copied.json_bytes() == b'{"num":2}'
+    assert copied.cached_dict() == {"num": 2}
+
+    item.num = 3
+    assert item.json_bytes() == b'{"num":3}'
+    assert item.cached_dict() == {"num": 3}
@@ -5,23 +5,34 @@ or relational database. These tests ensure that the
 dumping process works properly.
 """
 
+import asyncio
 import datetime
+import decimal
+import enum
+import gzip
+import json
 import tempfile
+import typing
 import warnings
 from pathlib import Path
 
 import pytest
-from pydantic import BaseModel
+import zstandard
+from pydantic import BaseModel, Field
 
+from scrapyio import item_loaders
 from scrapyio.item_loaders import (
     BaseLoader,
     CSVLoader,
+    JSONLinesLoader,
     JSONLoader,
     LoaderState,
+    ParquetLoader,
     ProxyLoader,
     SQLAlchemyLoader,
 )
 from scrapyio.items import Item
+from scrapyio.settings import CONFIGS
 
 
 class FakeLoader:
@@ -139,28 +150,31 @@ async def test_proxy_loader_opening_closed():
         await proxy_loader.open()
 
 
+def read_file(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
 @pytest.mark.anyio
 async def test_json_loader_open():
     path = tempfile.mktemp()
     loader = JSONLoader(filename=path)
     try:
         await loader.open()
+        assert read_file(path) == ""
+        await loader.file.flush()
+        assert read_file(path) == "[\n"
     finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == "[\n"
+        await loader.file.close()
 
 
 @pytest.mark.anyio
 async def test_json_loader_close():
     path = tempfile.mktemp()
     loader = JSONLoader(filename=path)
-    try:
-        loader.file = open(path, "w")
-    finally:
-        await loader.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == "\n]"
+    await loader.open()
+    await loader.close()
+    assert read_file(path) == "[\n\n]"
 
 
 @pytest.mark.anyio
@@ -169,12 +183,11 @@ async def test_json_loader_dump_first_item():
     path = tempfile.mktemp()
     loader = JSONLoader(filename=path)
     try:
-        loader.file = open(path, "w")
+        await loader.open()
         await loader.dump(item=item)
     finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == '{"best_scraping_library": "scrapyio"}'
+        await loader.close()
+        assert read_file(path) == '[\n{"best_scraping_library":"scrapyio"}\n]'
 
 
 @pytest.mark.anyio
@@ -183,13 +196,16 @@ async def test_json_loader_dump_not_first_item():
     path = tempfile.mktemp()
     loader = JSONLoader(filename=path)
     try:
-        loader.file = open(path, "w")
-        loader.first_item = False
+        await loader.open()
+        await loader.dump(item=item)
+        await loader.dump_many([])
         await loader.dump(item=item)
     finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == ',\n{"best_scraping_library": "scrapyio"}'
+        await loader.close()
+        assert read_file(path) == (
+            '[\n{"best_scraping_library":"scrapyio"},'
+            '\n{"best_scraping_library":"scrapyio"}\n]'
+        )
 
 
 @pytest.mark.anyio
@@ -199,9 +215,8 @@ async def test_csv_loader_open():
     try:
         await loader.open()
     finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == ""
+        await loader.file.close()
+        assert read_file(path) == ""
 
 
 @pytest.mark.anyio
@@ -212,8 +227,7 @@ async def test_csv_loader_close():
         await loader.open()
     finally:
         await loader.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == ""
+        assert read_file(path) == ""
 
 
 @pytest.mark.anyio
@@ -222,31 +236,116 @@ async def test_csv_loader_dump_first_item():
     path = tempfile.mktemp()
     loader = CSVLoader(filename=path)
     try:
-        loader.file = open(path, "w")
+        await loader.open()
         await loader.dump(item=item)
     finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == "best_scraping_library\nscrapyio\n"
+        await loader.close()
+        assert read_file(path) == "best_scraping_library\nscrapyio\n"
+
+
+class Address(BaseModel):
+    city: str
+
+
+class CSVProxyItem(Item):
+    ip: str
+    port: int
+
+
+class CSVCompanyItem(Item):
+    name: str
+    address: Address
 
 
 @pytest.mark.anyio
-async def test_csv_loader_dump_not_first_item():
-    item = TestItem(best_scraping_library="scrapyio")
-    path = tempfile.mktemp()
+async def test_csv_loader_file_per_model():
+    path = tempfile.mktemp(suffix=".csv")
     loader = CSVLoader(filename=path)
-    try:
-        loader.file = open(path, "w")
-        loader.first_item = False
+    await loader.open()
+    await loader.dump_many(
+        [
+            CSVProxyItem(ip="1.1.1.1", port=80),
+            CSVCompanyItem(name="scrapyio", address=Address(city="Yerevan")),
+            CSVProxyItem(ip="2.2.2.2", port=8080),
+        ]
+    )
+    await loader.dump(CSVCompanyItem(name="httpx", address=Address(city="Brighton")))
+    await loader.close()
+
+    assert read_file(path) == "ip,port\n1.1.1.1,80\n2.2.2.2,8080\n"
+    companies_path = path[: -len(".csv")] + "-CSVCompanyItem.csv"
+    assert read_file(companies_path) == (
+        "name,address\n" "scrapyio,{'city': 'Yerevan'}\n" "httpx,{'city': 'Brighton'}\n"
+    )
 
-        with pytest.raises(
-            AssertionError, match=r"Trying to use csv.DictWriter which is None"
-        ):
-            await loader.dump(item=item)
-    finally:
-        loader.file.close()
-        with open(path, encoding="utf-8") as f:
-            assert f.read() == ""
+
+@pytest.mark.anyio
+async def test_csv_loader_concurrent_dumps():
+    path = tempfile.mktemp(suffix=".csv")
+    loader = CSVLoader(filename=path)
+    await loader.open()
+    await asyncio.gather(
+        *(loader.dump(CSVProxyItem(ip="1.1.1.1", port=port)) for port in range(5)),
+        *(
+            loader.dump(CSVCompanyItem(name=name, address=Address(city="Baku")))
+            for name in ("a", "b")
+        ),
+    )
+    await loader.close()
+
+    assert read_file(path) == "ip,port\n" + "".join(
+        f"1.1.1.1,{port}\n" for port in range(5)
+    )
+    companies_path = path[: -len(".csv")] + "-CSVCompanyItem.csv"
+    assert read_file(companies_path) == (
+        "name,address\na,{'city': 'Baku'}\nb,{'city': 'Baku'}\n"
+    )
+
+
+class CSVSecretItem(Item):
+    name: str
+    token: str = Field("", exclude=True)
+    address: typing.Optional[Address] = None
+
+
+class CSVFlatSecretItem(Item):
+    token: str = Field("", exclude=True)
+    name: str
+    port: int
+
+
+@pytest.mark.anyio
+async def test_csv_loader_excluded_fields(tmp_path):
+    loader = CSVLoader(filename=str(tmp_path / "items.csv"))
+    await loader.open()
+    await loader.dump_many(
+        [
+            CSVSecretItem(name="a", token="secret", address=Address(city="Baku")),
+            CSVFlatSecretItem(name="b", token="secret", port=1),
+        ]
+    )
+    await loader.close()
+    assert read_file(str(tmp_path / "items.csv")) == (
+        "name,address\na,{'city': 'Baku'}\n"
+    )
+    assert read_file(str(tmp_path / "items-CSVFlatSecretItem.csv")) == (
+        "name,port\nb,1\n"
+    )
+
+
+@pytest.mark.anyio
+async def test_csv_loader_shards(tmp_path, monkeypatch):
+    monkeypatch.setattr(CONFIGS, "FILE_LOADER_SHARD_ITEMS", 2)
+    loader = CSVLoader(filename=str(tmp_path / "items.csv"))
+    await loader.open()
+    await loader.dump_many(
+        [CSVProxyItem(ip=f"{number}.0.0.0", port=number) for number in range(3)]
+    )
+    await loader.close()
+    assert [read_file(path) for path in loader.file.paths] == [
+        "ip,port\n0.0.0.0,0\n1.0.0.0,1\n",
+        "ip,port\n2.0.0.0,2\n",
+    ]
 
 
 @pytest.mark.anyio
@@ -397,3 +496,529 @@ async def test_sqlalchemy_table_creation_with_tablename(monkeypatch):
             assert loader.existing_tables["MyItem"].name == "MyNewItem"
         finally:
             await loader.engine.dispose()
+
+
+class RecordingLoader(BaseLoader):
+    def __init__(self):
+        self.items = []
+
+    async def open(self) -> None:
+        ...
+
+    async def dump(self, item: "Item") -> None:
+        self.items.append(item)
+
+    async def close(self) -> None:
+        ...
+
+
+@pytest.mark.anyio
+async def test_loader_dump_many_falls_back_to_dump():
+    items = [TestItem(best_scraping_library="scrapyio")] * 2
+    loader = RecordingLoader()
+    proxy_loader = ProxyLoader(loader=loader)
+
+    with pytest.raises(RuntimeError, match="it must be opened"):
+        await proxy_loader.dump_many(items)
+    await proxy_loader.open()
+    await proxy_loader.dump_many(items)
+    assert proxy_loader.state == LoaderState.DUMPING
+    assert loader.items == items
+    await proxy_loader.close()
+
+
+@pytest.mark.anyio
+async def test_json_loader_dump_many():
+    items = [TestItem(best_scraping_library=name) for name in ("a", "b", "c")]
+    path = tempfile.mktemp()
+    loader = JSONLoader(filename=path)
+    await loader.open()
+    await loader.dump_many([])
+    await loader.dump_many(items[:2])
+    await loader.dump_many(items[2:])
+    await loader.close()
+    with open(path, encoding="utf-8") as f:
+        assert [item["best_scraping_library"] for item in json.load(f)] == [
+            "a",
+            "b",
+            "c",
+        ]
+
+
+@pytest.mark.anyio
+async def test_csv_loader_dump_many():
+    items = [TestItem(best_scraping_library=name) for name in ("a", "b")]
+    path = tempfile.mktemp()
+    loader = CSVLoader(filename=path)
+    await loader.open()
+    await loader.dump_many([])
+    await loader.dump_many(items)
+    await loader.close()
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "best_scraping_library\na\nb\n"
+
+
+class OtherTestItem(BaseModel):
+    number: int
+
+
+@pytest.mark.anyio
+async def test_sql_loader_dump_many():
+    from sqlalchemy import func, select
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "data.db"
+        loader = SQLAlchemyLoader(url="sqlite+aiosqlite:///" + str(path))
+        await loader.open()
+        try:
+            await loader.dump_many(
+                [
+                    TestItem(best_scraping_library="scrapyio"),
+                    OtherTestItem(number=1),
+                    TestItem(best_scraping_library="httpx"),
+                ]
+            )
+            await loader.dump_many([OtherTestItem(number=2)])
+            counts = {}
+            for name, table in loader.existing_tables.items():
+                result = await loader.conn.execute(
+                    select(func.count()).select_from(table)
+                )
+                counts[name] = result.scalar()
+            assert counts == {"TestItem": 2, "OtherTestItem": 2}
+        finally:
+            await loader.close()
+
+
+async def count_rows(url, tablename):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url=url)
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text(f"SELECT count(*) FROM {tablename}"))
+            return result.scalar()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_sql_loader_periodic_commits():
+    from sqlalchemy import text
+
+    items = [TestItem(best_scraping_library=str(num)) for num in range(5)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        url = "sqlite+aiosqlite:///" + str(Path(temp_dir) / "data.db")
+        loader = SQLAlchemyLoader(
+            url=url, commit_every=4, commit_interval=None, batch_size=2
+        )
+        await loader.open()
+        try:
+            result = await loader.conn.execute(text("PRAGMA journal_mode"))
+            assert result.scalar() == "wal"
+            await loader.dump_many(items)
+            assert await count_rows(url, "TestItem") == 4
+            assert loader.uncommitted_rows[loader.conn] == 1
+        finally:
+            await loader.close()
+        assert await count_rows(url, "TestItem") == 5
+
+        loader = SQLAlchemyLoader(url=url, commit_every=None, commit_interval=0)
+        await loader.open()
+        try:
+            await loader.dump_many(items[:1])
+            assert await count_rows(url, "TestItem") == 6
+        finally:
+            await loader.close()
+
+
+@pytest.mark.anyio
+async def test_sql_loader_connection_per_table():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        url = "sqlite+aiosqlite:///" + str(Path(temp_dir) / "data.db")
+        loader = SQLAlchemyLoader(url=url, commit_every=1, sqlite_pragmas={})
+        # SQLite itself cannot have concurrent writers, immediate commits
+        # let the per-table connections take turns
+        loader.connection_per_table = True
+        await loader.open()
+        try:
+            await loader.dump_many(
+                [TestItem(best_scraping_library="scrapyio"), OtherTestItem(number=1)]
+            )
+            await loader.dump_many([OtherTestItem(number=2)])
+            assert set(loader.table_connections) == {"TestItem", "OtherTestItem"}
+        finally:
+            await loader.close()
+        assert await count_rows(url, "OtherTestItem") == 2
+
+
+@pytest.mark.anyio
+async def test_sql_loader_ignores_connection_per_table_for_sqlite():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        url = "sqlite+aiosqlite:///" + str(Path(temp_dir) / "data.db")
+        with pytest.warns(RuntimeWarning, match="connection_per_table"):
+            loader = SQLAlchemyLoader(url=url, connection_per_table=True)
+        assert not loader.connection_per_table
+        await loader.open()
+        try:
+            await loader.dump_many(
+                [TestItem(best_scraping_library="scrapyio"), OtherTestItem(number=1)]
+            )
+            await loader.dump_many([OtherTestItem(number=2)])
+            assert not loader.table_connections
+        finally:
+            await loader.close()
+        assert await count_rows(url, "TestItem") == 1
+        assert await count_rows(url, "OtherTestItem") == 2
+
+
+class KeyedProxyItem(Item):
+    __key__ = ("ip", "port")
+
+    ip: str
+    port: int
+    country: str
+
+
+class KeyOnlyItem(Item):
+    __key__ = ("number",)
+
+    number: int
+
+
+class WrongKeyItem(Item):
+    __key__ = ("missing",)
+
+    number: int
+
+
+@pytest.mark.anyio
+async def test_sql_loader_upserts():
+    from sqlalchemy import select
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        url = "sqlite+aiosqlite:///" + str(Path(temp_dir) / "data.db")
+        loader = SQLAlchemyLoader(url=url)
+        await loader.open()
+        try:
+            await loader.dump_many(
+                [
+                    KeyedProxyItem(ip="1.1.1.1", port=80, country="AM"),
+                    KeyedProxyItem(ip="1.1.1.1", port=8080, country="AM"),
+                    KeyOnlyItem(number=1),
+                ]
+            )
+            await loader.dump_many(
+                [
+                    KeyedProxyItem(ip="1.1.1.1", port=80, country="US"),
+                    KeyedProxyItem(ip="1.1.1.1", port=80, country="GE"),
+                    KeyedProxyItem(ip="2.2.2.2", port=80, country="FR"),
+                    KeyOnlyItem(number=1),
+                ]
+            )
+        finally:
+            await loader.close()
+
+        # A new loader writes into the existing tables
+        loader = SQLAlchemyLoader(url=url)
+        await loader.open()
+        try:
+            await loader.dump(KeyedProxyItem(ip="2.2.2.2", port=80, country="DE"))
+            with pytest.raises(ValueError, match=r"unknown fields: \['missing'\]"):
+                await loader.dump(WrongKeyItem(number=1))
+            table = loader.existing_tables["KeyedProxyItem"]
+            rows = await loader.conn.execute(
+                select(table.c.id, table.c.ip, table.c.port, table.c.country)
+            )
+            assert sorted(rows.all()) == [
+                (1, "1.1.1.1", 80, "GE"),
+                (2, "1.1.1.1", 8080, "AM"),
+                (3, "2.2.2.2", 80, "DE"),
+            ]
+        finally:
+            await loader.close()
+        assert await count_rows(url, "KeyOnlyItem") == 1
+
+
+def test_upsert_statements():
+    from sqlalchemy import Column, Integer, MetaData, String, Table
+    from sqlalchemy.dialects import mysql, postgresql
+
+    table = Table(
+        "proxies",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("ip", String),
+        Column("country", String),
+    )
+    statement = item_loaders.upsert_statement(table, key=["ip"], dialect="postgresql")
+    assert "ON CONFLICT (ip) DO UPDATE SET country = excluded.country" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
+    statement = item_loaders.upsert_statement(table, key=["ip"], dialect="mysql")
+    assert "ON DUPLICATE KEY UPDATE country = VALUES(country)" in str(
+        statement.compile(dialect=mysql.dialect())
+    )
+    statement = item_loaders.upsert_statement(
+        table, key=["ip", "country"], dialect="mysql"
+    )
+    assert "ON DUPLICATE KEY UPDATE ip = VALUES(ip)" in str(
+        statement.compile(dialect=mysql.dialect())
+    )
+    with pytest.raises(NotImplementedError, match="`oracle` dialect"):
+        item_loaders.upsert_statement(table, key=["ip"], dialect="oracle")
+
+
+class Source(BaseModel):
+    url: str
+
+
+class JSONLinesItem(BaseModel):
+    name: str
+    created: datetime.datetime
+    tags: typing.List[str]
+    sources: typing.List[Source] = [Source(url="/")]
+
+
+def read_compressed(path, compression):
+    if compression == "gzip":
+        with gzip.open(path) as f:
+            return f.read()
+    if compression == "zstd":
+        with open(path, "rb") as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+async def test_json_lines_loader(compression):
+    items = [
+        JSONLinesItem(
+            name=f"ítem {num}", created=datetime.datetime(2023, 4, num), tags=["a"]
+        )
+        for num in range(1, 4)
+    ]
+    path = tempfile.mktemp()
+    loader = JSONLinesLoader(filename=path, compression=compression)
+    await loader.open()
+    await loader.dump(items[0])
+    await loader.dump_many([])
+    await loader.dump_many(items[1:])
+    await loader.close()
+
+    lines = read_compressed(path, compression).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {
+            "name": "ítem 1",
+            "created": "2023-04-01T00:00:00",
+            "tags": ["a"],
+            "sources": [{"url": "/"}],
+        },
+        {
+            "name": "ítem 2",
+            "created": "2023-04-02T00:00:00",
+            "tags": ["a"],
+            "sources": [{"url": "/"}],
+        },
+        {
+            "name": "ítem 3",
+            "created": "2023-04-03T00:00:00",
+            "tags": ["a"],
+            "sources": [{"url": "/"}],
+        },
+    ]
+
+
+def test_json_lines_loader_without_orjson(monkeypatch):
+    item = JSONLinesItem(
+        name="ítem", created=datetime.datetime(2023, 4, 1), tags=["a", "b"]
+    )
+    serialized_item = item_loaders.dumps_json(item.__dict__)
+    monkeypatch.setattr(item_loaders, "orjson", None)
+    assert item_loaders.dumps_json(item.__dict__) == serialized_item
+    assert JSONLinesLoader.serialize(item) == serialized_item + b"\n"
+
+
+class EncodedItem(Item):
+    price: decimal.Decimal
+    secret: str = Field("", exclude=True)
+    address: Address
+
+    class Config:
+        json_encoders = {decimal.Decimal: str}
+
+
+class EncodedModel(BaseModel):
+    price: decimal.Decimal
+    secret: str = Field("", exclude=True)
+
+    class Config:
+        json_encoders = {decimal.Decimal: str}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_lines_loader_uses_model_config(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(item_loaders, "orjson", None)
+    item = EncodedItem(
+        price=decimal.Decimal("1.10"), secret="token", address=Address(city="Baku")
+    )
+    assert json.loads(JSONLinesLoader.serialize(item)) == json.loads(item.json())
+    assert json.loads(item.json_bytes()) == {
+        "price": "1.10",
+        "address": {"city": "Baku"},
+    }
+    model = EncodedModel(price=decimal.Decimal("0.30"), secret="token")
+    assert json.loads(JSONLinesLoader.serialize(model)) == {"price": "0.30"}
+
+
+def test_json_lines_loader_filenames():
+    assert JSONLinesLoader().filename.endswith(".jsonl")
+    assert JSONLinesLoader(compression="gzip").filename.endswith(".jsonl.gz")
+    assert JSONLinesLoader(compression="zstd").filename.endswith(".jsonl.zst")
+    assert JSONLinesLoader(filename="items", compression="zstd").filename == "items"
+
+
+class Color(str, enum.Enum):
+    RED = "red"
+
+
+class ParquetItem(BaseModel):
+    name: str
+    price: typing.Optional[float]
+    created: datetime.datetime
+    day: datetime.date
+    in_stock: bool
+    color: Color
+    tags: typing.Set[str]
+    counts: typing.Dict[str, int]
+    sources: typing.List[Source]
+
+
+def make_parquet_item(num):
+    return ParquetItem(
+        name=f"item {num}",
+        price=None if num % 2 else num,
+        created=datetime.datetime(2023, 4, 1, num),
+        day=datetime.date(2023, 4, num + 1),
+        in_stock=bool(num % 2),
+        color=Color.RED,
+        tags={"a"},
+        counts={"a": num},
+        sources=[Source(url=f"/{num}")],
+    )
+
+
+@pytest.mark.anyio
+async def test_parquet_loader():
+    from pyarrow import parquet
+
+    items = [make_parquet_item(num) for num in range(5)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = str(Path(temp_dir) / "items.parquet")
+        loader = ParquetLoader(filename=path, row_group_size=2, max_file_size=None)
+        await loader.open()
+        await loader.dump(items[0])
+        await loader.dump_many(items[1:])
+        await loader.dump_many([OtherTestItem(number=1)])
+        await loader.close()
+
+        parquet_file = parquet.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 3
+        rows = parquet_file.read().to_pylist()
+        assert rows[1] == {
+            "name": "item 1",
+            "price": None,
+            "created": datetime.datetime(2023, 4, 1, 1),
+            "day": datetime.date(2023, 4, 2),
+            "in_stock": True,
+            "color": "red",
+            "tags": ["a"],
+            "counts": [("a", 1)],
+            "sources": [{"url": "/1"}],
+        }
+        assert [row["price"] for row in rows] == [0, None, 2, None, 4]
+        other_rows = parquet.read_table(
+            str(Path(temp_dir) / "items-OtherTestItem.parquet")
+        ).to_pylist()
+        assert other_rows == [{"number": 1}]
+
+
+@pytest.mark.anyio
+async def test_parquet_loader_rollover():
+    from pyarrow import parquet
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = str(Path(temp_dir) / "items.parquet")
+        loader = ParquetLoader(filename=path, row_group_size=2, max_file_size=1)
+        await loader.open()
+        await loader.dump_many([make_parquet_item(num) for num in range(5)])
+        await loader.close()
+
+        paths = loader.files[ParquetItem].paths
+        assert [Path(path).name for path in paths] == [
+            "items.parquet",
+            "items-1.parquet",
+            "items-2.parquet",
+        ]
+        assert [parquet.read_metadata(path).num_rows for path in paths] == [2, 2, 1]
+
+
+def test_parquet_schema_unsupported_types():
+    class UnionItem(BaseModel):
+        value: typing.Union[int, str]
+
+    class ObjectItem(BaseModel):
+        value: object
+
+    class NullableValuesItem(BaseModel):
+        values: typing.List[typing.Optional[int]]
+
+    for model in (UnionItem, ObjectItem):
+        with pytest.raises(TypeError, match="Cannot map"):
+            ParquetLoader.schema_for(model)
+    schema = ParquetLoader.schema_for(NullableValuesItem)
+    assert str(schema.field("values").type) == "list<item: int64>"
+    assert ParquetLoader().filename.endswith(".parquet")
+
+
+class CountingItem(Item):
+    name: str
+
+    def dict(self, *args, **kwargs):
+        self.__class__.dict_calls += 1
+        return super().dict(*args, **kwargs)
+
+
+@pytest.mark.anyio
+async def test_loaders_share_serialized_items(monkeypatch):
+    dumps_calls = []
+    model_json = item_loaders.model_json
+
+    def counting_model_json(model):
+        dumps_calls.append(model)
+        return model_json(model)
+
+    monkeypatch.setattr(item_loaders, "model_json", counting_model_json)
+    monkeypatch.setattr("scrapyio.items.model_json", counting_model_json)
+    monkeypatch.setattr(CountingItem, "dict_calls", 0, raising=False)
+    json_path, jsonl_path, csv_path = (tempfile.mktemp() for _ in range(3))
+    loaders = [
+        JSONLoader(filename=json_path),
+        JSONLinesLoader(filename=jsonl_path),
+        CSVLoader(filename=csv_path),
+        SQLAlchemyLoader(url="sqlite+aiosqlite:///:memory:"),
+    ]
+    items = [CountingItem(name="1"), CountingItem(name="2")]
+    for loader in loaders:
+        await loader.open()
+        await loader.dump_many(items)
+        await loader.close()
+
+    assert len(dumps_calls) == 2
+    assert CountingItem.dict_calls == 2
+    assert [item["name"] for item in json.loads(read_file(json_path))] == ["1", "2"]
+    assert read_file(jsonl_path) == '{"name":"1"}\n{"name":"2"}\n'
@@ -0,0 +1,206 @@
+"""
+This module contains the scrapyio binary serialization tests.
+These tests ensure that requests and items survive the round
+trip through the binary format without losing information.
+"""
+import datetime
+import decimal
+import enum
+import io
+import typing
+import uuid
+
+import httpx
+import msgpack
+import pytest
+from httpx._config import Timeout
+from pydantic import BaseModel
+
+from scrapyio.http import Request
+from scrapyio.items import Item
+from scrapyio.serialization import (
+    FORMAT_VERSION,
+    dumps,
+    dumps_item,
+    dumps_request,
+    iter_records,
+    loads,
+    loads_item,
+    loads_request,
+    write_record,
+)
+
+
+class Color(str, enum.Enum):
+    RED = "red"
+
+
+class Tag(str):
+    ...
+
+
+class Address(BaseModel):
+    city: str
+
+
+class SerializedItem(Item):
+    name: str
+    price: float
+    created: datetime.datetime
+    day: datetime.date
+    tags: typing.List[str]
+    color: Color
+    address: Address
+    previous: typing.List[Address] = []
+    shade: typing.Union[int, Color] = 0
+    seen: typing.Set[int] = set()
+    labels: typing.FrozenSet[str] = frozenset()
+    cost: decimal.Decimal = decimal.Decimal(0)
+    uid: typing.Optional[uuid.UUID] = None
+
+
+class OtherItem(Item):
+    name: str
+
+
+def make_item() -> SerializedItem:
+    return SerializedItem(
+        name="scrapyio",
+        price=1.5,
+        created=datetime.datetime(2023, 4, 1, 12, 30),
+        day=datetime.date(2023, 4, 1),
+        tags=["a", "b"],
+        color=Color.RED,
+        address=Address(city="Yerevan"),
+        previous=[Address(city="Gyumri")],
+        shade=Color.RED,
+        seen={1, 2},
+        labels=frozenset({"a"}),
+        cost=decimal.Decimal("1.10"),
+        uid=uuid.UUID(int=1),
+    )
+
+
+def test_request_round_trip():
+    cookies = httpx.Cookies()
+    cookies.set("session", "1", domain="example.com")
+    request = Request(
+        url="/path",
+        method="POST",
+        headers=httpx.Headers([("a", "1"), ("a", "2")]),
+        cookies=cookies,
+        params=httpx.QueryParams({"q": "1"}),
+        content=b"body",
+        json={"nested": [1, 2]},
+        timeout=Timeout(1, read=3),
+        cert=("cert.pem", "key.pem"),
+        base_url=httpx.URL("https://example.com"),
+        meta={
+            "depth": 1,
+            "seen": datetime.datetime(2023, 4, 1),
+            "pair": (1, 2),
+            "tag": Tag("x"),
+        },
+    )
+    loaded = loads_request(dumps_request(request))
+
+    assert loaded.id == request.id
+    assert loaded.overrides().keys() == request.overrides().keys()
+    assert loaded.headers.get_list("a") == ["1", "2"]
+    assert loaded.cookies.get("session", domain="example.com") == "1"
+    assert loaded.params == request.params
+    assert loaded.content == b"body"
+    assert loaded.json == {"nested": [1, 2]}
+    assert loaded.timeout == request.timeout
+    assert loaded.cert == ("cert.pem", "key.pem")
+    assert loaded.base_url == request.base_url
+    assert loaded.meta == request.meta
+    assert loaded.proxies == request.proxies
+
+
+def test_request_with_defaults_is_compact():
+    request = Request(url="https://example.com", method="GET")
+    data = dumps_request(request)
+    assert len(data) < 40
+    assert loads_request(data) == request
+
+
+def test_request_unsupported_field():
+    request = Request(url="/", method="GET", app=lambda: ...)
+    with pytest.raises(TypeError, match="cannot be serialized"):
+        dumps_request(request)
+
+
+def test_item_round_trip():
+    item = make_item()
+    loaded = loads_item(dumps_item(item))
+    assert loaded == item
+    assert loaded.color is Color.RED
+    assert isinstance(loaded.address, Address)
+    assert isinstance(loaded.previous[0], Address)
+    assert loaded.shade is Color.RED
+    assert loaded.seen == {1, 2}
+    assert isinstance(loaded.labels, frozenset)
+    assert str(loaded.cost) == "1.10"
+    assert loaded.uid == uuid.UUID(int=1)
+    assert loads_item(dumps_item(OtherItem(name="..."))).name == "..."
+
+    validated = loads_item(dumps_item(item), validate=True)
+    assert validated == item
+
+
+def test_local_items_are_not_serializable():
+    class LocalItem(Item):
+        name: str
+
+    with pytest.raises(TypeError, match="Only module level items"):
+        dumps_item(LocalItem(name="..."))
+
+
+def test_generic_dumping_and_loading():
+    request = Request(url="https://example.com", method="GET")
+    item = OtherItem(name="...")
+    assert loads(dumps(request)) == request
+    assert loads(dumps(item)) == item
+
+
+def test_invalid_serialized_data():
+    request_data = dumps_request(Request(url="/", method="GET"))
+    item_data = dumps_item(OtherItem(name="..."))
+
+    with pytest.raises(ValueError, match="not serialized by scrapyio"):
+        loads(b"...")
+    with pytest.raises(ValueError, match="Unsupported serialization format"):
+        loads(b"SIO" + bytes((FORMAT_VERSION + 1,)) + request_data[4:])
+    with pytest.raises(ValueError, match="does not contain a serialized `Request`"):
+        loads_request(item_data)
+    with pytest.raises(ValueError, match="does not contain a serialized `Item`"):
+        loads_item(request_data)
+    with pytest.raises(ValueError, match="does not match its model"):
+        loads_item(
+            item_data[:5] + msgpack.packb(["tests.test_serialization.OtherItem", []])
+        )
+    for path in ("tests.test_serialization.Address", "tests.test_serialization.Tag"):
+        with pytest.raises(ValueError, match="is not an item model"):
+            loads_item(item_data[:5] + msgpack.packb([path, []]))
+    invalid_item = make_item().copy(update={"color": "blue"})
+    with pytest.raises(ValueError, match="does not match its model"):
+        loads_item(dumps_item(invalid_item))
+    with pytest.raises(ValueError, match="Unknown extension type"):
+        loads_item(item_data[:5] + msgpack.packb(msgpack.ExtType(99, b"")))
+    with pytest.raises(TypeError, match="Cannot serialize `object` objects"):
+        dumps_request(Request(url="/", method="GET", meta={"key": object()}))
+
+
+def test_records_file():
+    file = io.BytesIO()
+    records = [dumps(Request(url="/", method="GET")), dumps(OtherItem(name="..."))]
+    for record in records:
+        write_record(file, record)
+    file.seek(0)
+    assert list(iter_records(file)) == records
+
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_records(io.BytesIO(b"\x00")))
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_records(io.BytesIO(b"\x00\x00\x00\x05...")))
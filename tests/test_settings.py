@@ -10,3 +10,23 @@ def test_config_loading_with_test_env(monkeypatch, clear_sys_modules):
     mod = __import__("scrapyio.settings")
     CONFIGS = mod.settings.CONFIGS
     assert CONFIGS.__name__ == "scrapyio.templates.configuration_template"
+
+
+def test_config_loading_fills_missing_settings(
+    monkeypatch, tmp_path, clear_sys_modules
+):
+    import sys
+
+    (tmp_path / "settings.py").write_text("REQUEST_TIMEOUT = 1\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delitem(sys.modules, "settings", raising=False)
+    try:
+        mod = __import__("scrapyio.settings")
+        CONFIGS = mod.settings.CONFIGS
+        assert CONFIGS.__name__ == "settings"
+        assert CONFIGS.REQUEST_TIMEOUT == 1
+        assert CONFIGS.PROXY_CLIENTS_POOL_SIZE == 32
+    finally:
+        sys.modules.pop("settings", None)
+        for name in [name for name in sys.modules if name.startswith("scrapyio")]:
+            del sys.modules[name]
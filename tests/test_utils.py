@@ -2,7 +2,7 @@
 These tests ensure that the scrapyio utility function works as expected.
 """
 
-from scrapyio.utils import first_not_none, load_module, random_filename
+from scrapyio.utils import first_not_none, load_module, make_hashable, random_filename
 
 
 def test_object_loading():
@@ -29,3 +29,9 @@ def test_first_not_none():
     assert first_not_none(1, None) == 1
     assert first_not_none(None, None) is None
     assert first_not_none(3, 1)
+
+
+def test_make_hashable():
+    assert make_hashable({"b": [1, 2], "a": None}) == (("a", None), ("b", (1, 2)))
+    value = {1}
+    assert make_hashable({"set": value}) == (("set", id(value)),)
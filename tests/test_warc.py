@@ -0,0 +1,181 @@
+"""
+This module contains the WARC archiving tests.
+These tests ensure that the downloaded requests and responses
+are archived to valid gzipped WARC files and rotated by size.
+"""
+import base64
+import gzip
+import hashlib
+import os
+import tempfile
+import typing
+from contextlib import suppress
+
+import httpx
+import pytest
+
+from scrapyio.downloader import Downloader, ProxyClientPool, SessionDownloader
+from scrapyio.http import Request
+from scrapyio.settings import CONFIGS
+from scrapyio.warc import WARCWriter
+
+BASE_URL = "https://scrapyio-example.com"
+
+RECORD = typing.Tuple[typing.Dict[str, str], bytes]
+
+
+def read_records(path: str) -> typing.List[RECORD]:
+    with gzip.open(path) as file:
+        data = file.read()
+    records = []
+    while data:
+        head, _, data = data.partition(b"\r\n\r\n")
+        version, *lines = head.decode().split("\r\n")
+        assert version == "WARC/1.1"
+        fields = dict(line.split(": ", 1) for line in lines)
+        length = int(fields["Content-Length"])
+        records.append((fields, data[:length]))
+        assert data[length : length + 4] == b"\r\n\r\n"
+        data = data[length + 4 :]
+    return records
+
+
+async def download(downloader, **kwargs) -> httpx.Response:
+    request = Request(method="GET", base_url=BASE_URL, **kwargs)
+    clean_up, response = await downloader.handle_request(request=request)
+    try:
+        await response.aread()
+    finally:
+        with suppress(StopAsyncIteration):
+            await clean_up.__anext__()
+    return response
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("stream", [False, True])
+async def test_downloader_archives_responses(app, tmp_path, stream):
+    writer = WARCWriter(directory=str(tmp_path))
+    downloader = Downloader(warc_writer=writer)
+    await download(downloader, url="/", app=app, stream=stream)
+    await downloader.close()
+
+    assert os.listdir(tmp_path) == [os.path.basename(writer.paths[0])]
+    info, request, response = read_records(writer.paths[0])
+    assert info[0]["WARC-Type"] == "warcinfo"
+    assert request[0]["WARC-Type"] == "request"
+    assert request[0]["WARC-Target-URI"] == BASE_URL + "/"
+    assert request[0]["WARC-Concurrent-To"] == response[0]["WARC-Record-ID"]
+    assert request[1].startswith(b"GET / HTTP/1.1\r\n")
+    assert response[0]["WARC-Type"] == "response"
+    assert response[0]["Content-Type"] == "application/http;msgtype=response"
+    assert response[1].startswith(b"HTTP/1.1 200 OK\r\n")
+    assert response[1].endswith(b'\r\n\r\n"Hello World"')
+
+    digest = base64.b32encode(hashlib.sha1(b'"Hello World"').digest()).decode()
+    assert response[0]["WARC-Payload-Digest"] == f"sha1:{digest}"
+    assert "WARC-Truncated" not in response[0]
+
+
+@pytest.mark.anyio
+async def test_redirects_are_archived(app, tmp_path):
+    writer = WARCWriter(directory=str(tmp_path))
+    downloader = SessionDownloader(app=app, base_url=BASE_URL, warc_writer=writer)
+    await download(downloader, url="/found", follow_redirects=True)
+    await downloader.close()
+
+    records = read_records(writer.paths[0])
+    assert [
+        (fields["WARC-Type"], fields["WARC-Target-URI"]) for fields, _ in records[1:]
+    ] == [
+        ("request", BASE_URL + "/found"),
+        ("response", BASE_URL + "/found"),
+        ("request", BASE_URL + "/"),
+        ("response", BASE_URL + "/"),
+    ]
+    assert not any("WARC-Truncated" in fields for fields, _ in records)
+
+
+@pytest.mark.anyio
+async def test_warc_files_rotation(app, tmp_path):
+    writer = WARCWriter(directory=str(tmp_path), prefix="pages", max_file_size=1)
+    downloader = Downloader(warc_writer=writer)
+    for _ in range(3):
+        await download(downloader, url="/", app=app)
+    await downloader.close()
+
+    assert len(writer.paths) == 3
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(p) for p in writer.paths]
+    for serial, path in enumerate(writer.paths):
+        assert path.endswith(f"-{serial:05d}.warc.gz")
+        assert os.path.basename(path).startswith("pages-")
+        assert len(read_records(path)) == 3
+
+
+@pytest.mark.anyio
+async def test_truncated_exchanges(app, tmp_path):
+    async def content() -> typing.AsyncIterator[bytes]:
+        yield b"..."
+
+    writer = WARCWriter(directory=str(tmp_path))
+    hooks = {"response": [writer.archive_response]}
+    async with httpx.AsyncClient(
+        app=app, base_url=BASE_URL, event_hooks=hooks
+    ) as client:
+        response = await client.post("/echo", content=b"body")
+        assert response.content == b"body"
+        async with client.stream("POST", "/echo", content=content()) as response:
+            ...
+        await response.stream.aclose()
+    await writer.close()
+
+    _, request, response, *truncated = read_records(writer.paths[0])
+    assert request[1].endswith(b"\r\n\r\nbody")
+    assert response[1].endswith(b"\r\n\r\nbody")
+    assert "WARC-Truncated" not in request[0]
+    assert "WARC-Truncated" not in response[0]
+
+    request, response = truncated
+    assert request[0]["WARC-Truncated"] == "unspecified"
+    assert response[0]["WARC-Truncated"] == "unspecified"
+    assert response[1].endswith(b"\r\n\r\n")
+
+
+@pytest.mark.anyio
+async def test_read_bodies_are_not_buffered_twice(app, tmp_path):
+    writer = WARCWriter(directory=str(tmp_path))
+    streams = []
+
+    async def capture(response: httpx.Response) -> None:
+        streams.append(response.stream)
+
+    hooks = {"response": [writer.archive_response, capture]}
+    async with httpx.AsyncClient(
+        app=app, base_url=BASE_URL, event_hooks=hooks
+    ) as client:
+        response = await client.get("/")
+        (stream,) = streams
+        # The body kept by the response is copied to a file on the disk
+        assert not isinstance(stream.body, tempfile.SpooledTemporaryFile)
+        assert stream.body.closed
+    await writer.close()
+    _, _, archived = read_records(writer.paths[0])
+    assert archived[1].endswith(b"\r\n\r\n" + response.content)
+
+
+@pytest.mark.anyio
+async def test_warc_writer_from_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIGS, "WARC_DIRECTORY", str(tmp_path))
+    pool = ProxyClientPool()
+    downloader = Downloader(proxy_clients_pool=pool)
+    assert downloader.warc_writer is not None
+    assert downloader.warc_writer.directory == str(tmp_path)
+
+    hook = downloader.warc_writer.archive_response
+    client = pool.create_client(Request(url="/", method="GET"))
+    assert client.event_hooks["response"] == [hook]
+    await client.aclose()
+    await downloader.close()
+    assert not os.listdir(tmp_path)
+
+    monkeypatch.setattr(CONFIGS, "WARC_DIRECTORY", None)
+    assert Downloader().warc_writer is None
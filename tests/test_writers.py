@@ -0,0 +1,188 @@
+"""
+These tests ensure that the buffered file writer used by
+the file loaders keeps the written data in order and
+flushes it according to the configured thresholds, and
+that the sharded writer rolls over into finished shards.
+"""
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+
+import pytest
+
+from scrapyio.writers import BufferedFileWriter, ShardedFileWriter
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_by_size():
+    path = tempfile.mktemp()
+    writer = BufferedFileWriter(path, buffer_size=4, flush_interval=None)
+    await writer.open()
+    await writer.write(b"ab")
+    assert read_file(path) == b""
+    await writer.write(b"cd")
+    assert read_file(path) == b"abcd"
+    await writer.write(b"e")
+    await writer.close()
+    assert read_file(path) == b"abcde"
+    assert writer.file.closed
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_by_interval():
+    path = tempfile.mktemp()
+    writer = BufferedFileWriter(path, buffer_size=1024, flush_interval=0)
+    await writer.open()
+    await writer.write(b"ab")
+    assert read_file(path) == b"ab"
+    await writer.flush()
+    await writer.close()
+
+
+@pytest.mark.anyio
+async def test_idle_writer_flushes_by_interval():
+    path = tempfile.mktemp()
+    writer = BufferedFileWriter(path, buffer_size=1024, flush_interval=0.05)
+    await writer.open()
+    await writer.write(b"ab")
+    assert read_file(path) == b""
+    await asyncio.sleep(0.1)
+    assert read_file(path) == b"ab"
+    await writer.write(b"cd")
+    await writer.close()
+    assert writer.timer is None
+    assert read_file(path) == b"abcd"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fsync, syncs", [("never", 0), ("close", 1), ("flush", 3)])
+async def test_writer_fsync_policies(monkeypatch, fsync, syncs):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    writer = BufferedFileWriter(
+        tempfile.mktemp(), buffer_size=1, flush_interval=None, fsync=fsync
+    )
+    await writer.open()
+    await writer.write(b"a")
+    await writer.write(b"b")
+    await writer.close()
+    assert len(synced) == syncs
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+async def test_writer_compression(monkeypatch, compression):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    path = tempfile.mktemp()
+    writer = BufferedFileWriter(
+        path, buffer_size=1, fsync="flush", compression=compression
+    )
+    await writer.open()
+    await writer.write(b"a" * 1000)
+    await writer.write(b"b" * 1000)
+    await writer.close()
+    assert len(synced) == 3
+    assert len(read_file(path)) < 100
+    assert writer.raw_file.closed
+
+
+def test_writer_unknown_options():
+    with pytest.raises(ValueError, match="Unknown fsync policy"):
+        BufferedFileWriter(tempfile.mktemp(), fsync="always")
+    with pytest.raises(ValueError, match="Unknown compression"):
+        BufferedFileWriter(tempfile.mktemp(), compression="bz2")
+
+
+@pytest.mark.anyio
+async def test_sharded_writer_rotates_by_items(tmp_path):
+    writer = ShardedFileWriter(
+        str(tmp_path / "items.json"),
+        header=b"[",
+        separator=b",",
+        footer=b"]",
+        shard_items=2,
+    )
+    await writer.open()
+    await writer.write_records([b"1", b"2", b"3"])
+    # The current shard keeps the ".part" suffix until it is finished
+    assert sorted(os.listdir(tmp_path)) == ["items-00000.json", "items-00001.json.part"]
+    await writer.write_records([])
+    await writer.write_records([b"4", b"5"])
+    await writer.close()
+
+    assert writer.paths == [
+        str(tmp_path / f"items-0000{shard}.json") for shard in range(3)
+    ]
+    assert [read_file(path) for path in writer.paths] == [b"[1,2]", b"[3,4]", b"[5]"]
+    await writer.close()
+    assert len(os.listdir(tmp_path)) == 3
+
+
+@pytest.mark.anyio
+async def test_sharded_writer_rotates_by_bytes(tmp_path):
+    writer = ShardedFileWriter(
+        str(tmp_path / "items.jsonl.gz"), shard_bytes=8, compression="gzip"
+    )
+    await writer.set_header(b"")
+    await writer.open()
+    await writer.write_records([b"ab\n", b"c\n", b"defgh\n", b"i\n"])
+    await writer.close()
+    assert [os.path.basename(path) for path in writer.paths] == [
+        "items-00000.jsonl.gz",
+        "items-00001.jsonl.gz",
+    ]
+    assert [gzip.decompress(read_file(path)) for path in writer.paths] == [
+        b"ab\nc\n",
+        b"defgh\ni\n",
+    ]
+
+
+@pytest.mark.anyio
+async def test_sharded_writer_rotates_by_time(tmp_path, monkeypatch):
+    now = 0.0
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    writer = ShardedFileWriter(str(tmp_path / "rows"), shard_seconds=60)
+    await writer.open()
+    await writer.write_records([b"a", b"b"])
+    # Only the next shards get the header, the current one has rows
+    await writer.set_header(b"header")
+    now = 60.0
+    await writer.write_records([b"c"])
+    await writer.close()
+    assert [read_file(path) for path in writer.paths] == [b"ab", b"headerc"]
+
+
+@pytest.mark.anyio
+async def test_sharded_writer_finishes_aged_shards(tmp_path):
+    writer = ShardedFileWriter(str(tmp_path / "rows"), shard_seconds=0.05)
+    await writer.open()
+    await writer.write_records([b"a", b"b"])
+    await asyncio.sleep(0.1)
+    assert writer.paths == [str(tmp_path / "rows-00000")]
+    await asyncio.sleep(0.1)
+    # The next shard is opened only once there are records for it
+    assert os.listdir(tmp_path) == ["rows-00000"]
+    await writer.write_records([b"c"])
+    await writer.close()
+    assert writer.timer is None
+    assert [read_file(path) for path in writer.paths] == [b"ab", b"c"]
+
+
+@pytest.mark.anyio
+async def test_unsharded_writer(tmp_path):
+    path = str(tmp_path / "items")
+    writer = ShardedFileWriter(path, header=b"[", separator=b",", footer=b"]")
+    await writer.open()
+    await writer.set_header(b"{")
+    await writer.write_records([b"1", b"2"])
+    await writer.close()
+    assert writer.paths == [path]
+    assert read_file(path) == b"[1,2]"